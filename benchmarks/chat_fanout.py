@@ -0,0 +1,240 @@
+"""
+여러 채팅 워커 사이의 메시지 전달(fan-out)을 확인하는 부하 테스트
+
+사용법:
+    python benchmarks/chat_fanout.py [--workers 3] [--rooms 20] [--messages 50] [--queue local] [--buffer flush]
+
+임시 SQLite 데이터베이스에 사용자와 채팅방을 만들고, 로컬 브로커와 워커 프로세스(wsgi.py)를 실행한 뒤
+채팅방마다 보내는 사람과 받는 사람을 서로 다른 워커에 연결하여 메시지를 주고받음
+--queue none 으로 실행하면 메시지 큐 없이 실행하여 다른 워커로는 메시지가 전달되지 않는 것을 확인할 수 있음
+--buffer flush/immediate 로 메시지 버퍼를 켜고 메시지마다 저장할 때(off)와 비교할 수 있음
+
+출력:
+    - 다른 워커에 연결된 받는 사람에게 전달된 메시지 수와 비율
+    - 전송부터 수신까지 걸린 시간 (p50, p95, 최대)과 초당 전달 메시지 수
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import simple_websocket
+from flask import Flask
+from flask.sessions import SecureCookieSessionInterface
+
+import migrations
+from model.data import db, User, Room
+from realtime.local_broker import LocalBroker
+
+SECRET_KEY = 'chat-fanout-benchmark'
+
+
+def seed(connection, room_count):
+    """
+    채팅방마다 보내는 사람과 받는 사람을 한 명씩 생성
+
+    Returns:
+        list: (채팅방 ID, 보내는 사람, 받는 사람) 목록, 사용자는 {'id', 'name'}
+    """
+    users, rooms, pairs = [], [], []
+    for i in range(room_count):
+        sender = {'id': str(uuid.uuid4()), 'name': f'sender{i}', 'email': f'sender{i}@example.com'}
+        receiver = {'id': str(uuid.uuid4()), 'name': f'receiver{i}', 'email': f'receiver{i}@example.com'}
+        room = {'id': str(uuid.uuid4()), 'sender_id': sender['id'], 'receiver_id': receiver['id'],
+                'date': datetime.now(), 'sender_join': True, 'receiver_join': True}
+        users.extend([sender, receiver])
+        rooms.append(room)
+        pairs.append((room['id'], sender, receiver))
+    connection.execute(User.__table__.insert(), users)
+    connection.execute(Room.__table__.insert(), rooms)
+    return pairs
+
+
+class ChatClient:
+    """
+    Socket.IO(Engine.IO 4) 프로토콜을 웹소켓으로 직접 주고받는 최소 클라이언트
+
+    Attributes:
+        received (list): 수신한 'message' 이벤트 (수신 시각, 데이터)
+    """
+
+    def __init__(self, base_url, cookie):
+        url = base_url.replace('http://', 'ws://') + '/socket.io/?EIO=4&transport=websocket'
+        self.ws = simple_websocket.Client.connect(url, headers={'Cookie': cookie})
+        self.received = []
+        # 핸드셰이크 응답과 함께 도착한 Engine.IO open 패킷은 다음 수신 전까지 처리되지 않으므로 기다리지 않고 바로 연결 요청
+        self.ws.send('40')
+        while not (self.ws.receive() or '').startswith('40'):
+            pass
+        self._reader = threading.Thread(target=self._read, daemon=True)
+        self._reader.start()
+
+    def emit(self, event, data):
+        self.ws.send('42' + json.dumps([event, data]))
+
+    def close(self):
+        self.ws.close()
+
+    def _read(self):
+        try:
+            while True:
+                packet = self.ws.receive()
+                if packet == '2':
+                    self.ws.send('3')
+                elif packet and packet.startswith('42'):
+                    event, *args = json.loads(packet[2:])
+                    if event == 'message':
+                        self.received.append((time.perf_counter(), args[0]))
+        except simple_websocket.ConnectionClosed:
+            pass
+
+
+def session_cookie(user_id):
+    """
+    워커와 같은 SECRET_KEY로 서명한 로그인 세션 쿠키
+    """
+    app = Flask(__name__)
+    app.secret_key = SECRET_KEY
+    serializer = SecureCookieSessionInterface().get_signing_serializer(app)
+    return f"session={serializer.dumps({'_user_id': user_id, '_fresh': True})}"
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"워커가 시작되지 않았습니다: {port}")
+
+
+def start_workers(count, database_url, queue_url, async_mode, buffer, log_directory):
+    workers = []
+    for i in range(count):
+        port = free_port()
+        env = dict(os.environ,
+                   SQLALCHEMY_DATABASE_URI=database_url,
+                   SECRET_KEY=SECRET_KEY,
+                   STORAGE_BACKEND='memory',
+                   SOCKETIO_MESSAGE_QUEUE=queue_url or '',
+                   SOCKETIO_ASYNC_MODE=async_mode or '',
+                   CHAT_BUFFER_ENABLED='true' if buffer != 'off' else 'false',
+                   CHAT_DURABILITY=buffer if buffer != 'off' else 'flush')
+        log = open(os.path.join(log_directory, f'worker{i}.log'), 'w')
+        process = subprocess.Popen([sys.executable, 'wsgi.py', '--port', str(port)],
+                                   cwd=ROOT, env=env, stdout=log, stderr=subprocess.STDOUT)
+        workers.append((process, port, log))
+    for process, port, _ in workers:
+        wait_for_port(port)
+    return workers
+
+
+def percentile(values, fraction):
+    return sorted(values)[min(len(values) - 1, int(len(values) * fraction))] if values else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=3)
+    parser.add_argument('--rooms', type=int, default=20)
+    parser.add_argument('--messages', type=int, default=50, help='채팅방마다 보내는 메시지 수')
+    parser.add_argument('--queue', choices=['local', 'none'], default='local')
+    parser.add_argument('--async-mode', default=None, help='워커의 SOCKETIO_ASYNC_MODE')
+    parser.add_argument('--buffer', choices=['off', 'flush', 'immediate'], default='off',
+                        help='메시지 버퍼 사용 여부와 CHAT_DURABILITY')
+    parser.add_argument('--wait', type=float, default=10.0, help='마지막 전송 후 수신을 기다리는 최대 시간(초)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        database_url = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+        app = Flask(__name__)
+        app.config['SQLALCHEMY_DATABASE_URI'] = database_url
+        db.init_app(app)
+        with app.app_context():
+            migrations.upgrade(db.engine, log=lambda message: None)
+            with db.engine.begin() as connection:
+                pairs = seed(connection, args.rooms)
+
+        broker = None
+        if args.queue == 'local':
+            broker = LocalBroker(port=free_port())
+            broker.start()
+
+        workers = start_workers(args.workers, database_url, broker.url if broker else None,
+                                args.async_mode, args.buffer, directory)
+        clients = []
+        try:
+            # 보내는 사람은 i번째 워커, 받는 사람은 그다음 워커에 연결
+            rooms = []
+            for i, (room_id, sender, receiver) in enumerate(pairs):
+                sender_client = ChatClient(f"http://127.0.0.1:{workers[i % len(workers)][1]}",
+                                           session_cookie(sender['id']))
+                receiver_client = ChatClient(f"http://127.0.0.1:{workers[(i + 1) % len(workers)][1]}",
+                                             session_cookie(receiver['id']))
+                sender_client.emit('join', {'room_id': room_id})
+                receiver_client.emit('join', {'room_id': room_id})
+                clients.extend([sender_client, receiver_client])
+                rooms.append((room_id, sender, receiver, sender_client, receiver_client))
+            time.sleep(1.0)
+
+            sent_at = {}
+            started = time.perf_counter()
+            for n in range(args.messages):
+                for room_id, sender, receiver, sender_client, _ in rooms:
+                    key = f"{room_id}:{n}"
+                    sent_at[key] = time.perf_counter()
+                    sender_client.emit('message', {'room_id': room_id, 'message': key})
+
+            expected = len(sent_at)
+            deadline = time.perf_counter() + args.wait
+            while time.perf_counter() < deadline and sum(len(room[4].received) for room in rooms) < expected:
+                time.sleep(0.05)
+            elapsed = time.perf_counter() - started
+
+            latencies = [(received_at - sent_at[data['text']]) * 1000
+                         for room in rooms for received_at, data in room[4].received if data['text'] in sent_at]
+            local = sum(len(room[3].received) for room in rooms)
+        finally:
+            for client in clients:
+                client.close()
+            for process, _, log in workers:
+                process.terminate()
+                process.wait()
+                log.close()
+            if broker:
+                broker.shutdown()
+                broker.server_close()
+
+    cross = len(latencies)
+    print(f"workers={args.workers} rooms={args.rooms} messages/room={args.messages} queue={args.queue} "
+          f"buffer={args.buffer}")
+    print(f"  sent                     {expected}")
+    print(f"  delivered (same worker)  {local}")
+    print(f"  delivered (cross worker) {cross} ({cross / expected:.1%})")
+    if latencies:
+        print(f"  latency ms  p50 {statistics.median(latencies):.1f}  p95 {percentile(latencies, 0.95):.1f}  "
+              f"max {max(latencies):.1f}")
+        print(f"  throughput  {cross / elapsed:.0f} msg/s")
+
+
+if __name__ == '__main__':
+    main()
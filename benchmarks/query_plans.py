@@ -0,0 +1,188 @@
+"""
+주요 조회 쿼리의 실행 계획과 실행 시간을 보조 인덱스 적용 전/후로 비교하는 벤치마크
+
+사용법:
+    python benchmarks/query_plans.py [--posts 20000] [--users 200] [--repeat 20]
+
+임시 SQLite 데이터베이스에 테스트 데이터를 채운 뒤, 모델에 선언된 인덱스를 제거한 상태(before)와
+생성한 상태(after)에서 routes/*.py 와 같은 형태의 쿼리를 실행하여 EXPLAIN QUERY PLAN과 평균 실행 시간을 출력
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from sqlalchemy import func, or_, and_, select, text
+
+from model.data import db, User, Post, Like, Room, Message, Review
+from model.inbox import inbox_query
+from model.post_query import PostListingQuery
+
+CATEGORIES = ["디지털기기", "생활가전", "가구/인테리어", "생활/주방", "유아동", "도서", "식물"]
+
+
+def seed(connection, post_count, user_count):
+    """
+    벤치마크용 사용자, 게시물, 좋아요, 채팅방, 메시지, 리뷰 데이터 생성
+    """
+    rng = random.Random(42)
+    start = datetime(2024, 1, 1)
+
+    users = [{'id': str(uuid.uuid4()), 'name': f'user{i}', 'email': f'user{i}@example.com'}
+             for i in range(user_count)]
+    connection.execute(User.__table__.insert(), users)
+
+    posts = [{
+        'id': str(uuid.uuid4()),
+        'title': f'상품 {i}',
+        'date': start + timedelta(minutes=i),
+        'body': '상품 설명',
+        'price': rng.randint(0, 1000000),
+        'like_cnt': rng.randint(0, 100),
+        'category': rng.choice(CATEGORIES),
+        'author_id': rng.choice(users)['id'],
+    } for i in range(post_count)]
+    connection.execute(Post.__table__.insert(), posts)
+
+    likes = {(rng.choice(users)['email'], rng.choice(posts)['id']) for _ in range(post_count * 2)}
+    connection.execute(Like.__table__.insert(), [
+        {'id': str(uuid.uuid4()), 'user_email': email, 'post_id': post_id} for email, post_id in likes
+    ])
+
+    rooms = [{
+        'id': str(uuid.uuid4()),
+        'sender_id': users[i % user_count]['id'],
+        'receiver_id': users[(i * 7 + 1) % user_count]['id'],
+        'date': start,
+        'sender_join': True,
+        'receiver_join': True,
+    } for i in range(user_count * 5)]
+    connection.execute(Room.__table__.insert(), rooms)
+
+    connection.execute(Message.__table__.insert(), [{
+        'id': str(uuid.uuid4()),
+        'sender_name': 'user0',
+        'receive_user_name': 'user1',
+        'room_id': rng.choice(rooms)['id'],
+        'text': '안녕하세요',
+        'time': start + timedelta(seconds=i),
+    } for i in range(post_count)])
+
+    connection.execute(Review.__table__.insert(), [{
+        'id': str(uuid.uuid4()),
+        'user_name': rng.choice(users)['name'],
+        'review_writer': rng.choice(users)['name'],
+        'review': '좋아요',
+        'rating': 5,
+    } for _ in range(user_count * 10)])
+
+    return users, posts, rooms
+
+
+def build_queries(connection, users, posts, rooms):
+    """
+    routes/*.py 에서 사용하는 형태의 대표 쿼리 목록
+    """
+    user, other = users[0], users[1]
+    post = posts[len(posts) // 2]
+    room = rooms[0]
+    engine = connection
+
+    return [
+        ('all_products 최신순', PostListingQuery().build(engine).limit(20)),
+        ('all_products 인기순', PostListingQuery(sort_by='hottest').build(engine).limit(20)),
+        ('all_products 카테고리+최신순', PostListingQuery(category=CATEGORIES[0]).build(engine).limit(20)),
+        ('all_products 가격+최신순',
+         PostListingQuery(start_price=1000, end_price=50000).build(engine).limit(20)),
+        ('all_products 카테고리+가격+인기순',
+         PostListingQuery(category=CATEGORIES[0], start_price=1000, end_price=500000,
+                          sort_by='hottest').build(engine).limit(20)),
+        ('my_post / user_profile',
+         select(Post).filter_by(author_id=user['id']).order_by(Post.date.desc(), Post.id.desc()).limit(20)),
+        ('/increase 좋아요 조회', select(Like).filter_by(user_email=user['email'], post_id=post['id'])),
+        ('like_post 좋아요 목록', select(Like).filter_by(user_email=user['email']).limit(20)),
+        ('delete 게시물 좋아요 수', select(func.count()).select_from(Like).where(Like.post_id == post['id'])),
+        ('chat_room 두 사용자 채팅방',
+         select(Room).where(or_(
+             and_(Room.sender_id == user['id'], Room.receiver_id == other['id']),
+             and_(Room.sender_id == other['id'], Room.receiver_id == user['id'])))),
+        ('chat_room 받은 메시지함', inbox_query(user['id'])),
+        ('get_messages 메시지 기록 (최신 페이지)',
+         select(Message).filter_by(room_id=room['id'])
+         .order_by(Message.time.desc(), Message.id.desc()).limit(31)),
+        ('user_profile 리뷰 목록',
+         select(Review, User.profile_image_name).join(User, Review.review_writer == User.name)
+         .filter(Review.user_name == user['name'])),
+        ('user_profile 사용자 조회', select(User).filter_by(name=user['name'])),
+    ]
+
+
+def explain(connection, query):
+    """
+    쿼리의 EXPLAIN QUERY PLAN 결과를 한 줄로 요약
+    """
+    compiled = query.compile(dialect=connection.dialect)
+    params = tuple(compiled.params[name] for name in compiled.positiontup)
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params).all()
+    return ' / '.join(row[-1] for row in rows)
+
+
+def measure(connection, query, repeat):
+    """
+    쿼리의 평균 실행 시간(ms)
+    """
+    started = time.perf_counter()
+    for _ in range(repeat):
+        connection.execute(query).all()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def run(connection, queries, repeat):
+    return {name: (explain(connection, query), measure(connection, query, repeat)) for name, query in queries}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--posts', type=int, default=20000)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        app = Flask(__name__)
+        app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+        db.init_app(app)
+
+        with app.app_context(), db.engine.begin() as connection:
+            db.metadata.create_all(connection)
+            indexes = [index for table in db.metadata.sorted_tables for index in table.indexes]
+            for index in indexes:
+                index.drop(connection)
+
+            users, posts, rooms = seed(connection, args.posts, args.users)
+            connection.execute(text("ANALYZE"))
+            queries = build_queries(connection, users, posts, rooms)
+            before = run(connection, queries, args.repeat)
+
+            for index in indexes:
+                index.create(connection)
+            connection.execute(text("ANALYZE"))
+            after = run(connection, queries, args.repeat)
+
+    for name, _ in queries:
+        (plan_before, ms_before), (plan_after, ms_after) = before[name], after[name]
+        print(f"## {name}")
+        print(f"  before {ms_before:8.3f} ms  {plan_before}")
+        print(f"  after  {ms_after:8.3f} ms  {plan_after}")
+        print()
+
+
+if __name__ == '__main__':
+    main()
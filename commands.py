@@ -0,0 +1,186 @@
+from flask.cli import AppGroup
+import click
+import time
+
+from model.data import db
+import migrations
+from model.search import rebuild_search_index
+from model.inbox import rebuild_last_message_snapshots
+from model.likes import reconcile_like_counts
+from model.asset_jobs import process_asset_jobs, asset_job_counts, retry_failed_jobs, BULK_DELETE_LIMIT
+from model.account_jobs import process_account_job, ACCOUNT_DELETE_BATCH
+from storage.pipeline import upload_pipeline
+from realtime.local_broker import LocalBroker, DEFAULT_HOST, DEFAULT_PORT
+
+# 스키마 마이그레이션을 위한 CLI 명령 그룹 (flask --app main db ...)
+db_cli = AppGroup('db', help='데이터베이스 스키마 마이그레이션')
+
+# 검색 인덱스 관리를 위한 CLI 명령 그룹 (flask --app main search ...)
+search_cli = AppGroup('search', help='게시물 검색 인덱스 관리')
+
+# 채팅 데이터 관리를 위한 CLI 명령 그룹 (flask --app main chat ...)
+chat_cli = AppGroup('chat', help='채팅 데이터 관리')
+
+# 좋아요 데이터 관리를 위한 CLI 명령 그룹 (flask --app main likes ...)
+likes_cli = AppGroup('likes', help='좋아요 데이터 관리')
+
+# 이미지 에셋 삭제 작업 큐를 위한 CLI 명령 그룹 (flask --app main assets ...)
+assets_cli = AppGroup('assets', help='이미지 에셋 삭제 작업 큐')
+
+# 계정 삭제 작업 큐를 위한 CLI 명령 그룹 (flask --app main accounts ...)
+accounts_cli = AppGroup('accounts', help='계정 삭제 작업 큐')
+
+
+@search_cli.command('rebuild')
+def rebuild_search():
+    """
+    게시물 검색(FTS) 인덱스를 처음부터 다시 생성
+    """
+    with db.engine.begin() as connection:
+        rebuild_search_index(connection)
+    click.echo('검색 인덱스를 재구성했습니다.')
+
+
+@chat_cli.command('rebuild-snapshots')
+def rebuild_snapshots():
+    """
+    messages 테이블을 기준으로 모든 채팅방의 마지막 메시지 스냅샷을 다시 계산
+    """
+    with db.engine.begin() as connection:
+        count = rebuild_last_message_snapshots(connection)
+    click.echo(f'{count}개 채팅방의 마지막 메시지 스냅샷을 갱신했습니다.')
+
+
+@chat_cli.command('broker')
+@click.option('--host', default=DEFAULT_HOST, help='브로커 주소')
+@click.option('--port', type=int, default=DEFAULT_PORT, help='브로커 포트')
+def run_broker(host, port):
+    """
+    여러 채팅 워커를 연결하는 로컬 pub/sub 브로커 실행 (SOCKETIO_MESSAGE_QUEUE=local://host:port)
+    """
+    with LocalBroker(host, port) as broker:
+        click.echo(f'로컬 브로커 실행: {broker.url}')
+        broker.serve_forever()
+
+
+@db_cli.command('upgrade')
+@click.option('--to', 'target', type=int, default=None, help='목표 버전 (기본값: 최신 버전)')
+def db_upgrade(target):
+    """
+    데이터베이스 스키마를 최신(또는 지정한) 버전으로 업그레이드
+    """
+    version = migrations.upgrade(db.engine, target, log=click.echo)
+    click.echo(f'현재 스키마 버전: {version}')
+
+
+@db_cli.command('downgrade')
+@click.option('--to', 'target', type=int, default=None, help='목표 버전 (기본값: 한 단계 이전)')
+def db_downgrade(target):
+    """
+    데이터베이스 스키마를 이전(또는 지정한) 버전으로 다운그레이드
+    """
+    if target is None:
+        with db.engine.begin() as connection:
+            target = max(migrations.current_version(connection) - 1, 0)
+    version = migrations.downgrade(db.engine, target, log=click.echo)
+    click.echo(f'현재 스키마 버전: {version}')
+
+
+@db_cli.command('current')
+def db_current():
+    """
+    데이터베이스에 적용된 스키마 버전과 최신 버전 출력
+    """
+    with db.engine.begin() as connection:
+        version = migrations.current_version(connection)
+    click.echo(f'현재 스키마 버전: {version} (최신 버전: {migrations.head_version()})')
+
+
+@db_cli.command('history')
+def db_history():
+    """
+    마이그레이션 목록과 적용 여부 출력
+    """
+    with db.engine.begin() as connection:
+        version = migrations.current_version(connection)
+    for migration in migrations.load_migrations():
+        mark = 'x' if migration.revision <= version else ' '
+        click.echo(f'[{mark}] {migration.revision:04d} {migration.description}')
+
+
+@likes_cli.command('reconcile')
+@click.option('--interval', type=int, default=None, help='지정하면 해당 초 간격으로 반복 실행')
+@click.option('--show', type=int, default=10, help='출력할 보정 게시물 수')
+def reconcile_likes(interval, show):
+    """
+    likes 테이블 기준으로 게시물 좋아요 수를 재계산하고 어긋난 값을 보고
+
+    - 좋아요 수 버퍼는 웹 프로세스마다 따로 있으므로 이 명령에서 반영할 변경분은 없음
+      (버퍼도 같은 기준으로 다시 계산하여 반영하므로 먼저 보정해도 두 번 더해지지 않음)
+    """
+    while True:
+        drift = reconcile_like_counts(db.session)
+        total = sum(abs(actual - stored) for _, stored, actual in drift)
+        click.echo(f'{len(drift)}개 게시물의 좋아요 수를 보정했습니다. (총 차이: {total})')
+        for post_id, stored, actual in drift[:show]:
+            click.echo(f'  {post_id}: {stored} -> {actual}')
+
+        if interval is None:
+            break
+        db.session.remove()
+        time.sleep(interval)
+
+
+@assets_cli.command('work')
+@click.option('--batch-size', type=int, default=BULK_DELETE_LIMIT, help='한 번에 처리할 최대 작업 수')
+@click.option('--interval', type=float, default=5.0, help='처리할 작업이 없을 때 대기 시간(초)')
+@click.option('--once', is_flag=True, help='지금 처리할 수 있는 작업만 처리하고 종료')
+def work_assets(batch_size, interval, once):
+    """
+    에셋 삭제 작업을 일괄 처리하는 작업자 실행
+    """
+    while True:
+        result = process_asset_jobs(db.engine, upload_pipeline.storage, batch_size)
+        if result['claimed']:
+            click.echo(f"삭제 {result['deleted']}, 재시도 예정 {result['retried']}, 실패 {result['failed']}")
+            continue
+
+        if once:
+            break
+        time.sleep(interval)
+
+
+@assets_cli.command('status')
+def assets_status():
+    """
+    상태별 에셋 삭제 작업 수 출력
+    """
+    counts = asset_job_counts(db.session)
+    click.echo(f"대기 {counts.get('pending', 0)}, 실패 {counts.get('failed', 0)}")
+
+
+@assets_cli.command('retry-failed')
+def assets_retry_failed():
+    """
+    실패한 에셋 삭제 작업을 다시 처리 대상으로 되돌림
+    """
+    click.echo(f'{retry_failed_jobs(db.session)}개 작업을 다시 대기열에 넣었습니다.')
+
+
+@accounts_cli.command('work')
+@click.option('--batch-size', type=int, default=ACCOUNT_DELETE_BATCH, help='한 트랜잭션에서 삭제할 최대 게시물 수')
+@click.option('--interval', type=float, default=5.0, help='처리할 작업이 없을 때 대기 시간(초)')
+@click.option('--once', is_flag=True, help='지금 처리할 수 있는 작업만 처리하고 종료')
+def work_accounts(batch_size, interval, once):
+    """
+    삭제된 계정의 게시물을 나누어 삭제하는 작업자 실행
+    """
+    while True:
+        result = process_account_job(db.engine, batch_size)
+        if result['claimed']:
+            click.echo(f"게시물 {result['deleted_posts']}개 삭제")
+            continue
+
+        if once:
+            break
+        time.sleep(interval)
@@ -1,4 +1,5 @@
-from flask import render_template, jsonify
+from flask import render_template, jsonify, flash, redirect, request, url_for
+from werkzeug.exceptions import RequestEntityTooLarge
 from flask_login import current_user
 from dotenv import load_dotenv
 import os
@@ -6,10 +7,23 @@ import os
 from security.security import login_manager
 from routes.chat import socketio
 from app import app
-from model.data import db, User, Post, Like
+from model.data import db, User, Post
+from model.likes import toggle_like, liked_post_cache
+from model.like_buffer import like_buffer
+from model.message_buffer import message_buffer
+from model.account_jobs import account_deletion_worker
+from model.asset_jobs import referenced_assets
+from storage import create_storage
+from storage.pipeline import upload_pipeline
+from storage.preprocess import image_preprocessor
+from storage.ingest import UploadRequest
+from realtime import socketio_options
+from realtime.presence import presence
+from migrations import check_version, SchemaVersionError
 from routes.users import users
 from routes.posts import posts
 from routes.chat import chatting
+from commands import db_cli, search_cli, chat_cli, likes_cli, assets_cli, accounts_cli
 
 # .env 파일에서 환경 변수를 프로세스의 환경 변수로 로드하기 위해 python-dotenv 라이브러리를 사용
 load_dotenv()
@@ -31,9 +45,86 @@ app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 db.init_app(app)
 
 
-# 데이터베이스 생성
+# 좋아요 수 write-behind 버퍼 설정 (반영 주기와 최대 지연 시간은 초 단위)
+app.config['LIKE_BUFFER_ENABLED'] = os.getenv("LIKE_BUFFER_ENABLED", "false").lower() == "true"
+app.config['LIKE_FLUSH_INTERVAL'] = float(os.getenv("LIKE_FLUSH_INTERVAL", "1.0"))
+app.config['LIKE_MAX_STALENESS'] = float(os.getenv("LIKE_MAX_STALENESS", "5.0"))
+like_buffer.init_app(app)
+
+
+# 이미지 저장소 설정 (cloudinary, local: 로컬 디스크, memory: 메모리에만 기록하는 가짜 저장소)
+app.config['STORAGE_BACKEND'] = os.getenv("STORAGE_BACKEND", "cloudinary")
+app.config['LOCAL_STORAGE_ROOT'] = os.getenv("LOCAL_STORAGE_ROOT")
+app.config['LOCAL_STORAGE_URL'] = os.getenv("LOCAL_STORAGE_URL", "/media")
+storage = create_storage(app)
+
+# 이미지 업로드 파이프라인 설정
+app.config['UPLOAD_MAX_WORKERS'] = int(os.getenv("UPLOAD_MAX_WORKERS", "4"))
+app.config['UPLOAD_TIMEOUT'] = float(os.getenv("UPLOAD_TIMEOUT", "30"))
+upload_pipeline.init_app(app, storage, referenced=referenced_assets)
+
+# 이미지 전처리 설정 (긴 변 최대 길이와 썸네일 크기는 px, 형식은 WEBP 또는 JPEG)
+app.config['IMAGE_PREPROCESS'] = os.getenv("IMAGE_PREPROCESS", "true").lower() == "true"
+app.config['IMAGE_MAX_DIMENSION'] = int(os.getenv("IMAGE_MAX_DIMENSION", "1600"))
+app.config['IMAGE_FORMAT'] = os.getenv("IMAGE_FORMAT", "WEBP")
+app.config['IMAGE_QUALITY'] = int(os.getenv("IMAGE_QUALITY", "80"))
+app.config['THUMBNAIL_SIZE'] = int(os.getenv("THUMBNAIL_SIZE", "480"))
+image_preprocessor.init_app(app)
+
+# 업로드 요청 크기 제한 (바이트, 본문을 읽는 동안 검사하며 넘으면 413)
+# MAX_CONTENT_LENGTH: 요청 전체, UPLOAD_MAX_FILE_SIZE: 파일 하나, UPLOAD_MAX_FILES: 요청당 파일 수
+app.config['MAX_CONTENT_LENGTH'] = int(os.getenv("UPLOAD_MAX_REQUEST_SIZE", str(60 * 1024 * 1024)))
+app.config['UPLOAD_MAX_FILE_SIZE'] = int(os.getenv("UPLOAD_MAX_FILE_SIZE", str(15 * 1024 * 1024)))
+app.config['UPLOAD_MAX_FILES'] = int(os.getenv("UPLOAD_MAX_FILES", "10"))
+app.request_class = UploadRequest
+
+# 게시물 목록의 가격대 폭(원)이 이 값 이하이면 가격 인덱스로, 더 넓으면 정렬 인덱스로 조회
+app.config['PRICE_INDEX_MAX_WIDTH'] = int(os.getenv("PRICE_INDEX_MAX_WIDTH", "10000"))
+
+# 실시간 채팅 서버 설정 (여러 워커로 실행할 때는 SOCKETIO_MESSAGE_QUEUE로 워커 사이에 메시지 전달)
+# SOCKETIO_ASYNC_MODE: threading, eventlet, gevent (비어 있으면 자동 선택)
+# SOCKETIO_MESSAGE_QUEUE: redis://host:6379/0, local://127.0.0.1:6380 (로컬 브로커) 등
+app.config['SOCKETIO_ASYNC_MODE'] = os.getenv("SOCKETIO_ASYNC_MODE")
+app.config['SOCKETIO_MESSAGE_QUEUE'] = os.getenv("SOCKETIO_MESSAGE_QUEUE")
+socketio.init_app(app, **socketio_options(app))
+
+# 채팅방 접속 상태는 메모리에 보관하고, 메시지 큐(local://, redis://)가 있으면 워커 사이에 공유
+presence.init_app(app, socketio)
+
+# 좋아요 여부 캐시는 워커마다 보관하고, 메시지 큐가 있으면 좋아요를 토글할 때 다른 워커의 캐시도 비움
+liked_post_cache.init_app(app, socketio)
+
+# 채팅 기록 페이지 크기 (위젯은 최근 한 페이지를 먼저 받고 스크롤할 때 이전 페이지를 조회)
+app.config['CHAT_HISTORY_PAGE_SIZE'] = int(os.getenv("CHAT_HISTORY_PAGE_SIZE", "30"))
+app.config['CHAT_HISTORY_MAX_PAGE_SIZE'] = int(os.getenv("CHAT_HISTORY_MAX_PAGE_SIZE", "100"))
+
+# 채팅 메시지 버퍼 설정 (메시지를 모아서 CHAT_FLUSH_INTERVAL초마다 한 트랜잭션으로 저장)
+# CHAT_DURABILITY: flush(저장 후 응답), immediate(버퍼에 추가하자마자 응답)
+# CHAT_BUFFER_JOURNAL: 저장 전 메시지를 기록하는 저널 파일의 기준 경로 (워커마다 <경로>.<프로세스 ID> 파일을 쓰고, 재시작 시 종료된 워커가 저장하지 못한 메시지를 다시 반영)
+app.config['CHAT_BUFFER_ENABLED'] = os.getenv("CHAT_BUFFER_ENABLED", "false").lower() == "true"
+app.config['CHAT_FLUSH_INTERVAL'] = float(os.getenv("CHAT_FLUSH_INTERVAL", "0.005"))
+app.config['CHAT_FLUSH_MAX_BATCH'] = int(os.getenv("CHAT_FLUSH_MAX_BATCH", "500"))
+app.config['CHAT_DURABILITY'] = os.getenv("CHAT_DURABILITY", "flush")
+app.config['CHAT_ACK_TIMEOUT'] = float(os.getenv("CHAT_ACK_TIMEOUT", "5"))
+app.config['CHAT_BUFFER_JOURNAL'] = os.getenv("CHAT_BUFFER_JOURNAL")
+message_buffer.init_app(app)
+
+# 계정 삭제 설정 (게시물이 ACCOUNT_DELETE_SYNC_LIMIT개보다 많으면 백그라운드 작업에서 ACCOUNT_DELETE_BATCH_SIZE개씩 삭제)
+# ACCOUNT_DELETE_WORKER=false 이면 앱 안에서 처리하지 않고 flask --app main accounts work로 처리
+app.config['ACCOUNT_DELETE_SYNC_LIMIT'] = int(os.getenv("ACCOUNT_DELETE_SYNC_LIMIT", "200"))
+app.config['ACCOUNT_DELETE_BATCH_SIZE'] = int(os.getenv("ACCOUNT_DELETE_BATCH_SIZE", "200"))
+app.config['ACCOUNT_DELETE_WORKER'] = os.getenv("ACCOUNT_DELETE_WORKER", "true").lower() == "true"
+account_deletion_worker.init_app(app)
+
+
+# 데이터베이스 스키마 버전 확인 (스키마 변경은 flask --app main db upgrade로 수행)
 with app.app_context():
-    db.create_all()
+    try:
+        check_version(db.engine)
+        schema_error = None
+    except SchemaVersionError as e:
+        schema_error = e
+        app.logger.warning(str(e))
 
 
 # Login management
@@ -41,6 +132,17 @@ with app.app_context():
 def load_user(user_id):
     return db.session.get(User, user_id)
 
+@app.errorhandler(RequestEntityTooLarge)
+def upload_too_large(e):
+    """
+    업로드 크기 제한을 넘은 요청을 이전 페이지로 되돌리고 사유를 안내
+    """
+    if e.description == RequestEntityTooLarge.description:
+        flash("요청 크기가 업로드 제한을 넘었습니다.", "danger")
+    else:
+        flash(e.description, "danger")
+    return redirect(request.referrer or url_for('home'))
+
 # Main page
 @app.route('/')
 def home():
@@ -52,33 +154,32 @@ app.register_blueprint(users, url_prefix='/')
 app.register_blueprint(posts, url_prefix='/posts')
 app.register_blueprint(chatting, url_prefix='/chat')
 
+# CLI 명령 등록
+app.cli.add_command(db_cli)
+app.cli.add_command(search_cli)
+app.cli.add_command(chat_cli)
+app.cli.add_command(likes_cli)
+app.cli.add_command(assets_cli)
+app.cli.add_command(accounts_cli)
+
 
 @app.route('/increase/<string:post_id>', methods=["POST"])
 def increase(post_id):
     """
     주어진 post_id의 좋아요 상태 토글
     사용자가 이미 좋아요를 눌렀으면 좋아요 제거, 그렇지 않으면 좋아요 추가
-    게시물의 좋아요 수가 업데이트되고 JSON 형식으로 반환
+    좋아요 행 변경과 좋아요 수 갱신은 하나의 원자적 연산으로 처리되고 JSON 형식으로 반환
     """
-    post = db.get_or_404(Post, post_id)
-
-    like = Like.query.filter_by(user_email=current_user.email, post_id=post_id).first()
-
-    if like:
-        db.session.delete(like)
-        post.like_cnt -= 1
-
-    else:
-        new_like = Like(user_email=current_user.email, post_id=post_id)
-        db.session.add(new_like)
-        post.like_cnt += 1
+    db.get_or_404(Post, post_id)
 
-    db.session.commit()
+    _, like_cnt = toggle_like(db.session, current_user.email, post_id, buffer=like_buffer)
 
     return jsonify({
-        'like_cnt': post.like_cnt
+        'like_cnt': like_cnt
         })
 
 
 if __name__ == '__main__' :
+    if schema_error:
+        raise SystemExit(str(schema_error))
     socketio.run(app, debug=True, allow_unsafe_werkzeug=True)
\ No newline at end of file
@@ -0,0 +1,158 @@
+"""
+버전 관리형 데이터베이스 스키마 마이그레이션
+
+- migrations/versions/NNNN_<이름>.py 모듈이 하나의 스키마 버전을 나타냄
+- 각 모듈은 revision(int), description(str), upgrade(connection), downgrade(connection)를 정의
+- 적용된 버전은 schema_version 테이블에 기록되며, 버전마다 별도 트랜잭션으로 실행
+"""
+import importlib
+import pkgutil
+from datetime import datetime
+
+from sqlalchemy import inspect, text
+
+from migrations import versions
+
+SCHEMA_VERSION_TABLE = "schema_version"
+
+
+class SchemaVersionError(RuntimeError):
+    """
+    데이터베이스 스키마 버전이 애플리케이션이 기대하는 버전과 다를 때 발생하는 예외
+    """
+    pass
+
+
+def load_migrations():
+    """
+    migrations/versions 패키지의 마이그레이션 모듈을 버전 순으로 불러옴
+
+    Returns:
+        list: revision 순으로 정렬된 마이그레이션 모듈 목록
+    """
+    modules = [
+        importlib.import_module(f"{versions.__name__}.{info.name}")
+        for info in pkgutil.iter_modules(versions.__path__)
+    ]
+    modules.sort(key=lambda module: module.revision)
+
+    revisions = [module.revision for module in modules]
+    if revisions != list(range(1, len(modules) + 1)):
+        raise SchemaVersionError(f"마이그레이션 버전이 연속적이지 않습니다: {revisions}")
+    return modules
+
+
+def head_version():
+    """
+    애플리케이션 코드가 기대하는 최신 스키마 버전
+
+    Returns:
+        int: 가장 최근 마이그레이션의 revision
+    """
+    migrations = load_migrations()
+    return migrations[-1].revision if migrations else 0
+
+
+def current_version(connection):
+    """
+    데이터베이스에 적용된 스키마 버전
+
+    Parameters:
+        connection (Connection): 데이터베이스 연결
+
+    Returns:
+        int: 적용된 최신 revision (버전 테이블이 없으면 0)
+    """
+    if not inspect(connection).has_table(SCHEMA_VERSION_TABLE):
+        return 0
+    version = connection.execute(text(f"SELECT MAX(version) FROM {SCHEMA_VERSION_TABLE}")).scalar()
+    return version or 0
+
+
+def upgrade(engine, target=None, log=print):
+    """
+    데이터베이스를 target 버전까지 순서대로 업그레이드
+
+    Parameters:
+        engine (Engine): 데이터베이스 엔진
+        target (int): 목표 버전 (기본값: 최신 버전)
+        log (callable): 진행 상황 출력 함수
+
+    Returns:
+        int: 업그레이드 후 스키마 버전
+    """
+    migrations = load_migrations()
+    target = migrations[-1].revision if target is None else target
+
+    with engine.begin() as connection:
+        connection.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {SCHEMA_VERSION_TABLE} ("
+            "version INTEGER NOT NULL PRIMARY KEY, "
+            "description VARCHAR(200), "
+            "applied_at DATETIME NOT NULL)"
+        ))
+        version = current_version(connection)
+
+    for migration in migrations:
+        if version < migration.revision <= target:
+            with engine.begin() as connection:
+                migration.upgrade(connection)
+                connection.execute(
+                    text(f"INSERT INTO {SCHEMA_VERSION_TABLE} (version, description, applied_at) "
+                         "VALUES (:version, :description, :applied_at)"),
+                    {'version': migration.revision, 'description': migration.description,
+                     'applied_at': datetime.now()}
+                )
+            version = migration.revision
+            log(f"upgrade -> {migration.revision:04d} {migration.description}")
+    return version
+
+
+def downgrade(engine, target, log=print):
+    """
+    데이터베이스를 target 버전까지 역순으로 다운그레이드
+
+    Parameters:
+        engine (Engine): 데이터베이스 엔진
+        target (int): 목표 버전 (0이면 모든 마이그레이션 되돌림)
+        log (callable): 진행 상황 출력 함수
+
+    Returns:
+        int: 다운그레이드 후 스키마 버전
+    """
+    with engine.begin() as connection:
+        version = current_version(connection)
+
+    for migration in reversed(load_migrations()):
+        if target < migration.revision <= version:
+            with engine.begin() as connection:
+                migration.downgrade(connection)
+                connection.execute(
+                    text(f"DELETE FROM {SCHEMA_VERSION_TABLE} WHERE version = :version"),
+                    {'version': migration.revision}
+                )
+            version = migration.revision - 1
+            log(f"downgrade -> {version:04d} ({migration.description} 되돌림)")
+    return version
+
+
+def check_version(engine):
+    """
+    데이터베이스 스키마가 최신 버전인지 확인
+
+    - 애플리케이션 시작 시 호출하며, 스키마를 직접 변경하지 않음
+
+    Parameters:
+        engine (Engine): 데이터베이스 엔진
+
+    Raises:
+        SchemaVersionError: 스키마 버전이 최신 버전과 다른 경우
+    """
+    with engine.begin() as connection:
+        version = current_version(connection)
+    head = head_version()
+    if version != head:
+        raise SchemaVersionError(
+            f"데이터베이스 스키마 버전({version})이 최신 버전({head})과 다릅니다. "
+            "'flask --app main db upgrade'를 실행하세요."
+        )
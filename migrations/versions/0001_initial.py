@@ -0,0 +1,104 @@
+"""
+초기 스키마 (users, posts, likes, rooms, messages, reviews)
+
+- db.create_all()로 만들어진 기존 데이터베이스도 그대로 이 버전으로 인정되도록 IF NOT EXISTS 사용
+"""
+from sqlalchemy import text
+
+revision = 1
+description = "initial schema"
+
+TABLES = {
+    'users': """
+        CREATE TABLE IF NOT EXISTS users (
+            id VARCHAR(36) NOT NULL,
+            first_name VARCHAR(100),
+            last_name VARCHAR(100),
+            name VARCHAR(100),
+            email VARCHAR(100),
+            password VARCHAR(100),
+            profile_image_name VARCHAR(255),
+            PRIMARY KEY (id),
+            UNIQUE (email)
+        )
+    """,
+    'posts': """
+        CREATE TABLE IF NOT EXISTS posts (
+            id VARCHAR(36) NOT NULL,
+            title VARCHAR(250) NOT NULL,
+            date DATETIME NOT NULL,
+            body TEXT NOT NULL,
+            price INTEGER NOT NULL,
+            img_url VARCHAR(250) NOT NULL,
+            like_cnt INTEGER NOT NULL,
+            category VARCHAR(250) NOT NULL,
+            author_id VARCHAR(36),
+            PRIMARY KEY (id),
+            FOREIGN KEY(author_id) REFERENCES users (id)
+        )
+    """,
+    'reviews': """
+        CREATE TABLE IF NOT EXISTS reviews (
+            id VARCHAR(36) NOT NULL,
+            user_name VARCHAR(100) NOT NULL,
+            review_writer VARCHAR(100) NOT NULL,
+            review TEXT NOT NULL,
+            rating INTEGER NOT NULL,
+            PRIMARY KEY (id),
+            FOREIGN KEY(user_name) REFERENCES users (name),
+            FOREIGN KEY(review_writer) REFERENCES users (name)
+        )
+    """,
+    'rooms': """
+        CREATE TABLE IF NOT EXISTS rooms (
+            id VARCHAR(36) NOT NULL,
+            sender_id VARCHAR(36) NOT NULL,
+            receiver_id VARCHAR(36) NOT NULL,
+            date DATETIME NOT NULL,
+            sender_last_join DATETIME,
+            receiver_last_join DATETIME,
+            sender_unread_count INTEGER,
+            receiver_unread_count INTEGER,
+            sender_join BOOLEAN NOT NULL,
+            receiver_join BOOLEAN NOT NULL,
+            sender_stay_join BOOLEAN NOT NULL,
+            receiver_stay_join BOOLEAN NOT NULL,
+            PRIMARY KEY (id),
+            FOREIGN KEY(sender_id) REFERENCES users (id),
+            FOREIGN KEY(receiver_id) REFERENCES users (id)
+        )
+    """,
+    'likes': """
+        CREATE TABLE IF NOT EXISTS likes (
+            id VARCHAR(36) NOT NULL,
+            user_email VARCHAR(100),
+            post_id VARCHAR(36),
+            PRIMARY KEY (id),
+            FOREIGN KEY(user_email) REFERENCES users (email),
+            FOREIGN KEY(post_id) REFERENCES posts (id)
+        )
+    """,
+    'messages': """
+        CREATE TABLE IF NOT EXISTS messages (
+            id VARCHAR(36) NOT NULL,
+            sender_name VARCHAR(100) NOT NULL,
+            receive_user_name VARCHAR(36) NOT NULL,
+            room_id VARCHAR(36) NOT NULL,
+            text TEXT NOT NULL,
+            time DATETIME NOT NULL,
+            PRIMARY KEY (id),
+            FOREIGN KEY(sender_name) REFERENCES users (name),
+            FOREIGN KEY(room_id) REFERENCES rooms (id)
+        )
+    """,
+}
+
+
+def upgrade(connection):
+    for ddl in TABLES.values():
+        connection.execute(text(ddl))
+
+
+def downgrade(connection):
+    for name in reversed(list(TABLES)):
+        connection.execute(text(f"DROP TABLE IF EXISTS {name}"))
@@ -0,0 +1,19 @@
+"""
+게시물 검색용 FTS5 인덱스와 posts 동기화 트리거
+"""
+from sqlalchemy import text
+
+from model.search import POSTS_FTS_TABLE, create_search_index
+
+revision = 2
+description = "post full-text search index"
+
+
+def upgrade(connection):
+    create_search_index(connection)
+
+
+def downgrade(connection):
+    for trigger in ("posts_fts_ai", "posts_fts_ad", "posts_fts_au"):
+        connection.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+    connection.execute(text(f"DROP TABLE IF EXISTS {POSTS_FTS_TABLE}"))
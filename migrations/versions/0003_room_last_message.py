@@ -0,0 +1,39 @@
+"""
+채팅방 마지막 메시지 스냅샷 컬럼 추가 및 기존 메시지로부터 값 채우기
+"""
+from sqlalchemy import inspect, text
+
+revision = 3
+description = "room last message snapshot"
+
+COLUMNS = {
+    'last_message_id': 'VARCHAR(36)',
+    'last_message_at': 'DATETIME',
+    'last_message_preview': 'VARCHAR(200)',
+}
+
+BACKFILL = """
+    UPDATE rooms SET
+        last_message_id = latest.id,
+        last_message_at = latest.time,
+        last_message_preview = substr(latest.text, 1, 200)
+    FROM (
+        SELECT id, room_id, time, text,
+               ROW_NUMBER() OVER (PARTITION BY room_id ORDER BY time DESC, id DESC) AS position
+        FROM messages
+    ) AS latest
+    WHERE latest.room_id = rooms.id AND latest.position = 1
+"""
+
+
+def upgrade(connection):
+    existing = {column['name'] for column in inspect(connection).get_columns('rooms')}
+    for name, ddl_type in COLUMNS.items():
+        if name not in existing:
+            connection.execute(text(f"ALTER TABLE rooms ADD COLUMN {name} {ddl_type}"))
+    connection.execute(text(BACKFILL))
+
+
+def downgrade(connection):
+    for name in reversed(list(COLUMNS)):
+        connection.execute(text(f"ALTER TABLE rooms DROP COLUMN {name}"))
@@ -0,0 +1,39 @@
+"""
+자주 사용하는 필터/정렬 컬럼에 대한 보조 인덱스와 좋아요 (user_email, post_id) 유니크 인덱스
+"""
+from sqlalchemy import text
+
+revision = 4
+description = "secondary indexes"
+
+INDEXES = {
+    'ix_users_name': "users (name)",
+    'ix_posts_date': "posts (date, id)",
+    'ix_posts_like_cnt': "posts (like_cnt, date, id)",
+    'ix_posts_category_date': "posts (category, date, id)",
+    'ix_posts_category_like_cnt': "posts (category, like_cnt, date, id)",
+    'ix_posts_author_date': "posts (author_id, date, id)",
+    'ix_likes_post_id': "likes (post_id)",
+    'ix_rooms_sender_receiver': "rooms (sender_id, receiver_id)",
+    'ix_rooms_receiver_sender': "rooms (receiver_id, sender_id)",
+    'ix_messages_room_time': "messages (room_id, time)",
+    'ix_reviews_user_name': "reviews (user_name)",
+}
+
+
+def upgrade(connection):
+    # 유니크 인덱스 생성 전에 중복 좋아요를 하나만 남기고 정리
+    connection.execute(text(
+        "DELETE FROM likes WHERE id NOT IN "
+        "(SELECT MIN(id) FROM likes GROUP BY user_email, post_id)"
+    ))
+    connection.execute(text(
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_likes_user_post ON likes (user_email, post_id)"
+    ))
+    for name, target in INDEXES.items():
+        connection.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {target}"))
+
+
+def downgrade(connection):
+    for name in ['uq_likes_user_post', *INDEXES]:
+        connection.execute(text(f"DROP INDEX IF EXISTS {name}"))
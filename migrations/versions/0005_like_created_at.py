@@ -0,0 +1,31 @@
+"""
+좋아요 시간 컬럼 추가 및 사용자별 좋아요 시간순 인덱스 생성
+"""
+from sqlalchemy import inspect, text
+
+revision = 5
+description = "like created_at"
+
+# 기존 좋아요는 누른 시간을 알 수 없으므로 가장 이른 시점인 게시물 작성 시간으로 채움
+BACKFILL = """
+    UPDATE likes SET created_at = COALESCE(
+        (SELECT posts.date FROM posts WHERE posts.id = likes.post_id),
+        CURRENT_TIMESTAMP
+    )
+    WHERE created_at IS NULL
+"""
+
+
+def upgrade(connection):
+    existing = {column['name'] for column in inspect(connection).get_columns('likes')}
+    if 'created_at' not in existing:
+        connection.execute(text("ALTER TABLE likes ADD COLUMN created_at DATETIME"))
+    connection.execute(text(BACKFILL))
+    connection.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_likes_user_created ON likes (user_email, created_at, id)"
+    ))
+
+
+def downgrade(connection):
+    connection.execute(text("DROP INDEX IF EXISTS ix_likes_user_created"))
+    connection.execute(text("ALTER TABLE likes DROP COLUMN created_at"))
@@ -0,0 +1,82 @@
+"""
+게시물 이미지를 post_images 테이블로 분리하고 posts.img_url 컬럼 제거
+
+- 쉼표로 이어 붙인 img_url을 순서대로 나누어 이미지 행으로 변환하며 첫 번째 이미지를 대표 이미지로 지정
+- public_id는 기존 삭제 로직과 같은 방식(Products/<파일 이름>)으로 URL에서 추출
+- 기존 이미지의 크기는 알 수 없으므로 width, height는 비워 둠
+"""
+import uuid
+
+from sqlalchemy import inspect, text
+
+revision = 6
+description = "post images"
+
+CREATE_TABLE = """
+    CREATE TABLE IF NOT EXISTS post_images (
+        id VARCHAR(36) NOT NULL,
+        post_id VARCHAR(36) NOT NULL,
+        position INTEGER NOT NULL,
+        is_cover BOOLEAN NOT NULL,
+        url VARCHAR(250) NOT NULL,
+        public_id VARCHAR(250),
+        width INTEGER,
+        height INTEGER,
+        PRIMARY KEY (id),
+        FOREIGN KEY(post_id) REFERENCES posts (id)
+    )
+"""
+
+INDEXES = {
+    'ix_post_images_post_position': "post_images (post_id, position)",
+    'ix_post_images_post_cover': "post_images (post_id, is_cover)",
+}
+
+
+def public_id_from_url(url):
+    return f"Products/{url.split('/')[-1].split('.')[0]}"
+
+
+def upgrade(connection):
+    connection.execute(text(CREATE_TABLE))
+    for name, target in INDEXES.items():
+        connection.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {target}"))
+
+    if 'img_url' not in {column['name'] for column in inspect(connection).get_columns('posts')}:
+        return
+
+    rows = []
+    for post_id, img_url in connection.execute(text("SELECT id, img_url FROM posts")):
+        urls = [url.strip() for url in (img_url or '').split(',') if url.strip()]
+        rows.extend({
+            'id': str(uuid.uuid4()),
+            'post_id': post_id,
+            'position': position,
+            'is_cover': position == 0,
+            'url': url,
+            'public_id': public_id_from_url(url),
+        } for position, url in enumerate(urls))
+
+    if rows:
+        connection.execute(text(
+            "INSERT INTO post_images (id, post_id, position, is_cover, url, public_id) "
+            "VALUES (:id, :post_id, :position, :is_cover, :url, :public_id)"
+        ), rows)
+
+    connection.execute(text("ALTER TABLE posts DROP COLUMN img_url"))
+
+
+def downgrade(connection):
+    connection.execute(text("ALTER TABLE posts ADD COLUMN img_url VARCHAR(250) NOT NULL DEFAULT ''"))
+    connection.execute(text("""
+        UPDATE posts SET img_url = COALESCE((
+            SELECT group_concat(url, ',') FROM (
+                SELECT url FROM post_images
+                WHERE post_images.post_id = posts.id
+                ORDER BY position
+            )
+        ), '')
+    """))
+    for name in INDEXES:
+        connection.execute(text(f"DROP INDEX IF EXISTS {name}"))
+    connection.execute(text("DROP TABLE IF EXISTS post_images"))
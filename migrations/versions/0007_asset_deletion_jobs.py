@@ -0,0 +1,30 @@
+"""
+Cloudinary 에셋 삭제 작업 큐 테이블
+"""
+from sqlalchemy import text
+
+revision = 7
+description = "asset deletion jobs"
+
+
+def upgrade(connection):
+    connection.execute(text("""
+        CREATE TABLE IF NOT EXISTS asset_deletion_jobs (
+            id INTEGER NOT NULL,
+            public_id VARCHAR(250) NOT NULL,
+            status VARCHAR(20) NOT NULL,
+            attempts INTEGER NOT NULL,
+            next_attempt_at DATETIME NOT NULL,
+            last_error VARCHAR(500),
+            created_at DATETIME NOT NULL,
+            PRIMARY KEY (id)
+        )
+    """))
+    connection.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_asset_jobs_status_next ON asset_deletion_jobs (status, next_attempt_at)"
+    ))
+
+
+def downgrade(connection):
+    connection.execute(text("DROP INDEX IF EXISTS ix_asset_jobs_status_next"))
+    connection.execute(text("DROP TABLE IF EXISTS asset_deletion_jobs"))
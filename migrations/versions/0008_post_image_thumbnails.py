@@ -0,0 +1,26 @@
+"""
+게시물 이미지의 목록 카드용 썸네일 컬럼 추가
+
+- 기존 이미지는 썸네일이 없으므로 목록 카드에서 원본 URL을 그대로 사용
+"""
+from sqlalchemy import inspect, text
+
+revision = 8
+description = "post image thumbnails"
+
+COLUMNS = {
+    'thumbnail_url': 'VARCHAR(250)',
+    'thumbnail_public_id': 'VARCHAR(250)',
+}
+
+
+def upgrade(connection):
+    existing = {column['name'] for column in inspect(connection).get_columns('post_images')}
+    for name, ddl_type in COLUMNS.items():
+        if name not in existing:
+            connection.execute(text(f"ALTER TABLE post_images ADD COLUMN {name} {ddl_type}"))
+
+
+def downgrade(connection):
+    for name in reversed(list(COLUMNS)):
+        connection.execute(text(f"ALTER TABLE post_images DROP COLUMN {name}"))
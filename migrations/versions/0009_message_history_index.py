@@ -0,0 +1,21 @@
+"""
+채팅 기록 커서 페이지네이션을 위해 메시지 인덱스에 id 추가
+
+- 같은 시간에 저장된 메시지도 (time, id) 커서로 구분하여 인덱스 범위만으로 이전 페이지 조회
+"""
+from sqlalchemy import text
+
+revision = 9
+description = "message history index"
+
+
+def upgrade(connection):
+    connection.execute(text("DROP INDEX IF EXISTS ix_messages_room_time"))
+    connection.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_messages_room_time_id ON messages (room_id, time, id)"
+    ))
+
+
+def downgrade(connection):
+    connection.execute(text("DROP INDEX IF EXISTS ix_messages_room_time_id"))
+    connection.execute(text("CREATE INDEX IF NOT EXISTS ix_messages_room_time ON messages (room_id, time)"))
@@ -0,0 +1,27 @@
+"""
+계정 삭제 작업 큐 테이블
+
+- 게시물이 많은 계정은 요청 안에서 지우지 않고 account_deletion_jobs에 등록하여 나누어 삭제
+"""
+from sqlalchemy import text
+
+revision = 10
+description = "account deletion jobs"
+
+
+def upgrade(connection):
+    connection.execute(text("""
+        CREATE TABLE IF NOT EXISTS account_deletion_jobs (
+            id INTEGER NOT NULL,
+            user_id VARCHAR(36) NOT NULL,
+            attempts INTEGER NOT NULL,
+            next_attempt_at DATETIME NOT NULL,
+            last_error VARCHAR(500),
+            created_at DATETIME NOT NULL,
+            PRIMARY KEY (id)
+        )
+    """))
+
+
+def downgrade(connection):
+    connection.execute(text("DROP TABLE IF EXISTS account_deletion_jobs"))
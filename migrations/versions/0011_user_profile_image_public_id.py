@@ -0,0 +1,20 @@
+"""
+사용자 프로필 이미지의 에셋 ID 컬럼 추가
+
+- 프로필 이미지를 바꾸거나 계정을 삭제할 때 URL을 해석하지 않고 저장된 에셋 ID로 이전 이미지 삭제 작업을 등록
+- 기존 프로필 이미지는 에셋 ID를 알 수 없으므로 비워 둠 (기본 이미지와 구분할 수 없어 삭제 대상에서 제외)
+"""
+from sqlalchemy import inspect, text
+
+revision = 11
+description = "user profile image public_id"
+
+
+def upgrade(connection):
+    existing = {column['name'] for column in inspect(connection).get_columns('users')}
+    if 'profile_image_public_id' not in existing:
+        connection.execute(text("ALTER TABLE users ADD COLUMN profile_image_public_id VARCHAR(250)"))
+
+
+def downgrade(connection):
+    connection.execute(text("ALTER TABLE users DROP COLUMN profile_image_public_id"))
@@ -0,0 +1,19 @@
+"""
+게시물 가격대 필터 인덱스
+
+- 가격대만 지정하거나 카테고리와 함께 지정한 목록 조회가 정렬 인덱스 전체를 읽지 않고 가격 범위만 읽도록 함
+"""
+from sqlalchemy import text
+
+revision = 12
+description = "post price indexes"
+
+
+def upgrade(connection):
+    connection.execute(text("CREATE INDEX IF NOT EXISTS ix_posts_price ON posts (price)"))
+    connection.execute(text("CREATE INDEX IF NOT EXISTS ix_posts_category_price ON posts (category, price)"))
+
+
+def downgrade(connection):
+    connection.execute(text("DROP INDEX IF EXISTS ix_posts_category_price"))
+    connection.execute(text("DROP INDEX IF EXISTS ix_posts_price"))
@@ -0,0 +1,24 @@
+"""
+채팅방 실시간 연결 상태 컬럼 삭제
+
+- 채팅방 접속 상태는 realtime/presence.py의 PresenceRegistry가 메모리에서 관리하므로
+  더 이상 읽거나 쓰지 않는 sender_stay_join, receiver_stay_join 컬럼 제거
+"""
+from sqlalchemy import inspect, text
+
+revision = 13
+description = "drop room stay_join"
+
+COLUMNS = ('sender_stay_join', 'receiver_stay_join')
+
+
+def upgrade(connection):
+    existing = {column['name'] for column in inspect(connection).get_columns('rooms')}
+    for column in COLUMNS:
+        if column in existing:
+            connection.execute(text(f"ALTER TABLE rooms DROP COLUMN {column}"))
+
+
+def downgrade(connection):
+    for column in COLUMNS:
+        connection.execute(text(f"ALTER TABLE rooms ADD COLUMN {column} BOOLEAN NOT NULL DEFAULT 0"))
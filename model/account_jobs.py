@@ -0,0 +1,162 @@
+import atexit
+import threading
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, select, update
+
+from model.asset_jobs import backoff_delay
+from model.data import AccountDeletionJob, db
+from model.teardown import delete_user_posts
+
+# 한 트랜잭션에서 삭제하는 최대 게시물 수 (트랜잭션을 짧게 유지하여 다른 요청의 쓰기를 오래 막지 않음)
+ACCOUNT_DELETE_BATCH = 200
+# 작업자가 가져간 작업을 다른 작업자가 다시 가져가지 못하는 시간(초, 묶음을 삭제할 때마다 연장)
+LEASE_SECONDS = 120
+# 처리할 작업이 있는지 다시 확인하는 주기(초) (다른 워커에서 등록했거나 실패 후 재시도할 작업)
+POLL_INTERVAL = 60.0
+
+
+def claim_account_job(connection, now=None):
+    """
+    처리할 계정 삭제 작업 하나를 가져오고 임대 시간 동안 다른 작업자가 가져가지 못하도록 표시
+
+    Parameters:
+        connection (Connection): 트랜잭션이 열린 데이터베이스 연결
+        now (datetime): 기준 시간 (기본값: 현재 시간)
+
+    Returns:
+        Row | None: (id, user_id, attempts) (처리할 작업이 없으면 None)
+    """
+    now = now or datetime.now()
+    due = (
+        select(AccountDeletionJob.id)
+        .where(AccountDeletionJob.next_attempt_at <= now)
+        .order_by(AccountDeletionJob.id)
+        .limit(1)
+    )
+    return connection.execute(
+        update(AccountDeletionJob)
+        .where(AccountDeletionJob.id.in_(due))
+        .values(attempts=AccountDeletionJob.attempts + 1,
+                next_attempt_at=now + timedelta(seconds=LEASE_SECONDS))
+        .returning(AccountDeletionJob.id, AccountDeletionJob.user_id, AccountDeletionJob.attempts)
+    ).first()
+
+
+def process_account_job(engine, batch_size=ACCOUNT_DELETE_BATCH):
+    """
+    계정 삭제 작업 하나를 가져와 게시물을 batch_size개씩 별도 트랜잭션으로 삭제
+
+    - 게시물이 모두 삭제되면 작업을 제거
+    - 실패하면 지수 백오프로 다음 시도 시간을 미루고 이미 삭제한 게시물은 그대로 둠 (다음 시도에서 이어서 삭제)
+
+    Parameters:
+        engine (Engine): 데이터베이스 엔진
+        batch_size (int): 한 트랜잭션에서 삭제할 최대 게시물 수
+
+    Returns:
+        dict: 처리 결과 (claimed, deleted_posts, finished)
+    """
+    with engine.begin() as connection:
+        job = claim_account_job(connection)
+    if job is None:
+        return {'claimed': 0, 'deleted_posts': 0, 'finished': False}
+
+    deleted = 0
+    try:
+        while True:
+            with engine.begin() as connection:
+                count = delete_user_posts(connection, job.user_id, batch_size)
+                if count < batch_size:
+                    connection.execute(delete(AccountDeletionJob).where(AccountDeletionJob.id == job.id))
+                else:
+                    connection.execute(
+                        update(AccountDeletionJob)
+                        .where(AccountDeletionJob.id == job.id)
+                        .values(next_attempt_at=datetime.now() + timedelta(seconds=LEASE_SECONDS))
+                    )
+            deleted += count
+            if count < batch_size:
+                return {'claimed': 1, 'deleted_posts': deleted, 'finished': True}
+    except Exception as e:
+        with engine.begin() as connection:
+            connection.execute(
+                update(AccountDeletionJob)
+                .where(AccountDeletionJob.id == job.id)
+                .values(next_attempt_at=datetime.now() + backoff_delay(job.attempts),
+                        last_error=str(e)[:500] or type(e).__name__)
+            )
+        raise
+
+
+class AccountDeletionWorker:
+    """
+    계정 삭제 작업을 애플리케이션 안의 백그라운드 스레드에서 처리하는 작업자
+
+    - 계정 삭제 요청이 작업을 등록하면 wake()로 바로 처리를 시작하여 요청은 게시물 삭제를 기다리지 않음
+    - POLL_INTERVAL마다 남은 작업(다른 워커에서 등록했거나 재시도할 작업)을 확인
+
+    Attributes:
+        enabled (bool): 백그라운드 스레드 사용 여부 (ACCOUNT_DELETE_WORKER)
+        batch_size (int): 한 트랜잭션에서 삭제할 최대 게시물 수 (ACCOUNT_DELETE_BATCH_SIZE)
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.batch_size = ACCOUNT_DELETE_BATCH
+        self.app = None
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def init_app(self, app):
+        """
+        애플리케이션 설정을 읽고, 작업자를 사용하면 처리 스레드를 시작
+
+        Parameters:
+            app (Flask): Flask 애플리케이션
+        """
+        self.app = app
+        self.enabled = app.config.get('ACCOUNT_DELETE_WORKER', True)
+        self.batch_size = app.config.get('ACCOUNT_DELETE_BATCH_SIZE', self.batch_size)
+        app.extensions['account_deletion_worker'] = self
+
+        if self.enabled and self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='account-deletion', daemon=True)
+            self._thread.start()
+            atexit.register(self.stop)
+
+    def wake(self):
+        """
+        등록된 작업을 다음 확인 주기를 기다리지 않고 처리
+        """
+        self._wake.set()
+
+    def stop(self):
+        """
+        처리 스레드를 멈춤 (처리 중인 작업은 임대 시간이 지나면 다시 처리 대상이 됨)
+        """
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wake.wait(POLL_INTERVAL)
+            self._wake.clear()
+            with self.app.app_context():
+                while not self._stopped.is_set():
+                    try:
+                        result = process_account_job(db.engine, self.batch_size)
+                    except Exception:
+                        self.app.logger.exception('계정 게시물 삭제에 실패했습니다.')
+                        break
+                    if not result['claimed']:
+                        break
+                    self.app.logger.info('삭제된 계정의 게시물 %d개를 삭제했습니다.', result['deleted_posts'])
+
+
+# 애플리케이션 전체에서 사용하는 계정 삭제 작업자
+account_deletion_worker = AccountDeletionWorker()
@@ -0,0 +1,216 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import bindparam, delete, func, select, union, update
+
+from model.data import AssetDeletionJob, PostImage, User, db
+
+# 작업 하나의 최대 시도 횟수 (넘으면 failed 상태로 남김)
+MAX_ATTEMPTS = 8
+# 재시도 지연: BACKOFF_BASE * 2^(시도 횟수 - 1) 초, 최대 BACKOFF_MAX 초
+BACKOFF_BASE = 30
+BACKOFF_MAX = 3600
+# 작업자가 가져간 작업을 다른 작업자가 다시 가져가지 못하는 시간(초)
+LEASE_SECONDS = 300
+# 한 번의 일괄 삭제 요청에 담는 최대 에셋 수 (Cloudinary delete_resources 제한)
+BULK_DELETE_LIMIT = 100
+
+
+def enqueue_asset_deletions(session, public_ids):
+    """
+    Cloudinary 에셋 삭제 작업을 작업 큐에 등록
+
+    - 커밋하지 않으므로 게시물/이미지 삭제와 같은 트랜잭션으로 커밋하면
+      데이터베이스 변경이 취소될 때 삭제 작업도 함께 취소됨
+
+    Parameters:
+        session (Session): 데이터베이스 세션
+        public_ids (iterable): 삭제할 에셋의 public_id
+
+    Returns:
+        int: 등록된 작업 수
+    """
+    jobs = [AssetDeletionJob(public_id=public_id) for public_id in dict.fromkeys(public_ids) if public_id]
+    session.add_all(jobs)
+    return len(jobs)
+
+
+def backoff_delay(attempts):
+    """
+    시도 횟수에 따른 재시도 지연 시간
+
+    Parameters:
+        attempts (int): 지금까지의 시도 횟수
+
+    Returns:
+        timedelta: 다음 시도까지의 지연 시간
+    """
+    return timedelta(seconds=min(BACKOFF_BASE * 2 ** max(attempts - 1, 0), BACKOFF_MAX))
+
+
+def claim_jobs(connection, limit, now=None):
+    """
+    처리할 작업을 가져오고 임대 시간 동안 다른 작업자가 가져가지 못하도록 표시
+
+    - 조회와 표시를 하나의 UPDATE ... RETURNING으로 수행하여 여러 작업자가 같은 작업을 중복 처리하지 않음
+    - 작업자가 처리 도중 종료되어도 임대 시간이 지나면 다시 처리 대상이 됨
+
+    Parameters:
+        connection (Connection): 트랜잭션이 열린 데이터베이스 연결
+        limit (int): 가져올 최대 작업 수
+        now (datetime): 기준 시간 (기본값: 현재 시간)
+
+    Returns:
+        list: (id, public_id, attempts) 목록
+    """
+    now = now or datetime.now()
+    due = (
+        select(AssetDeletionJob.id)
+        .where(AssetDeletionJob.status == 'pending', AssetDeletionJob.next_attempt_at <= now)
+        .order_by(AssetDeletionJob.id)
+        .limit(limit)
+    )
+    return connection.execute(
+        update(AssetDeletionJob)
+        .where(AssetDeletionJob.id.in_(due))
+        .values(attempts=AssetDeletionJob.attempts + 1,
+                next_attempt_at=now + timedelta(seconds=LEASE_SECONDS))
+        .returning(AssetDeletionJob.id, AssetDeletionJob.public_id, AssetDeletionJob.attempts)
+    ).all()
+
+
+def still_referenced(connection, public_ids):
+    """
+    아직 게시물 이미지나 프로필 이미지가 사용 중인 public_id
+
+    - 내용 주소 저장소(local)는 같은 이미지를 한 번만 저장하고 프로필 이미지도 같은 폴더에 저장하므로
+      다른 게시물이나 사용자의 프로필이 같은 에셋을 쓰고 있으면 삭제하지 않음
+
+    Parameters:
+        connection (Connection): 데이터베이스 연결
+        public_ids (list): 확인할 public_id 목록
+
+    Returns:
+        set: 사용 중인 public_id
+    """
+    if not public_ids:
+        return set()
+    return set(connection.scalars(union(
+        select(PostImage.public_id).where(PostImage.public_id.in_(public_ids)),
+        select(PostImage.thumbnail_public_id).where(PostImage.thumbnail_public_id.in_(public_ids)),
+        select(User.profile_image_public_id).where(User.profile_image_public_id.in_(public_ids)),
+    )))
+
+
+def referenced_assets(public_ids):
+    """
+    업로드 파이프라인이 롤백하기 전에 아직 사용 중인 에셋을 확인 (UploadPipeline.referenced)
+
+    - 요청 세션과 별도의 연결로 커밋된 게시물 이미지와 프로필 이미지만 확인
+
+    Parameters:
+        public_ids (list): 확인할 public_id 목록
+
+    Returns:
+        set: 사용 중인 public_id
+    """
+    with db.engine.connect() as connection:
+        return still_referenced(connection, public_ids)
+
+
+def process_asset_jobs(engine, storage, batch_size=BULK_DELETE_LIMIT, now=None):
+    """
+    처리할 작업을 한 묶음 가져와 Cloudinary에서 일괄 삭제하고 결과를 기록
+
+    - 삭제에 성공한(또는 이미 없는) 에셋의 작업은 큐에서 제거
+    - 다른 게시물 이미지나 프로필 이미지가 아직 사용하는 에셋은 삭제하지 않고 작업만 제거
+    - 실패한 작업은 지수 백오프로 다음 시도 시간을 미루고, MAX_ATTEMPTS를 넘으면 failed로 남김
+
+    Parameters:
+        engine (Engine): 데이터베이스 엔진
+        storage: 저장소 백엔드 (destroy_many 사용)
+        batch_size (int): 한 번에 처리할 최대 작업 수
+        now (datetime): 기준 시간 (기본값: 현재 시간)
+
+    Returns:
+        dict: 처리 결과 수 (claimed, deleted, retried, failed)
+    """
+    now = now or datetime.now()
+    with engine.begin() as connection:
+        jobs = claim_jobs(connection, batch_size, now)
+        in_use = still_referenced(connection, [job.public_id for job in jobs])
+
+    if not jobs:
+        return {'claimed': 0, 'deleted': 0, 'retried': 0, 'failed': 0}
+
+    done, errors = set(in_use), {}
+    public_ids = [public_id for public_id in dict.fromkeys(job.public_id for job in jobs) if public_id not in in_use]
+    for start in range(0, len(public_ids), BULK_DELETE_LIMIT):
+        chunk = public_ids[start:start + BULK_DELETE_LIMIT]
+        try:
+            deleted = storage.destroy_many(chunk)
+        except Exception as e:
+            errors.update(dict.fromkeys(chunk, str(e)[:500] or type(e).__name__))
+            continue
+        done.update(deleted)
+        errors.update(dict.fromkeys((public_id for public_id in chunk if public_id not in deleted),
+                                    '삭제 결과에 포함되지 않았습니다.'))
+
+    succeeded = [job.id for job in jobs if job.public_id in done]
+    failures = [job for job in jobs if job.public_id not in done]
+    retry = [{
+        'job_id': job.id,
+        'next_at': now + backoff_delay(job.attempts),
+        'error': errors.get(job.public_id),
+        'new_status': 'failed' if job.attempts >= MAX_ATTEMPTS else 'pending',
+    } for job in failures]
+
+    with engine.begin() as connection:
+        if succeeded:
+            connection.execute(delete(AssetDeletionJob).where(AssetDeletionJob.id.in_(succeeded)))
+        if retry:
+            connection.execute(
+                update(AssetDeletionJob)
+                .where(AssetDeletionJob.id == bindparam('job_id'))
+                .values(next_attempt_at=bindparam('next_at'),
+                        last_error=bindparam('error'),
+                        status=bindparam('new_status')),
+                retry
+            )
+
+    failed = sum(1 for row in retry if row['new_status'] == 'failed')
+    return {'claimed': len(jobs), 'deleted': len(succeeded), 'retried': len(retry) - failed, 'failed': failed}
+
+
+def asset_job_counts(session):
+    """
+    상태별 작업 수
+
+    Parameters:
+        session (Session): 데이터베이스 세션
+
+    Returns:
+        dict: {status: 작업 수}
+    """
+    return dict(session.execute(
+        select(AssetDeletionJob.status, func.count()).group_by(AssetDeletionJob.status)
+    ).all())
+
+
+def retry_failed_jobs(session):
+    """
+    failed 상태의 작업을 시도 횟수를 초기화하여 다시 처리 대상으로 되돌림
+
+    Parameters:
+        session (Session): 데이터베이스 세션
+
+    Returns:
+        int: 되돌린 작업 수
+    """
+    result = session.execute(
+        update(AssetDeletionJob)
+        .where(AssetDeletionJob.status == 'failed')
+        .values(status='pending', attempts=0, next_attempt_at=datetime.now())
+        .execution_options(synchronize_session=False)
+    )
+    session.commit()
+    return result.rowcount
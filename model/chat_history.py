@@ -0,0 +1,45 @@
+from sqlalchemy import select
+
+from model.data import Message
+from model.pagination import keyset_paginate
+
+# 채팅 기록 정렬 키 (같은 시간에 보낸 메시지는 ID로 구분)
+HISTORY_KEYS = [Message.time, Message.id]
+
+
+def message_history_query(room_id, since=None):
+    """
+    채팅방의 메시지 기록 조회 쿼리 생성
+
+    Parameters:
+        room_id (str): 채팅방 ID
+        since (datetime): 사용자가 마지막으로 참여한 시간 (이전 메시지는 보이지 않음)
+
+    Returns:
+        Select: 메시지 조회 쿼리
+    """
+    query = select(Message).where(Message.room_id == room_id)
+    if since:
+        query = query.where(Message.time >= since)
+    return query
+
+
+def message_history(session, room_id, since=None, cursor=None, per_page=30):
+    """
+    최신 메시지부터 (time, id) 커서로 이전 메시지를 한 페이지씩 조회
+
+    - 첫 페이지는 가장 최근 메시지 per_page개, next_cursor로 그보다 이전 메시지를 조회
+    - (room_id, time, id) 인덱스 범위만 읽으므로 대화가 길어져도 페이지 조회 비용이 일정
+
+    Parameters:
+        session (Session): 데이터베이스 세션
+        room_id (str): 채팅방 ID
+        since (datetime): 사용자가 마지막으로 참여한 시간
+        cursor (str): 이전 응답의 next_cursor 토큰
+        per_page (int): 페이지 크기
+
+    Returns:
+        KeysetPagination: 최신순 메시지와 더 이전 페이지 토큰 (next_cursor)
+    """
+    return keyset_paginate(session, message_history_query(room_id, since), HISTORY_KEYS,
+                           cursor=cursor, per_page=per_page)
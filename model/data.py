@@ -2,6 +2,7 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
 from sqlalchemy.orm import DeclarativeBase
 import uuid
+from datetime import datetime
 
 
 class Base(DeclarativeBase):
@@ -30,6 +31,7 @@ class User(UserMixin, db.Model):
         email (str): 사용자의 이메일
         password (str): 암호화된 비밀번호
         profile_image_name (str): 프로필 이미지 파일명
+        profile_image_public_id (str): 업로드한 프로필 이미지의 에셋 ID (기본 이미지이면 None)
         
     Relationships:
         likes: 사용자가 좋아요한 게시물과의 관계
@@ -38,6 +40,10 @@ class User(UserMixin, db.Model):
         room_receiver: 사용자가 받은 채팅방과의 관계
     """
     __tablename__ = "users"
+    __table_args__ = (
+        # 프로필 페이지, 리뷰, 채팅 이벤트에서 닉네임으로 사용자 조회
+        db.Index('ix_users_name', 'name'),
+    )
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     first_name = db.Column(db.String(100))
     last_name = db.Column(db.String(100))
@@ -45,6 +51,7 @@ class User(UserMixin, db.Model):
     email = db.Column(db.String(100), unique=True)
     password = db.Column(db.String(100))
     profile_image_name = db.Column(db.String(255))
+    profile_image_public_id = db.Column(db.String(250))
 
     likes = db.relationship('Like', back_populates='user')
     author_posts = db.relationship("Post", back_populates="author")
@@ -62,7 +69,6 @@ class Post(db.Model):
         date (DateTime): 게시물 작성일
         body (Text): 게시물 내용
         price (int): 상품 가격
-        img_url (str): 이미지 URL
         like_cnt (int): 좋아요 수
         category (str): 게시물 카테고리
         author_id (str): 작성자 ID (외래 키)
@@ -70,14 +76,28 @@ class Post(db.Model):
     Relationships:
         liked_by: 게시물을 좋아요한 사용자와의 관계 (Like 모델과 1:N 관계)
         author: 게시물 작성자와의 관계 (User 모델과 N:1 관계)
+        images: 게시물 이미지 목록 (PostImage 모델과 1:N 관계, 표시 순서대로 정렬)
+        cover_image: 목록 카드에 표시하는 대표 이미지 (읽기 전용)
     """
     __tablename__ = "posts"
+    __table_args__ = (
+        # 목록 정렬: 최신순 / 인기순 (id는 동일 값 사이의 순서를 고정하는 보조 키)
+        db.Index('ix_posts_date', 'date', 'id'),
+        db.Index('ix_posts_like_cnt', 'like_cnt', 'date', 'id'),
+        # 카테고리 필터 + 정렬
+        db.Index('ix_posts_category_date', 'category', 'date', 'id'),
+        db.Index('ix_posts_category_like_cnt', 'category', 'like_cnt', 'date', 'id'),
+        # 가격대 필터 (카테고리 없이 / 카테고리와 함께)
+        db.Index('ix_posts_price', 'price'),
+        db.Index('ix_posts_category_price', 'category', 'price'),
+        # 작성자별 게시물 (내 게시물, 프로필, 회원 탈퇴)
+        db.Index('ix_posts_author_date', 'author_id', 'date', 'id'),
+    )
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     title = db.Column(db.String(250), nullable=False)
     date = db.Column(db.DateTime, nullable=False)
     body = db.Column(db.Text, nullable=False)
     price = db.Column(db.Integer, nullable=False)
-    img_url = db.Column(db.String(250), nullable=False)
     like_cnt = db.Column(db.Integer, nullable=False, default=0)
     category = db.Column(db.String(250), nullable=False)
 
@@ -85,6 +105,67 @@ class Post(db.Model):
 
     liked_by = db.relationship('Like', back_populates='post')
     author = db.relationship("User", back_populates="author_posts")
+    images = db.relationship('PostImage', back_populates='post', order_by='PostImage.position',
+                             cascade='all, delete-orphan')
+    cover_image = db.relationship(
+        'PostImage',
+        primaryjoin='and_(PostImage.post_id == Post.id, PostImage.is_cover == True)',
+        uselist=False, viewonly=True
+    )
+
+
+class PostImage(db.Model):
+    """
+    게시물에 첨부된 이미지 정보를 저장하는 모델
+
+    Attributes:
+        id (str): 이미지의 고유 식별자
+        post_id (str): 이미지가 속한 게시물의 ID (외래 키)
+        position (int): 게시물 안에서의 표시 순서 (0부터 시작)
+        is_cover (bool): 목록 카드에 표시하는 대표 이미지 여부 (게시물당 하나)
+        url (str): 이미지 URL
+        public_id (str): Cloudinary public_id (이미지 삭제에 사용)
+        width (int): 이미지 너비 (px)
+        height (int): 이미지 높이 (px)
+        thumbnail_url (str): 목록 카드용 썸네일 URL (없으면 원본 사용)
+        thumbnail_public_id (str): 썸네일의 Cloudinary public_id
+
+    Relationships:
+        post: 이미지가 속한 게시물과의 관계
+    """
+    __tablename__ = "post_images"
+    __table_args__ = (
+        # 게시물 상세/수정 화면의 이미지 순서 조회
+        db.Index('ix_post_images_post_position', 'post_id', 'position'),
+        # 목록 카드의 대표 이미지 조회
+        db.Index('ix_post_images_post_cover', 'post_id', 'is_cover'),
+    )
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    post_id = db.Column(db.String(36), db.ForeignKey('posts.id'), nullable=False)
+    position = db.Column(db.Integer, nullable=False, default=0)
+    is_cover = db.Column(db.Boolean, nullable=False, default=False)
+    url = db.Column(db.String(250), nullable=False)
+    public_id = db.Column(db.String(250))
+    width = db.Column(db.Integer)
+    height = db.Column(db.Integer)
+    thumbnail_url = db.Column(db.String(250))
+    thumbnail_public_id = db.Column(db.String(250))
+
+    post = db.relationship('Post', back_populates='images')
+
+    @property
+    def card_url(self):
+        """
+        목록 카드에 표시할 이미지 URL (썸네일이 없으면 원본)
+        """
+        return self.thumbnail_url or self.url
+
+    @property
+    def asset_ids(self):
+        """
+        이 이미지가 사용하는 Cloudinary 에셋의 public_id 목록 (원본과 썸네일)
+        """
+        return [public_id for public_id in (self.public_id, self.thumbnail_public_id) if public_id]
 
 
 class Like(db.Model):
@@ -95,16 +176,26 @@ class Like(db.Model):
         id (str): 좋아요의 고유 식별자
         user_email (str): 좋아요를 누른 사용자의 이메일 (외래 키)
         post_id (str): 좋아요가 눌린 게시물의 ID (외래 키)
+        created_at (datetime): 좋아요를 누른 시간
         
     Relationships:
         user: 좋아요를 누른 사용자와의 관계
         post: 좋아요가 눌린 게시물과의 관계
     """
     __tablename__= "likes"
+    __table_args__ = (
+        # 사용자당 게시물 하나에 좋아요 하나만 허용하며 (user_email, post_id) 조회에도 사용
+        db.Index('uq_likes_user_post', 'user_email', 'post_id', unique=True),
+        # 게시물 삭제 시 좋아요 일괄 삭제 및 좋아요 수 재계산
+        db.Index('ix_likes_post_id', 'post_id'),
+        # 사용자가 좋아요한 게시물을 좋아요 시간순으로 페이지 조회
+        db.Index('ix_likes_user_created', 'user_email', 'created_at', 'id'),
+    )
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
 
     user_email = db.Column(db.String(100), db.ForeignKey('users.email'))
     post_id = db.Column(db.String(36), db.ForeignKey('posts.id'))
+    created_at = db.Column(db.DateTime, default=datetime.now)
 
     user = db.relationship('User', back_populates='likes')
     post = db.relationship('Post', back_populates='liked_by')
@@ -125,14 +216,20 @@ class Room(db.Model):
         receiver_unread_count (int): 수신자의 읽지 않은 메시지 수
         sender_join (bool): 발신자의 채팅방 참여 상태
         receiver_join (bool): 수신자의 채팅방 참여 상태
-        sender_stay_join (bool): 발신자의 실시간 연결 상태
-        receiver_stay_join (bool): 수신자의 실시간 연결 상태
+        last_message_id (str): 마지막 메시지의 ID
+        last_message_at (DateTime): 마지막 메시지 전송 시간
+        last_message_preview (str): 마지막 메시지 내용 미리보기
         
     Relationships:
         sender: 채팅방 생성자와의 관계
         receiver: 채팅 상대방과의 관계
     """
     __tablename__ = "rooms"
+    __table_args__ = (
+        # 두 사용자 사이의 채팅방 조회 및 사용자별 채팅방 목록 (sender_id OR receiver_id)
+        db.Index('ix_rooms_sender_receiver', 'sender_id', 'receiver_id'),
+        db.Index('ix_rooms_receiver_sender', 'receiver_id', 'sender_id'),
+    )
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     sender_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
     receiver_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
@@ -145,8 +242,10 @@ class Room(db.Model):
     sender_join = db.Column(db.Boolean, nullable=False, default=False)
     receiver_join = db.Column(db.Boolean, nullable=False, default=False)
 
-    sender_stay_join = db.Column(db.Boolean, nullable=False, default=False)
-    receiver_stay_join = db.Column(db.Boolean, nullable=False, default=False)
+    # 채팅방 목록에서 메시지 테이블을 정렬하지 않도록 마지막 메시지 정보를 함께 저장
+    last_message_id = db.Column(db.String(36), nullable=True)
+    last_message_at = db.Column(db.DateTime, nullable=True)
+    last_message_preview = db.Column(db.String(200), nullable=True)
 
     sender = db.relationship("User", foreign_keys=[sender_id], back_populates="room_sender")
     receiver = db.relationship("User", foreign_keys=[receiver_id], back_populates="room_receiver")
@@ -165,6 +264,10 @@ class Message(db.Model):
         time (DateTime): 메시지 전송 시간
     """
     __tablename__ = "messages"
+    __table_args__ = (
+        # 채팅방별 메시지 기록 및 최신 메시지 조회 ((time, id) 커서 페이지네이션)
+        db.Index('ix_messages_room_time_id', 'room_id', 'time', 'id'),
+    )
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     sender_name = db.Column(db.String(100), db.ForeignKey('users.name'), nullable=False)
     receive_user_name = db.Column(db.String(36), nullable=False)
@@ -185,8 +288,65 @@ class Review(db.Model):
         rating (int): 평점
     """
     __tablename__ = "reviews"
+    __table_args__ = (
+        # 프로필 페이지의 리뷰 목록
+        db.Index('ix_reviews_user_name', 'user_name'),
+    )
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     user_name = db.Column(db.String(100), db.ForeignKey('users.name'), nullable=False)
     review_writer = db.Column(db.String(100), db.ForeignKey('users.name'), nullable=False)
     review = db.Column(db.Text, nullable=False)
-    rating = db.Column(db.Integer, nullable=False)
\ No newline at end of file
+    rating = db.Column(db.Integer, nullable=False)
+
+class AssetDeletionJob(db.Model):
+    """
+    Cloudinary 에셋 삭제 작업을 저장하는 작업 큐 모델
+
+    - 게시물/이미지/프로필 이미지를 지울 때 요청 안에서 바로 삭제하지 않고 작업으로 등록
+    - 작업자(flask --app main assets work)가 일괄 삭제하고 실패하면 지연 후 재시도
+
+    Attributes:
+        id (int): 작업의 고유 식별자 (등록 순서)
+        public_id (str): 삭제할 Cloudinary public_id
+        status (str): 작업 상태 (pending, failed)
+        attempts (int): 시도 횟수
+        next_attempt_at (DateTime): 다음 시도 가능 시간 (처리 중인 작업은 임대 만료 시간)
+        last_error (str): 마지막 실패 사유
+        created_at (DateTime): 작업 등록 시간
+    """
+    __tablename__ = "asset_deletion_jobs"
+    __table_args__ = (
+        # 처리할 작업 조회 (status = 'pending' AND next_attempt_at <= now)
+        db.Index('ix_asset_jobs_status_next', 'status', 'next_attempt_at'),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    public_id = db.Column(db.String(250), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='pending')
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.now)
+    last_error = db.Column(db.String(500))
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.now)
+
+
+class AccountDeletionJob(db.Model):
+    """
+    게시물이 많은 계정의 게시물 삭제 작업을 저장하는 작업 큐 모델
+
+    - 계정 삭제 요청에서는 사용자와 채팅방 정보만 정리하고, 게시물은 작업자가 여러 트랜잭션으로 나누어 삭제
+    - 게시물이 모두 삭제되면 작업을 제거
+
+    Attributes:
+        id (int): 작업의 고유 식별자 (등록 순서)
+        user_id (str): 삭제된 사용자 ID
+        attempts (int): 시도 횟수
+        next_attempt_at (DateTime): 다음 시도 가능 시간 (처리 중인 작업은 임대 만료 시간)
+        last_error (str): 마지막 실패 사유
+        created_at (DateTime): 작업 등록 시간
+    """
+    __tablename__ = "account_deletion_jobs"
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.String(36), nullable=False)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.now)
+    last_error = db.Column(db.String(500))
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.now)
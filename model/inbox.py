@@ -0,0 +1,125 @@
+from sqlalchemy import case, func, or_, select, update
+from sqlalchemy.orm import aliased
+
+from model.data import Room, Message, User
+
+# 채팅방에 저장하는 마지막 메시지 미리보기 최대 길이
+PREVIEW_LENGTH = 200
+
+
+def inbox_query(user_id):
+    """
+    사용자의 채팅방 목록(받은 메시지함)을 한 번에 조회하는 쿼리 생성
+
+    - 채팅방마다 상대방 정보, 읽지 않은 메시지 수, 최신 메시지를 개별 조회하던 N+1 쿼리를
+      상대방 사용자 OUTER JOIN을 사용한 단일 SELECT로 대체
+    - 최신 메시지는 채팅방에 저장된 마지막 메시지 스냅샷에서 읽으므로 메시지 테이블을 조회하지 않음
+    - 최신 메시지 시간(없으면 채팅방 생성 시간) 기준 최근 활동순 정렬
+
+    Parameters:
+        user_id (str): 현재 사용자 ID
+
+    Returns:
+        Select: 채팅방별 요약 정보를 조회하는 쿼리 객체
+    """
+    is_sender = Room.sender_id == user_id
+    other_user_id = case((is_sender, Room.receiver_id), else_=Room.sender_id)
+    last_join = case((is_sender, Room.sender_last_join), else_=Room.receiver_last_join)
+
+    # 사용자가 마지막으로 참여한 이후의 메시지만 보이므로 그 이전 메시지는 표시하지 않음
+    latest_visible_text = case(
+        (or_(last_join.is_(None), Room.last_message_at >= last_join), Room.last_message_preview),
+        else_=None
+    )
+
+    last_activity = case(
+        (Room.last_message_at.is_not(None), Room.last_message_at), else_=Room.date
+    ).label('last_activity')
+
+    return (
+        select(
+            Room.id.label('room_id'),
+            case((is_sender, Room.sender_join), else_=Room.receiver_join).label('room_check'),
+            case((is_sender, Room.sender_unread_count),
+                 (Room.receiver_id == user_id, Room.receiver_unread_count),
+                 else_=0).label('unread_count'),
+            User.id.label('other_user_id'),
+            User.email.label('other_user_email'),
+            User.name.label('other_user_name'),
+            User.profile_image_name.label('other_user_profile'),
+            latest_visible_text.label('latest_message'),
+            last_activity,
+        )
+        .outerjoin(User, User.id == other_user_id)
+        .where(or_(Room.sender_id == user_id, Room.receiver_id == user_id))
+        .order_by(last_activity.desc())
+    )
+
+
+def rebuild_last_message_snapshots(connection):
+    """
+    messages 테이블에서 모든 채팅방의 마지막 메시지 스냅샷을 다시 계산
+
+    - 채팅방별 최신 메시지를 상관 서브쿼리로 찾아 한 번의 UPDATE로 갱신
+    - 메시지가 없는 채팅방은 스냅샷을 비움
+
+    Parameters:
+        connection (Connection): 트랜잭션이 열린 데이터베이스 연결
+
+    Returns:
+        int: 갱신된 채팅방 수
+    """
+    latest_message = aliased(Message)
+    latest = (
+        select(latest_message.id)
+        .where(latest_message.room_id == Room.id)
+        .order_by(latest_message.time.desc(), latest_message.id.desc())
+        .limit(1)
+        .correlate(Room)
+        .scalar_subquery()
+    )
+
+    def latest_column(column):
+        return select(column).where(Message.id == latest).correlate(Room).scalar_subquery()
+
+    result = connection.execute(
+        update(Room).values(
+            last_message_id=latest,
+            last_message_at=latest_column(Message.time),
+            last_message_preview=latest_column(func.substr(Message.text, 1, PREVIEW_LENGTH)),
+        )
+    )
+    return result.rowcount
+
+
+def get_inbox(session, user_id):
+    """
+    사용자의 채팅방 목록을 템플릿에서 사용하는 형식으로 반환
+
+    Parameters:
+        session (Session): 데이터베이스 세션
+        user_id (str): 현재 사용자 ID
+
+    Returns:
+        list: 채팅방 정보 딕셔너리 목록 (최근 활동순)
+            - email: 다른 참여자의 이메일
+            - receive_user_id: 다른 참여자의 사용자 ID
+            - room_id: 채팅방 ID
+            - room_check: 채팅방 참여 상태
+            - receiver_name: 다른 참여자의 이름
+            - latest_message: 최신 메시지 내용
+            - message_time: 메시지 시간
+            - other_user_profile: 다른 참여자의 프로필 이미지
+            - unread_count: 읽지 않은 메시지 수
+    """
+    return [{
+        'email': row.other_user_email or 'Unknown',
+        'receive_user_id': row.other_user_id or 'Unknown',
+        'room_id': row.room_id,
+        'room_check': bool(row.room_check),
+        'receiver_name': row.other_user_name or 'Unknown',
+        'latest_message': row.latest_message if row.latest_message is not None else '대화가 없습니다.',
+        'message_time': row.last_activity.strftime('%Y-%m-%d'),
+        'other_user_profile': row.other_user_profile,
+        'unread_count': row.unread_count or 0
+    } for row in session.execute(inbox_query(user_id))]
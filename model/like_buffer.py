@@ -0,0 +1,141 @@
+import atexit
+import threading
+import time
+from collections import defaultdict
+
+from sqlalchemy import bindparam, func, select, update
+
+from model.data import db, Like, Post
+
+
+class LikeCounterBuffer:
+    """
+    게시물 좋아요 수 변경을 모아 두었다가 주기적으로 일괄 반영하는 write-behind 버퍼
+
+    - 인기 게시물에 좋아요가 몰릴 때 요청마다 posts 행을 갱신하던 것을
+      flush_interval마다 한 번의 트랜잭션으로 합쳐서 반영
+    - 반영할 때는 변경분을 더하지 않고 변경된 게시물의 좋아요 수를 likes 테이블 기준으로 다시 계산하여 기록
+      (좋아요 행은 버퍼에 넣기 전에 커밋되므로, `likes reconcile`이 먼저 보정해도 변경분이 두 번 더해지지 않음)
+    - 목록에는 저장된 좋아요 수를 그대로 표시 (반영 주기만큼 늦을 수 있음)
+      반영 대기 중인 변경분은 이미 likes 테이블에 있으므로, 다른 프로세스의 반영이나 보정 후에 더하면 두 번 세게 됨
+    - 가장 오래된 변경분이 max_staleness를 넘으면 다음 주기를 기다리지 않고 즉시 반영
+
+    Attributes:
+        enabled (bool): 버퍼 사용 여부 (LIKE_BUFFER_ENABLED)
+        flush_interval (float): 반영 주기(초) (LIKE_FLUSH_INTERVAL)
+        max_staleness (float): 변경분이 반영되지 않고 남아 있을 수 있는 최대 시간(초) (LIKE_MAX_STALENESS)
+    """
+
+    def __init__(self, app=None):
+        self.enabled = False
+        self.flush_interval = 1.0
+        self.max_staleness = 5.0
+        self.app = None
+
+        self._lock = threading.Lock()
+        self._pending = defaultdict(int)
+        self._oldest = None
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        애플리케이션 설정을 읽고, 버퍼를 사용하면 반영 스레드를 시작
+
+        Parameters:
+            app (Flask): Flask 애플리케이션
+        """
+        self.app = app
+        self.enabled = app.config.get('LIKE_BUFFER_ENABLED', False)
+        self.flush_interval = app.config.get('LIKE_FLUSH_INTERVAL', self.flush_interval)
+        self.max_staleness = app.config.get('LIKE_MAX_STALENESS', self.max_staleness)
+        app.extensions['like_buffer'] = self
+
+        if self.enabled and self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='like-counter-flush', daemon=True)
+            self._thread.start()
+            atexit.register(self.stop)
+
+    def add(self, post_id, delta):
+        """
+        게시물의 좋아요 수 변경분을 버퍼에 추가
+
+        Parameters:
+            post_id (str): 게시물 ID
+            delta (int): 좋아요 수 변경분 (+1 / -1)
+        """
+        if not delta:
+            return
+        with self._lock:
+            self._pending[post_id] += delta
+            now = time.monotonic()
+            if self._oldest is None:
+                self._oldest = now
+            stale = now - self._oldest >= self.max_staleness
+        if stale:
+            self._wake.set()
+
+    def flush(self):
+        """
+        변경된 게시물의 좋아요 수를 likes 테이블 기준으로 다시 계산하여 한 번의 트랜잭션으로 반영
+
+        - 반영에 실패하면 변경분을 버퍼에 되돌려 다음 주기에 다시 시도
+
+        Returns:
+            int: 좋아요 수가 갱신된 게시물 수
+        """
+        with self._lock:
+            batch = {post_id: delta for post_id, delta in self._pending.items() if delta}
+            oldest = self._oldest
+            self._pending.clear()
+            self._oldest = None
+
+        if not batch:
+            return 0
+
+        try:
+            with self.app.app_context(), db.engine.begin() as connection:
+                connection.execute(
+                    update(Post)
+                    .where(Post.id == bindparam('target_id'))
+                    .values(like_cnt=select(func.count(Like.id))
+                            .where(Like.post_id == Post.id)
+                            .scalar_subquery()),
+                    [{'target_id': post_id} for post_id in batch]
+                )
+        except Exception:
+            with self._lock:
+                for post_id, delta in batch.items():
+                    self._pending[post_id] += delta
+                self._oldest = oldest if self._oldest is None else min(oldest, self._oldest)
+            raise
+
+        return len(batch)
+
+    def stop(self):
+        """
+        반영 스레드를 멈추고 남은 변경분을 반영
+        """
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval + 5)
+            self._thread = None
+        self.flush()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                self.app.logger.exception('좋아요 수 반영에 실패했습니다.')
+
+
+# 애플리케이션 전체에서 사용하는 좋아요 수 버퍼
+like_buffer = LikeCounterBuffer()
@@ -0,0 +1,288 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+
+from model.data import Like, Post
+from realtime.presence import pubsub_channel
+
+# 사용자별 좋아요 여부 캐시의 유지 시간(초)과 최대 사용자 수
+LIKED_CACHE_TTL = 30
+LIKED_CACHE_MAX_USERS = 1024
+
+# 여러 워커 사이에 좋아요 여부 캐시 무효화를 주고받는 채널 이름
+LIKED_CACHE_CHANNEL = 'liked-posts'
+
+
+class LikedPostCache:
+    """
+    사용자별로 게시물 좋아요 여부를 짧게 보관하는 캐시
+
+    - 한 번 확인한 (사용자, 게시물) 좋아요 여부를 ttl 동안 재사용
+    - 좋아요를 토글하면 해당 사용자의 캐시를 비움
+    - 캐시는 워커마다 따로 있으므로, 여러 워커로 실행할 때는 메시지 큐(SOCKETIO_MESSAGE_QUEUE)의
+      pub/sub 채널로 무효화를 발행하여 다른 워커의 캐시도 비움
+      (채널이 없거나 발행을 놓친 워커는 ttl이 지날 때까지 이전 값을 보여 줄 수 있음)
+    - 오래 사용하지 않은 사용자부터 제거하여 max_users 이하로 유지
+
+    Attributes:
+        ttl (float): 사용자 캐시 유지 시간(초)
+        max_users (int): 캐시에 보관하는 최대 사용자 수
+        channel: pub/sub 채널 클라이언트 (없으면 현재 워커의 캐시만 비움)
+    """
+
+    def __init__(self, ttl=LIKED_CACHE_TTL, max_users=LIKED_CACHE_MAX_USERS, channel=None):
+        self.ttl = ttl
+        self.max_users = max_users
+        self.channel = channel
+        self.host_id = uuid.uuid4().hex
+        self.logger = None
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._started = False
+        self._start_background_task = None
+
+    def init_app(self, app, socketio):
+        """
+        메시지 큐 설정이 있으면 워커 사이에 캐시 무효화를 주고받는 채널을 연결
+
+        - 채널 구독은 첫 조회나 무효화 시 socketio 백그라운드 작업으로 시작
+
+        Parameters:
+            app (Flask): Flask 애플리케이션
+            socketio (SocketIO): 백그라운드 작업을 실행할 SocketIO 인스턴스
+        """
+        self.channel = pubsub_channel(app.config.get('SOCKETIO_MESSAGE_QUEUE'), LIKED_CACHE_CHANNEL)
+        self.logger = app.logger
+        self._start_background_task = socketio.start_background_task
+        app.extensions['liked_post_cache'] = self
+
+    def lookup(self, user_email, post_ids):
+        """
+        캐시에 있는 좋아요 여부와 확인이 필요한 게시물 ID를 반환
+
+        Returns:
+            tuple: ({post_id: 좋아요 여부}, 캐시에 없는 게시물 ID 집합)
+        """
+        if self.channel is not None:
+            self._ensure_started()
+        with self._lock:
+            entry = self._entries.get(user_email)
+            if entry is None or entry[0] < time.monotonic():
+                self._entries.pop(user_email, None)
+                return {}, set(post_ids)
+            self._entries.move_to_end(user_email)
+            known = entry[1]
+            return ({post_id: known[post_id] for post_id in post_ids if post_id in known},
+                    {post_id for post_id in post_ids if post_id not in known})
+
+    def store(self, user_email, states):
+        """
+        조회한 좋아요 여부를 사용자 캐시에 추가
+
+        Parameters:
+            user_email (str): 사용자 이메일
+            states (dict): {post_id: 좋아요 여부}
+        """
+        with self._lock:
+            entry = self._entries.get(user_email)
+            if entry is None or entry[0] < time.monotonic():
+                entry = (time.monotonic() + self.ttl, {})
+            entry[1].update(states)
+            self._entries[user_email] = entry
+            self._entries.move_to_end(user_email)
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_email):
+        """
+        사용자의 캐시를 비우고, 채널이 있으면 다른 워커에도 무효화를 발행
+
+        Parameters:
+            user_email (str): 사용자 이메일
+        """
+        self.discard(user_email)
+        if self.channel is not None:
+            self._ensure_started()
+            self.channel.publish({'op': 'invalidate', 'host': self.host_id, 'user': user_email})
+
+    def discard(self, user_email):
+        """
+        현재 워커에서 사용자의 캐시를 비움 (다른 워커에서 받은 무효화에도 사용)
+
+        Parameters:
+            user_email (str): 사용자 이메일
+        """
+        with self._lock:
+            self._entries.pop(user_email, None)
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        start = self._start_background_task or (lambda target: threading.Thread(target=target, daemon=True).start())
+        start(self._listen)
+
+    def _listen(self):
+        for event in self.channel.listen():
+            if event.get('host') == self.host_id:
+                continue
+            try:
+                if event['op'] == 'invalidate':
+                    self.discard(event['user'])
+            except (KeyError, TypeError):
+                if self.logger:
+                    self.logger.exception('잘못된 좋아요 캐시 메시지를 무시합니다.')
+
+
+# 애플리케이션 전체에서 사용하는 좋아요 여부 캐시
+liked_post_cache = LikedPostCache()
+
+
+def liked_post_ids(session, user_email, post_ids, cache=liked_post_cache):
+    """
+    주어진 게시물 중 사용자가 좋아요한 게시물 ID 집합을 조회
+
+    - 사용자의 모든 좋아요를 불러오는 대신 현재 페이지의 게시물 ID만 한 번의 쿼리로 확인
+    - 캐시에 없는 게시물만 조회하며, 결과는 집합으로 반환하여 템플릿의 in 검사가 O(1)
+
+    Parameters:
+        session (Session): 데이터베이스 세션
+        user_email (str): 사용자 이메일 (없으면 빈 집합 반환)
+        post_ids (iterable): 확인할 게시물 ID 목록
+        cache (LikedPostCache): 좋아요 여부 캐시 (None이면 캐시 사용 안 함)
+
+    Returns:
+        set: 좋아요한 게시물 ID 집합
+    """
+    post_ids = {post_id for post_id in post_ids if post_id is not None}
+    if not user_email or not post_ids:
+        return set()
+
+    known, missing = cache.lookup(user_email, post_ids) if cache is not None else ({}, post_ids)
+
+    if missing:
+        liked = set(session.scalars(
+            select(Like.post_id).where(Like.user_email == user_email, Like.post_id.in_(missing))
+        ))
+        states = {post_id: post_id in liked for post_id in missing}
+        if cache is not None:
+            cache.store(user_email, states)
+        known.update(states)
+
+    return {post_id for post_id, is_liked in known.items() if is_liked}
+
+
+def _insert_like(session, user_email, post_id):
+    """
+    좋아요 행을 추가하고, (user_email, post_id) 유니크 인덱스와 충돌하면 아무것도 하지 않음
+
+    Returns:
+        bool: 새로 추가되었으면 True
+    """
+    if session.get_bind().dialect.name == 'sqlite':
+        stmt = (
+            sqlite_insert(Like)
+            .values(user_email=user_email, post_id=post_id)
+            .on_conflict_do_nothing(index_elements=['user_email', 'post_id'])
+        )
+        return session.execute(stmt).rowcount == 1
+
+    try:
+        with session.begin_nested():
+            session.execute(insert(Like).values(user_email=user_email, post_id=post_id))
+        return True
+    except IntegrityError:
+        return False
+
+
+def toggle_like(session, user_email, post_id, buffer=None):
+    """
+    좋아요를 추가하거나 취소하고 게시물의 좋아요 수를 원자적으로 갱신
+
+    - 삭제를 먼저 시도하여 삭제된 행이 있으면 취소, 없으면 추가 (insert-or-delete)
+    - 좋아요 수는 SQL에서 like_cnt = like_cnt ± 1 로 갱신하여 동시 요청 간 갱신 손실 방지
+    - 좋아요 행 변경과 좋아요 수 갱신을 한 트랜잭션으로 커밋
+    - 좋아요 수 버퍼를 사용하면 좋아요 수 변경분은 버퍼에 넣고 주기적으로 일괄 반영하며,
+      응답하는 좋아요 수는 likes 테이블에서 직접 계산
+    - 사용자의 좋아요 여부 캐시를 비움
+
+    Parameters:
+        session (Session): 데이터베이스 세션
+        user_email (str): 좋아요를 누른 사용자의 이메일
+        post_id (str): 게시물 ID
+        buffer (LikeCounterBuffer): 좋아요 수 write-behind 버퍼
+
+    Returns:
+        tuple: (좋아요 상태, 갱신된 좋아요 수)
+    """
+    removed = session.execute(
+        delete(Like).where(Like.user_email == user_email, Like.post_id == post_id)
+    ).rowcount > 0
+
+    if removed:
+        liked, delta = False, -1
+    else:
+        liked = True
+        delta = 1 if _insert_like(session, user_email, post_id) else 0
+
+    if buffer is not None and buffer.enabled:
+        session.commit()
+        liked_post_cache.invalidate(user_email)
+        buffer.add(post_id, delta)
+        # 저장된 값에 변경분을 더하지 않고 반영 시와 같은 기준(likes 테이블)으로 계산 (ix_likes_post_id)
+        like_cnt = session.execute(select(func.count(Like.id)).where(Like.post_id == post_id)).scalar_one()
+        return liked, like_cnt
+
+    like_cnt = session.execute(
+        update(Post)
+        .where(Post.id == post_id)
+        .values(like_cnt=Post.like_cnt + delta)
+        .returning(Post.like_cnt)
+        .execution_options(synchronize_session=False)
+    ).scalar_one()
+
+    session.commit()
+    liked_post_cache.invalidate(user_email)
+    return liked, like_cnt
+
+
+def reconcile_like_counts(session):
+    """
+    likes 테이블을 기준으로 모든 게시물의 좋아요 수를 일괄 재계산
+
+    - like_cnt가 실제 좋아요 행 수와 다른 게시물만 한 번의 UPDATE로 보정
+    - 좋아요 수 버퍼는 변경분을 더하지 않고 같은 기준으로 다시 계산한 값을 반영하므로,
+      다른 프로세스의 버퍼에 반영 대기 중인 변경분이 있어도 보정 후 두 번 더해지지 않음
+
+    Parameters:
+        session (Session): 데이터베이스 세션
+
+    Returns:
+        list: 보정된 게시물의 (post_id, 저장된 좋아요 수, 실제 좋아요 수) 목록
+    """
+    actual = (
+        select(func.count(Like.id))
+        .where(Like.post_id == Post.id)
+        .correlate(Post)
+        .scalar_subquery()
+    )
+
+    drift = session.execute(
+        select(Post.id, Post.like_cnt, actual).where(Post.like_cnt != actual)
+    ).all()
+
+    if drift:
+        session.execute(
+            update(Post)
+            .where(Post.like_cnt != actual)
+            .values(like_cnt=actual)
+            .execution_options(synchronize_session=False)
+        )
+    session.commit()
+    return [tuple(row) for row in drift]
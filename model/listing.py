@@ -0,0 +1,96 @@
+from sqlalchemy import select
+from sqlalchemy.orm import contains_eager, joinedload, load_only, selectinload
+
+from model.data import Like, Post, PostImage, User
+
+# 게시물 카드에 표시하는 컬럼 (정렬 키인 date, like_cnt, id 포함)
+CARD_COLUMNS = (Post.id, Post.title, Post.price, Post.date, Post.like_cnt, Post.author_id)
+
+# 작성자와 대표 이미지 관계를 함께 불러오는 방법
+# - joined: 목록 쿼리에 users, post_images를 LEFT OUTER JOIN하여 한 번에 조회
+# - selectin: 목록 조회 후 관계별로 id IN (...) 한 번씩 조회
+LOADER_STRATEGIES = {
+    'joined': joinedload,
+    'selectin': selectinload,
+}
+DEFAULT_STRATEGY = 'joined'
+
+
+def card_loader_options(strategy=DEFAULT_STRATEGY, projection=True):
+    """
+    게시물 카드 목록에 필요한 로딩 옵션 생성
+
+    - 카드마다 작성자를 지연 로딩하던 N+1 쿼리를 즉시 로딩으로 대체
+    - 게시물 이미지 중 대표 이미지 하나의 URL과 썸네일 URL만 함께 불러옴
+    - projection이면 게시물 본문 등 카드에 쓰지 않는 컬럼은 불러오지 않음
+
+    Parameters:
+        strategy (str): 작성자 로딩 방법 ('joined', 'selectin')
+        projection (bool): 카드에 필요한 컬럼만 불러올지 여부
+
+    Returns:
+        list: 쿼리에 적용할 로더 옵션 목록
+    """
+    if strategy not in LOADER_STRATEGIES:
+        raise ValueError(f"알 수 없는 로딩 방법입니다: {strategy}")
+
+    loader = LOADER_STRATEGIES[strategy]
+    author, cover = loader(Post.author), loader(Post.cover_image)
+    if not projection:
+        return [author, cover]
+    return [load_only(*CARD_COLUMNS), author.load_only(User.id, User.name), cover.load_only(PostImage.url, PostImage.thumbnail_url)]
+
+
+def for_cards(query, strategy=DEFAULT_STRATEGY, projection=True):
+    """
+    게시물 조회 쿼리에 카드 목록용 로딩 옵션 적용
+
+    Parameters:
+        query (Select): 게시물 조회 쿼리
+        strategy (str): 작성자 로딩 방법 ('joined', 'selectin')
+        projection (bool): 카드에 필요한 컬럼만 불러올지 여부
+
+    Returns:
+        Select: 로딩 옵션이 적용된 쿼리 객체
+    """
+    return query.options(*card_loader_options(strategy, projection))
+
+
+def author_posts_query(author_id, **loading):
+    """
+    작성자의 게시물을 최신순으로 조회하는 카드 목록 쿼리
+
+    Parameters:
+        author_id (str): 작성자 ID
+        **loading: for_cards()의 strategy, projection
+
+    Returns:
+        Select: 최신순 (date, id) 정렬된 쿼리 객체
+    """
+    query = select(Post).where(Post.author_id == author_id).order_by(Post.date.desc(), Post.id.desc())
+    return for_cards(query, **loading)
+
+
+def liked_posts_query(user_email, **loading):
+    """
+    사용자가 좋아요한 게시물을 좋아요 시간 역순으로 조회하는 카드 목록 쿼리
+
+    - 좋아요마다 게시물을 따로 조회하던 N+1 쿼리를 likes ⨝ posts 단일 조회로 대체
+    - 내부 조인이므로 삭제된 게시물의 좋아요는 결과에 포함되지 않음
+    - 결과 항목은 Like이며 게시물은 Like.post로 함께 로드됨
+    - 정렬 키 (Like.created_at, Like.id)로 커서 페이지네이션 가능
+
+    Parameters:
+        user_email (str): 사용자 이메일
+        **loading: for_cards()의 strategy, projection
+
+    Returns:
+        Select: 좋아요 시간 역순 정렬된 쿼리 객체
+    """
+    return (
+        select(Like)
+        .join(Like.post)
+        .where(Like.user_email == user_email)
+        .order_by(Like.created_at.desc(), Like.id.desc())
+        .options(contains_eager(Like.post).options(*card_loader_options(**loading)))
+    )
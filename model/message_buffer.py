@@ -0,0 +1,480 @@
+import atexit
+import glob
+import json
+import os
+import threading
+import uuid
+from collections import defaultdict
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+from concurrent.futures import Future
+from datetime import datetime
+
+from sqlalchemy import bindparam, func, or_, select, update
+from sqlalchemy.exc import DataError, IntegrityError, ProgrammingError
+
+from model.data import db, Room, Message
+from model.inbox import PREVIEW_LENGTH
+
+# 보낸 사람에게 응답(ack)하는 시점
+# - flush: 메시지가 포함된 트랜잭션이 커밋된 뒤 응답
+# - immediate: 버퍼(저널)에 추가하자마자 응답하고 저장은 뒤따름
+DURABILITY_MODES = ('flush', 'immediate')
+
+# messages 테이블에 저장하는 메시지 항목의 키
+MESSAGE_COLUMNS = ('id', 'room_id', 'sender_name', 'receive_user_name', 'text', 'time')
+
+# 메시지 항목 자체가 잘못되어 다시 시도해도 저장할 수 없는 오류 (해당 메시지만 버리고 나머지는 저장)
+REJECTED_ERRORS = (IntegrityError, DataError, ProgrammingError, TypeError, ValueError, KeyError)
+
+
+def message_entry(room_id, sender_name, receive_user_name, text, to_receiver, unread=True, time=None):
+    """
+    버퍼에 추가할 메시지 항목 생성 (ID와 시간은 받은 시점에 정해 채팅방 전송과 저장에 같은 값 사용)
+
+    Parameters:
+        room_id (str): 채팅방 ID
+        sender_name (str): 보낸 사람 이름
+        receive_user_name (str): 받는 사람 이름
+        text (str): 메시지 내용
+        to_receiver (bool): 채팅방을 만든 사용자(sender)가 상대방(receiver)에게 보낸 메시지인지 여부
+        unread (bool): 받는 사람의 읽지 않은 메시지 수를 늘릴지 여부 (받는 사람이 채팅방에 접속해 있으면 False)
+        time (datetime): 메시지 시간 (기본값: 현재 시간)
+
+    Returns:
+        dict: 메시지 항목
+    """
+    return {
+        'id': str(uuid.uuid4()),
+        'room_id': room_id,
+        'sender_name': sender_name,
+        'receive_user_name': receive_user_name,
+        'text': text,
+        'time': time or datetime.now(),
+        'to_receiver': to_receiver,
+        'unread': unread,
+    }
+
+
+def write_messages(connection, entries, skip_existing=False):
+    """
+    메시지 항목을 저장하고 채팅방별 읽지 않은 메시지 수와 마지막 메시지 스냅샷을 갱신
+
+    - 메시지는 한 번의 INSERT(executemany)로 저장
+    - 읽지 않은 메시지 수는 채팅방별 변경분을 합산하여 채팅방마다 한 번만 UPDATE
+      (받는 사람이 채팅방에 접속해 있던 메시지(unread=False)는 세지 않음)
+    - 마지막 메시지 스냅샷은 채팅방별로 가장 최근 메시지로 갱신
+
+    Parameters:
+        connection (Connection): 트랜잭션이 열린 데이터베이스 연결
+        entries (list): message_entry()로 만든 메시지 항목
+        skip_existing (bool): 이미 저장된 메시지 ID는 건너뜀 (저널 재반영 시 사용)
+
+    Returns:
+        int: 저장된 메시지 수
+    """
+    if skip_existing and entries:
+        existing = set(connection.scalars(
+            select(Message.id).where(Message.id.in_([entry['id'] for entry in entries]))
+        ))
+        entries = [entry for entry in entries if entry['id'] not in existing]
+    if not entries:
+        return 0
+
+    connection.execute(Message.__table__.insert(),
+                       [{key: entry[key] for key in MESSAGE_COLUMNS} for entry in entries])
+
+    unread = defaultdict(lambda: [0, 0])
+    latest = {}
+    for entry in entries:
+        if entry.get('unread', True):
+            unread[entry['room_id']][0 if entry['to_receiver'] else 1] += 1
+        if entry['room_id'] not in latest or entry['time'] >= latest[entry['room_id']]['time']:
+            latest[entry['room_id']] = entry
+
+    if unread:
+        connection.execute(
+            update(Room)
+            .where(Room.id == bindparam('target_id'))
+            .values(
+                receiver_unread_count=func.coalesce(Room.receiver_unread_count, 0) + bindparam('to_receiver'),
+                sender_unread_count=func.coalesce(Room.sender_unread_count, 0) + bindparam('to_sender'),
+            ),
+            [{'target_id': room_id, 'to_receiver': counts[0], 'to_sender': counts[1]}
+             for room_id, counts in unread.items()]
+        )
+    connection.execute(
+        update(Room)
+        .where(Room.id == bindparam('target_id'),
+               or_(Room.last_message_at.is_(None), Room.last_message_at <= bindparam('at')))
+        .values(last_message_id=bindparam('message_id'), last_message_at=bindparam('at'),
+                last_message_preview=bindparam('preview')),
+        [{'target_id': room_id, 'message_id': entry['id'], 'at': entry['time'],
+          'preview': entry['text'][:PREVIEW_LENGTH]} for room_id, entry in latest.items()]
+    )
+    return len(entries)
+
+
+class MessageWriteBuffer:
+    """
+    채팅 메시지 저장을 모아서 짧은 주기로 일괄 반영하는 write-behind 버퍼
+
+    - 소켓 핸들러는 메시지를 채팅방에 바로 전송하고 저장은 버퍼에 추가
+    - flush_interval마다 쌓인 메시지, 읽지 않은 메시지 수 변경분, 마지막 메시지 스냅샷을
+      한 트랜잭션으로 반영하여 메시지마다 쓰기 잠금을 잡던 것을 묶음 단위로 줄임 (group commit)
+    - 버퍼에 max_batch개 이상 쌓이면 주기를 기다리지 않고 반영
+    - journal_path를 지정하면 메시지를 버퍼에 넣기 전에 파일에 먼저 기록(write-ahead)하고,
+      반영 전에 프로세스가 종료되어도 다음 시작 시 저널의 메시지를 다시 반영
+        - 여러 워커가 같은 설정으로 실행되므로 저널은 프로세스마다 <journal_path>.<프로세스 ID> 파일에 기록
+        - 프로세스는 실행 중 자신의 잠금 파일(.lock)을 잠가 두고, 시작할 때는 잠금이 풀린(주인이 종료된)
+          저널만 가져와 다시 반영 (fcntl이 없는 환경에서는 한 프로세스로 실행한다고 보고 남은 저널을 모두 가져옴)
+    - 버퍼를 사용하지 않으면 메시지마다 같은 방식의 트랜잭션 하나로 바로 저장
+
+    Attributes:
+        enabled (bool): 버퍼 사용 여부 (CHAT_BUFFER_ENABLED)
+        flush_interval (float): 반영 주기(초) (CHAT_FLUSH_INTERVAL)
+        max_batch (int): 주기를 기다리지 않고 반영하는 메시지 수 (CHAT_FLUSH_MAX_BATCH)
+        durability (str): 응답 시점 ('flush', 'immediate') (CHAT_DURABILITY)
+        ack_timeout (float): durability가 flush일 때 반영을 기다리는 최대 시간(초) (CHAT_ACK_TIMEOUT)
+        journal_path (str): 저널 파일 경로의 기준 이름 (CHAT_BUFFER_JOURNAL, 없으면 메모리에만 보관)
+    """
+
+    def __init__(self, app=None):
+        self.enabled = False
+        self.flush_interval = 0.005
+        self.max_batch = 500
+        self.durability = 'flush'
+        self.ack_timeout = 5.0
+        self.journal_path = None
+        self.app = None
+
+        self._lock = threading.Lock()
+        # 한 번에 하나의 묶음만 반영 (flush()는 진행 중인 반영이 끝날 때까지 기다림)
+        self._flush_lock = threading.Lock()
+        self._pending = []
+        self._journal = None
+        # 현재 프로세스의 저널 이름(<journal_path>.<owner>)에 쓰는 ID와 실행 중 잠가 두는 잠금 파일
+        self._owner = None
+        self._owner_lock = None
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        애플리케이션 설정을 읽고, 버퍼를 사용하면 저널을 열고 반영 스레드를 시작
+
+        Parameters:
+            app (Flask): Flask 애플리케이션
+        """
+        self.app = app
+        self.enabled = app.config.get('CHAT_BUFFER_ENABLED', False)
+        self.flush_interval = app.config.get('CHAT_FLUSH_INTERVAL', self.flush_interval)
+        self.max_batch = app.config.get('CHAT_FLUSH_MAX_BATCH', self.max_batch)
+        self.durability = app.config.get('CHAT_DURABILITY', self.durability)
+        self.ack_timeout = app.config.get('CHAT_ACK_TIMEOUT', self.ack_timeout)
+        self.journal_path = app.config.get('CHAT_BUFFER_JOURNAL') or None
+        if self.durability not in DURABILITY_MODES:
+            raise ValueError(f"알 수 없는 메시지 저장 응답 방식입니다: {self.durability}")
+        app.extensions['message_buffer'] = self
+
+        if self.enabled and self._thread is None:
+            if self.journal_path:
+                self._open_journal()
+            self._thread = threading.Thread(target=self._run, name='chat-message-flush', daemon=True)
+            self._thread.start()
+            atexit.register(self.stop)
+
+    def save(self, entry):
+        """
+        메시지 항목 저장
+
+        - 버퍼를 사용하지 않으면 현재 세션의 트랜잭션 하나로 바로 저장
+        - durability가 flush이면 메시지가 반영될 때까지 대기, immediate이면 버퍼에 추가하고 바로 반환
+
+        Parameters:
+            entry (dict): message_entry()로 만든 메시지 항목
+
+        Raises:
+            Exception: 저장에 실패했거나 ack_timeout 안에 반영되지 않은 경우
+        """
+        if not self.enabled:
+            try:
+                write_messages(db.session.connection(), [entry])
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
+            return
+
+        future = self.add(entry)
+        if self.durability == 'flush':
+            future.result(timeout=self.ack_timeout)
+
+    def add(self, entry):
+        """
+        메시지 항목을 버퍼(와 저널)에 추가
+
+        Parameters:
+            entry (dict): message_entry()로 만든 메시지 항목
+
+        Returns:
+            Future: 메시지가 반영되면 완료되는 Future
+        """
+        future = Future()
+        with self._lock:
+            if self._journal is not None:
+                self._journal.write(self._dumps(entry) + '\n')
+                self._journal.flush()
+            self._pending.append((entry, future))
+            full = len(self._pending) >= self.max_batch
+        if full:
+            self._wake.set()
+        return future
+
+    def flush(self):
+        """
+        버퍼의 메시지를 한 번의 트랜잭션으로 반영
+
+        - 다른 스레드가 반영 중이면 그 묶음이 커밋될 때까지 기다린 뒤 남은 메시지를 반영
+          (반환 시점에는 호출 전에 추가된 메시지가 모두 반영되어 있음)
+        - 반영하는 동안 들어온 메시지는 새 저널에 기록되고, 반영이 끝나면 이전 저널을 삭제
+        - 묶음 반영에 실패하면 메시지를 하나씩 다시 반영하여 저장할 수 없는 메시지만 버림 (보낸 사람에게 실패 전달)
+        - 일시적인 오류로 반영하지 못한 메시지는 durability가 immediate일 때는 버퍼와 저널에 되돌려
+          다음 주기에 다시 시도하고, flush일 때는 기다리는 핸들러에 실패를 전달
+
+        Returns:
+            int: 반영된 메시지 수
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+                flushing = self._rotate_journal() if batch else None
+
+            if not batch:
+                return 0
+
+            try:
+                with self.app.app_context(), db.engine.begin() as connection:
+                    write_messages(connection, [entry for entry, _ in batch])
+            except Exception:
+                # 잘못된 메시지 하나가 묶음 전체를 막지 않도록 하나씩 다시 반영
+                saved, failed = self._write_each(batch)
+            else:
+                saved, failed = batch, []
+
+            if failed:
+                error = failed[0][2]
+                failed = [(entry, future) for entry, future, _ in failed]
+                if self.durability == 'flush':
+                    # 기다리던 핸들러가 보낸 사람에게 실패를 알리므로 다시 반영하지 않음
+                    for _, future in failed:
+                        future.set_exception(error)
+                else:
+                    # 이미 응답한 메시지이므로 버퍼와 저널에 되돌려 다음 주기에 다시 반영
+                    with self._lock:
+                        self._pending[:0] = failed
+                        if self._journal is not None:
+                            self._journal.write(''.join(self._dumps(entry) + '\n' for entry, _ in failed))
+                            self._journal.flush()
+
+            if flushing:
+                os.remove(flushing)
+            for _, future in saved:
+                future.set_result(True)
+            if failed:
+                raise error
+            return len(saved)
+
+    def recover(self):
+        """
+        이전 실행에서 반영하지 못한 저널의 메시지를 다시 반영 (이미 저장된 메시지는 건너뜀)
+
+        - 저장할 수 없는 메시지는 버리고 나머지를 반영하며, 일시적인 오류로 실패하면 저널을 남겨 다음 시작 시 다시 시도
+
+        Returns:
+            int: 다시 반영된 메시지 수
+        """
+        path = self._recovery_path()
+        if not os.path.exists(path):
+            return 0
+        with open(path, encoding='utf-8') as journal:
+            entries = [self._loads(line) for line in journal if line.strip()]
+
+        try:
+            with self.app.app_context(), db.engine.begin() as connection:
+                count = write_messages(connection, entries, skip_existing=True)
+        except Exception:
+            saved, failed = self._write_each([(entry, None) for entry in entries], skip_existing=True)
+            if failed:
+                raise failed[0][2]
+            count = len(saved)
+        os.remove(path)
+        return count
+
+    def _write_each(self, batch, skip_existing=False):
+        """
+        메시지를 하나씩 별도 트랜잭션으로 반영
+
+        - 메시지 자체가 잘못되어 저장할 수 없으면(REJECTED_ERRORS) 버리고 보낸 사람에게 실패를 전달
+        - 그 밖의 오류(데이터베이스 잠금 등 일시적인 오류)가 나면 그 메시지와 남은 메시지를 실패 목록으로 반환하여
+          호출한 쪽에서 처리
+
+        Parameters:
+            batch (list): (메시지 항목, Future) 목록 (Future는 None일 수 있음)
+            skip_existing (bool): 이미 저장된 메시지 ID는 건너뜀
+
+        Returns:
+            tuple: (반영된 (항목, Future) 목록, 일시적인 오류로 실패한 (항목, Future, 예외) 목록)
+        """
+        saved, failed = [], []
+        for entry, future in batch:
+            if failed:
+                # 일시적인 오류가 나면 나머지도 실패할 가능성이 높으므로 더 시도하지 않고 다음 주기로 넘김
+                failed.append((entry, future, failed[0][2]))
+                continue
+            try:
+                with self.app.app_context(), db.engine.begin() as connection:
+                    write_messages(connection, [entry], skip_existing)
+            except REJECTED_ERRORS as e:
+                self._reject(entry, e)
+                if future is not None:
+                    future.set_exception(e)
+            except Exception as e:
+                failed.append((entry, future, e))
+            else:
+                saved.append((entry, future))
+        return saved, failed
+
+    def _reject(self, entry, error):
+        # 저장할 수 없는 메시지를 로그와 (저널을 사용하면) .rejected 파일에 남기고 버림
+        self.app.logger.error('저장할 수 없는 채팅 메시지를 버립니다: %s (%s)', entry.get('id'), error)
+        if self.journal_path:
+            # 여러 프로세스가 한 줄씩 덧붙이므로 프로세스별로 나누지 않음
+            with open(f"{self.journal_path}.rejected", 'a', encoding='utf-8') as rejected:
+                rejected.write(json.dumps(entry, ensure_ascii=False, default=str) + '\n')
+
+    def stop(self):
+        """
+        반영 스레드를 멈추고 남은 메시지를 반영
+        """
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval + 5)
+            self._thread = None
+        try:
+            self.flush()
+        finally:
+            self._close_journal()
+
+    def _run(self):
+        if self.journal_path:
+            try:
+                count = self.recover()
+                if count:
+                    self.app.logger.warning(f'저널에서 채팅 메시지 {count}개를 다시 반영했습니다.')
+            except Exception:
+                self.app.logger.exception('채팅 메시지 저널을 다시 반영하지 못했습니다.')
+
+        while not self._stopped.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                self.app.logger.exception('채팅 메시지 저장에 실패했습니다.')
+
+    def _open_journal(self):
+        # 현재 프로세스의 저널과 잠금 파일을 만들고, 주인이 종료된 저널은 반영 스레드에서 다시 반영하도록 한 파일로 모음
+        os.makedirs(os.path.dirname(os.path.abspath(self.journal_path)), exist_ok=True)
+        self._owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+        # 다른 프로세스가 잠기기 전의 잠금 파일을 주인 없는 저널로 보지 않도록 잠근 뒤 이름을 바꿈
+        lock_path = self._owned_path('.lock')
+        self._owner_lock = open(f"{lock_path}.tmp", 'w')
+        if fcntl is not None:
+            fcntl.flock(self._owner_lock, fcntl.LOCK_EX)
+        os.replace(f"{lock_path}.tmp", lock_path)
+
+        with open(self._recovery_path(), 'a', encoding='utf-8') as recovery:
+            for prefix, lock in self._orphaned_journals():
+                for path in [*sorted(glob.glob(glob.escape(prefix) + '.flushing*')), prefix, f"{prefix}.recover"]:
+                    if os.path.exists(path):
+                        with open(path, encoding='utf-8') as previous:
+                            recovery.write(previous.read())
+                        os.remove(path)
+                if os.path.exists(f"{prefix}.lock"):
+                    os.remove(f"{prefix}.lock")
+                if lock is not None:
+                    lock.close()
+        self._journal = open(self._owned_path(), 'w', encoding='utf-8')
+
+    def _orphaned_journals(self):
+        # 주인 프로세스가 종료된 저널의 이름(<journal_path>.<owner>)과 잠금을 얻은 잠금 파일 목록
+        orphaned = []
+        for lock_path in glob.glob(glob.escape(self.journal_path) + '.*.lock'):
+            prefix = lock_path[:-len('.lock')]
+            if prefix == self._owned_path():
+                continue
+            lock = None
+            if fcntl is not None:
+                lock = open(lock_path, 'a')
+                try:
+                    fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    # 실행 중인 다른 워커의 저널
+                    lock.close()
+                    continue
+            # 가져오는 동안 다른 프로세스가 같은 저널을 가져가지 않도록 잠금을 유지 (파일을 닫으면 풀림)
+            orphaned.append((prefix, lock))
+        return orphaned
+
+    def _close_journal(self):
+        # 남은 메시지가 없으면 현재 프로세스의 저널과 잠금 파일을 삭제 (남아 있으면 다음에 시작하는 프로세스가 가져감)
+        with self._lock:
+            if self._journal is None:
+                return
+            self._journal.close()
+            self._journal = None
+            if not self._pending and not os.path.exists(self._recovery_path()):
+                os.remove(self._owned_path())
+                os.remove(self._owned_path('.lock'))
+        self._owner_lock.close()
+        self._owner_lock = None
+
+    def _rotate_journal(self):
+        # 반영할 메시지가 담긴 저널을 묶음마다 다른 이름으로 옮기고 새 저널을 열기 (잠금을 잡은 상태에서 호출)
+        if self._journal is None:
+            return None
+        self._journal.close()
+        flushing = self._owned_path(f".flushing-{uuid.uuid4().hex}")
+        os.replace(self._owned_path(), flushing)
+        self._journal = open(self._owned_path(), 'w', encoding='utf-8')
+        return flushing
+
+    def _owned_path(self, suffix=''):
+        return f"{self.journal_path}.{self._owner}{suffix}"
+
+    def _recovery_path(self):
+        return self._owned_path('.recover')
+
+    @staticmethod
+    def _dumps(entry):
+        return json.dumps({**entry, 'time': entry['time'].isoformat()}, ensure_ascii=False)
+
+    @staticmethod
+    def _loads(line):
+        entry = json.loads(line)
+        entry['time'] = datetime.fromisoformat(entry['time'])
+        return entry
+
+
+# 애플리케이션 전체에서 사용하는 채팅 메시지 버퍼
+message_buffer = MessageWriteBuffer()
@@ -0,0 +1,170 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from sqlalchemy import tuple_
+
+# 커서 토큰의 이동 방향
+NEXT = 'n'
+PREV = 'p'
+
+
+class KeysetPagination:
+    """
+    커서(keyset) 기반 페이지네이션 결과
+
+    - COUNT(*)와 OFFSET 없이 마지막으로 본 행의 정렬 키 다음부터 조회하므로
+      페이지 깊이와 관계없이 조회 비용이 일정
+
+    Attributes:
+        items (list): 현재 페이지의 항목
+        per_page (int): 페이지 크기
+        next_cursor (str): 다음 페이지 토큰 (없으면 None)
+        prev_cursor (str): 이전 페이지 토큰 (없으면 None)
+    """
+
+    def __init__(self, items, per_page, next_cursor, prev_cursor):
+        self.items = items
+        self.per_page = per_page
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self):
+        return self.prev_cursor is not None
+
+
+def wants_keyset(args):
+    """
+    요청이 커서 기반 페이지네이션을 사용하는지 확인
+
+    Parameters:
+        args (MultiDict): request.args
+
+    Returns:
+        bool: ?paging=cursor 이거나 cursor 토큰이 있으면 True
+    """
+    return args.get('paging') == 'cursor' or bool(args.get('cursor'))
+
+
+def encode_cursor(values, direction):
+    """
+    정렬 키 값을 URL에 그대로 쓸 수 있는 불투명 토큰으로 변환
+
+    Parameters:
+        values (list): 정렬 키 값 목록
+        direction (str): 이동 방향 (NEXT, PREV)
+
+    Returns:
+        str: base64url 인코딩된 토큰
+    """
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps({'k': payload, 'd': direction}, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token, columns):
+    """
+    토큰을 정렬 키 값과 이동 방향으로 복원
+
+    - 토큰이 손상되었거나 정렬 키 개수 또는 값의 타입이 컬럼과 맞지 않으면 None을 반환하여 첫 페이지부터 조회
+      (예: like_cnt 자리에 정수가 아닌 값, id 자리에 문자열이 아닌 값)
+
+    Parameters:
+        token (str): encode_cursor()로 만든 토큰
+        columns (list): 정렬 키 컬럼 목록 (값의 타입 변환에 사용)
+
+    Returns:
+        tuple | None: (정렬 키 값 목록, 이동 방향)
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        payload = json.loads(raw)
+        values, direction = payload['k'], payload['d']
+        if not isinstance(values, list) or len(values) != len(columns) or direction not in (NEXT, PREV):
+            return None
+        return [cursor_value(column, value) for column, value in zip(columns, values)], direction
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        return None
+
+
+def cursor_value(column, value):
+    """
+    토큰의 정렬 키 값을 컬럼 타입에 맞는 값으로 변환
+
+    Parameters:
+        column (Column): 정렬 키 컬럼
+        value: 토큰에서 읽은 값
+
+    Returns:
+        컬럼 타입의 값 (datetime 컬럼은 ISO 형식 문자열을 변환)
+
+    Raises:
+        TypeError: 값의 타입이 컬럼 타입과 맞지 않는 경우
+    """
+    python_type = column.type.python_type
+    if python_type is datetime:
+        if not isinstance(value, str):
+            raise TypeError(f"{column.key} 커서 값은 날짜 문자열이어야 합니다.")
+        return datetime.fromisoformat(value)
+    # JSON의 true/false는 int의 하위 타입이므로 정수 컬럼에서 제외
+    if not isinstance(value, python_type) or (isinstance(value, bool) and python_type is not bool):
+        raise TypeError(f"{column.key} 커서 값은 {python_type.__name__} 타입이어야 합니다.")
+    return value
+
+
+def keyset_paginate(session, query, columns, cursor=None, per_page=20, descending=True):
+    """
+    정렬 키 컬럼을 기준으로 커서 기반 페이지네이션 수행
+
+    - 정렬 키의 마지막 컬럼은 고유해야 함 (예: (date, id), (like_cnt, date, id))
+    - 모든 정렬 키는 같은 방향으로 정렬되며, 행 값 비교 (a, b) < (?, ?)로 인덱스 범위 탐색
+    - per_page + 1개를 조회하여 다음 페이지 존재 여부를 COUNT 없이 판단
+
+    Parameters:
+        session (Session): 데이터베이스 세션
+        query (Select): 조건이 적용된 조회 쿼리 (기존 ORDER BY는 무시)
+        columns (list): 정렬 키 컬럼 목록
+        cursor (str): 이전 응답의 next_cursor / prev_cursor 토큰
+        per_page (int): 페이지 크기
+        descending (bool): 내림차순 정렬 여부
+
+    Returns:
+        KeysetPagination: 페이지 항목과 이전/다음 토큰
+    """
+    decoded = decode_cursor(cursor, columns) if cursor else None
+    values, direction = decoded if decoded else (None, NEXT)
+
+    # 이전 페이지는 반대 방향으로 조회한 뒤 순서를 되돌림
+    backwards = direction == PREV
+    reverse_order = descending != backwards
+
+    query = query.order_by(None).order_by(
+        *[column.desc() if reverse_order else column.asc() for column in columns]
+    )
+    if values is not None:
+        key, bound = tuple_(*columns), tuple_(*values)
+        query = query.where(key < bound if reverse_order else key > bound)
+
+    rows = session.scalars(query.limit(per_page + 1)).all()
+    has_more = len(rows) > per_page
+    items = rows[:per_page]
+    if backwards:
+        items.reverse()
+
+    def keys_of(item):
+        return [getattr(item, column.key) for column in columns]
+
+    next_cursor = prev_cursor = None
+    if items:
+        if has_more or backwards:
+            next_cursor = encode_cursor(keys_of(items[-1]), NEXT)
+        if values is not None and (has_more or not backwards):
+            prev_cursor = encode_cursor(keys_of(items[0]), PREV)
+
+    return KeysetPagination(items, per_page, next_cursor, prev_cursor)
@@ -0,0 +1,202 @@
+from sqlalchemy import select
+
+from model.data import Post
+from model.search import apply_search
+
+# 정렬 기준별 내림차순 정렬 키 (마지막 id는 동일 값 사이의 순서를 고정하기 위한 보조 키)
+SORT_COLUMNS = {
+    'recent': (Post.date, Post.id),
+    'hottest': (Post.like_cnt, Post.date, Post.id),
+}
+
+# 검색어가 있을 때 사용할 수 있는 관련도순 정렬
+RELEVANCE = 'relevance'
+
+# 가격대의 폭(최대 가격 - 최소 가격, 원)이 이 값 이하일 때만 가격 인덱스로 범위를 읽고 정렬 (PRICE_INDEX_MAX_WIDTH)
+# (넓은 가격대는 정렬 인덱스를 순서대로 읽으며 가격을 확인하는 편이 페이지 크기만큼 찾는 즉시 멈추므로 빠름)
+PRICE_INDEX_MAX_WIDTH = 10000
+
+
+class PostListingQuery:
+    """
+    게시물 목록 조회 조건(검색, 카테고리, 가격대, 정렬)을 하나의 쿼리로 조합하는 빌더
+
+    - 검색어가 있어도 카테고리/가격/정렬 조건이 유지되도록 모든 조건을 같은 SELECT에 결합
+    - explain()으로 실제 실행 계획을 확인하여 조건 조합별 인덱스 사용 여부를 점검
+
+    Attributes:
+        search (str): 검색어
+        category (str): 카테고리
+        start_price (int): 최소 가격
+        end_price (int): 최대 가격
+        sort_by (str): 정렬 기준 (recent, hottest, relevance)
+        price_index_max_width (int): 가격 인덱스를 사용하는 최대 가격대 폭
+    """
+
+    def __init__(self, search=None, category=None, start_price=None, end_price=None, sort_by=None,
+                 price_index_max_width=PRICE_INDEX_MAX_WIDTH):
+        self.search = search.strip() if search and search.strip() else None
+        self.category = category or None
+        self.start_price = start_price
+        self.end_price = end_price
+        self.price_index_max_width = price_index_max_width
+
+        if sort_by not in SORT_COLUMNS and not (sort_by == RELEVANCE and self.search):
+            sort_by = RELEVANCE if self.search else 'recent'
+        self.sort_by = sort_by
+
+    @classmethod
+    def from_args(cls, args, price_index_max_width=PRICE_INDEX_MAX_WIDTH):
+        """
+        요청 쿼리 문자열에서 조회 조건을 읽어 빌더를 생성
+
+        Parameters:
+            args (MultiDict): request.args
+            price_index_max_width (int): 가격 인덱스를 사용하는 최대 가격대 폭 (PRICE_INDEX_MAX_WIDTH 설정)
+
+        Returns:
+            PostListingQuery: 조회 조건이 설정된 빌더
+        """
+        return cls(
+            search=args.get('search'),
+            category=args.get('category'),
+            start_price=args.get('start_price', type=int),
+            end_price=args.get('end_price', type=int),
+            sort_by=args.get('sort_by'),
+            price_index_max_width=price_index_max_width,
+        )
+
+    def filter_args(self):
+        """
+        페이지 이동 링크 등에 그대로 전달할 조회 조건
+
+        Returns:
+            dict: 값이 있는 조회 조건만 담은 딕셔너리
+        """
+        args = {
+            'search': self.search,
+            'category': self.category,
+            'start_price': self.start_price,
+            'end_price': self.end_price,
+            'sort_by': self.sort_by,
+        }
+        return {key: value for key, value in args.items() if value is not None}
+
+    def build(self, bind):
+        """
+        조회 조건을 모두 결합한 SELECT 쿼리를 생성
+
+        Parameters:
+            bind (Engine | Connection): 쿼리를 실행할 데이터베이스 엔진 또는 연결 (검색 인덱스 사용 여부 판단)
+
+        Returns:
+            Select: 게시물 조회 쿼리 객체
+        """
+        query = select(Post)
+
+        if self.category:
+            query = query.where(Post.category == self.category)
+
+        # 넓은 가격대는 가격 컬럼을 식(price + 0)으로 감싸 가격 인덱스 대신 정렬 인덱스를 사용하도록 함
+        # (SQLite 실행 계획은 LIMIT을 고려하지 않아 넓은 범위도 가격 인덱스로 전부 읽은 뒤 정렬함)
+        price = Post.price if self.price_range_selective() else Post.price + 0
+        if self.start_price is not None:
+            query = query.where(price >= self.start_price)
+        if self.end_price is not None:
+            query = query.where(price <= self.end_price)
+
+        if self.search:
+            query = apply_search(query, Post, self.search, bind.engine, rank=self.sort_by == RELEVANCE)
+
+        return query.order_by(*[column.desc() for column in self.sort_keys() or SORT_COLUMNS['recent']])
+
+    def price_range_selective(self):
+        """
+        가격대 조건을 가격 인덱스로 읽는 것이 나은지 여부
+
+        - 데이터베이스를 조회하지 않고 가격대의 폭을 price_index_max_width와 비교하여 판단
+          (최소 가격이 없으면 0부터, 최대 가격이 없으면 폭이 제한 없는 것으로 봄)
+        - 검색어가 있으면 검색 인덱스에서 시작하므로 확인하지 않음
+
+        Returns:
+            bool: 가격대가 지정되었고 폭이 price_index_max_width 이하이면 True
+        """
+        if self.search or self.end_price is None:
+            return False
+        return self.end_price - (self.start_price or 0) <= self.price_index_max_width
+
+    def sort_keys(self):
+        """
+        커서 기반 페이지네이션에 사용할 정렬 키 컬럼
+
+        Returns:
+            tuple | None: 정렬 키 컬럼 목록, 관련도순 정렬처럼 키로 표현할 수 없으면 None
+        """
+        return SORT_COLUMNS.get(self.sort_by)
+
+    def explain(self, session, limit=None, offset=None):
+        """
+        생성된 쿼리의 실행 계획을 조회
+
+        - SQLite의 EXPLAIN QUERY PLAN 결과에서 조건 범위만 읽지 못하는 단계를 full_scans로 표시
+            - 인덱스 없이 테이블 전체를 읽는 SCAN
+            - 인덱스 전체를 차례로 읽는 SCAN ... USING INDEX (조건이 없거나 넓은 가격대만 있는 목록을
+              정렬 순서대로 읽는 경우는 LIMIT에서 멈추므로 제외하고, 그 밖의 조건이 있으면 걸러지는 행까지
+              계속 읽으므로 표시)
+            - 다른 테이블의 행마다 검색 인덱스(FTS)를 다시 조회하는 단계 (첫 단계가 아닌 가상 테이블)
+
+        Parameters:
+            session (Session): 데이터베이스 세션
+            limit (int): 페이지 크기 (페이지네이션과 같은 계획을 보기 위함)
+            offset (int): 건너뛸 행 수
+
+        Returns:
+            dict: 실행할 SQL, 실행 계획 단계, 전체 스캔 및 임시 정렬 단계 목록
+        """
+        connection = session.connection()
+        query = self.build(connection)
+        if limit is not None:
+            query = query.limit(limit)
+        if offset is not None:
+            query = query.offset(offset)
+
+        compiled = query.compile(dialect=connection.dialect)
+        sql = str(compiled)
+
+        if connection.dialect.name == 'sqlite':
+            params = tuple(compiled.params[name] for name in compiled.positiontup)
+            rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", params).all()
+            plan = [row[-1] for row in rows]
+        else:
+            rows = connection.exec_driver_sql(f"EXPLAIN {sql}", compiled.params).all()
+            plan = [str(row[0]) for row in rows]
+
+        return {
+            'filters': self.filter_args(),
+            'sql': sql,
+            'plan': plan,
+            'full_scans': full_scans(plan, filtered=bool(self.category or self.search
+                                                        or self.price_range_selective())),
+            'temp_sorts': [step for step in plan if 'TEMP B-TREE' in step],
+        }
+
+
+def full_scans(plan, filtered):
+    """
+    SQLite 실행 계획 단계 중 조건 범위만 읽지 못하는 단계
+
+    Parameters:
+        plan (list): EXPLAIN QUERY PLAN의 단계 설명 목록 (바깥 반복부터)
+        filtered (bool): 쿼리에 조회 조건(검색, 카테고리, 가격)이 있는지 여부
+
+    Returns:
+        list: 전체 스캔으로 볼 단계 목록
+    """
+    scans = []
+    for position, step in enumerate(plan):
+        if 'VIRTUAL TABLE' in step:
+            if position > 0:
+                scans.append(step)
+        elif step.startswith('SCAN') and ('USING' not in step or filtered):
+            scans.append(step)
+    return scans
@@ -0,0 +1,89 @@
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import aliased
+
+from model.data import Room, User
+
+# 채팅방 참여자 정보 캐시 유지 시간(초)과 최대 채팅방 수
+ROOM_CACHE_TTL = 60.0
+ROOM_CACHE_MAX_ROOMS = 4096
+
+# 채팅방 참여자 (채팅방을 만든 사용자와 상대방의 ID, 이름)
+RoomMembers = namedtuple('RoomMembers', ['sender_id', 'receiver_id', 'sender_name', 'receiver_name'])
+
+
+class RoomMemberCache:
+    """
+    채팅방 참여자 정보를 짧게 보관하는 캐시
+
+    - 채팅방의 참여자는 바뀌지 않으므로 메시지마다 rooms, users 테이블을 조회하지 않도록 ttl 동안 재사용
+    - 오래 사용하지 않은 채팅방부터 제거하여 max_rooms 이하로 유지
+
+    Attributes:
+        ttl (float): 캐시 유지 시간(초)
+        max_rooms (int): 캐시에 보관하는 최대 채팅방 수
+    """
+
+    def __init__(self, ttl=ROOM_CACHE_TTL, max_rooms=ROOM_CACHE_MAX_ROOMS):
+        self.ttl = ttl
+        self.max_rooms = max_rooms
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, room_id):
+        with self._lock:
+            entry = self._entries.get(room_id)
+            if entry is None or entry[0] < time.monotonic():
+                self._entries.pop(room_id, None)
+                return None
+            self._entries.move_to_end(room_id)
+            return entry[1]
+
+    def store(self, room_id, members):
+        with self._lock:
+            self._entries[room_id] = (time.monotonic() + self.ttl, members)
+            self._entries.move_to_end(room_id)
+            while len(self._entries) > self.max_rooms:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, room_id):
+        with self._lock:
+            self._entries.pop(room_id, None)
+
+
+# 애플리케이션 전체에서 사용하는 채팅방 참여자 캐시
+room_member_cache = RoomMemberCache()
+
+
+def room_members(session, room_id, cache=room_member_cache):
+    """
+    채팅방 참여자의 ID와 이름 조회 (캐시에 없으면 한 번의 쿼리로 조회)
+
+    Parameters:
+        session (Session): 데이터베이스 세션
+        room_id (str): 채팅방 ID
+        cache (RoomMemberCache): 참여자 캐시
+
+    Returns:
+        RoomMembers | None: 채팅방 참여자 (채팅방이 없으면 None)
+    """
+    members = cache.get(room_id)
+    if members is not None:
+        return members
+
+    sender, receiver = aliased(User), aliased(User)
+    row = session.execute(
+        select(Room.sender_id, Room.receiver_id, sender.name, receiver.name)
+        .outerjoin(sender, sender.id == Room.sender_id)
+        .outerjoin(receiver, receiver.id == Room.receiver_id)
+        .where(Room.id == room_id)
+    ).first()
+    if row is None:
+        return None
+
+    members = RoomMembers(*row)
+    cache.store(room_id, members)
+    return members
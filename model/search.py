@@ -0,0 +1,187 @@
+import re
+import sqlite3
+
+from sqlalchemy import event, false, func, inspect, literal_column, or_, table, column, text
+from sqlalchemy.engine import Engine
+
+# 게시물 검색용 SQLite FTS5 가상 테이블 이름
+POSTS_FTS_TABLE = "posts_fts"
+
+# 제목이 본문보다 검색 순위에 더 큰 영향을 주도록 하는 bm25 가중치 (title, body)
+TITLE_WEIGHT = 10.0
+BODY_WEIGHT = 1.0
+
+# FTS 인덱스의 rowid는 posts 테이블의 rowid와 동일하게 유지
+posts_fts = table(POSTS_FTS_TABLE, column("rowid"), column("title"), column("body"))
+
+# 단어 단위 분리 (밑줄 등 구분 문자는 제외)
+_WORD_RE = re.compile(r"[^\W_]+")
+
+# posts 테이블 변경 시 FTS 인덱스를 같은 트랜잭션 안에서 동기화하는 트리거
+SEARCH_INDEX_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {POSTS_FTS_TABLE} USING fts5(title, body, tokenize='unicode61')",
+    f"""
+    CREATE TRIGGER IF NOT EXISTS posts_fts_ai AFTER INSERT ON posts BEGIN
+        INSERT INTO {POSTS_FTS_TABLE}(rowid, title, body)
+        VALUES (new.rowid, ngram(new.title), ngram(new.body));
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS posts_fts_ad AFTER DELETE ON posts BEGIN
+        DELETE FROM {POSTS_FTS_TABLE} WHERE rowid = old.rowid;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS posts_fts_au AFTER UPDATE OF title, body ON posts BEGIN
+        UPDATE {POSTS_FTS_TABLE} SET title = ngram(new.title), body = ngram(new.body)
+        WHERE rowid = new.rowid;
+    END
+    """,
+]
+
+
+def ngram(value):
+    """
+    텍스트를 검색 인덱스용 2-gram 토큰 문자열로 변환
+
+    - 한국어는 띄어쓰기 없이 붙여 쓰는 경우가 많아 단어 단위 토큰으로는 부분 검색이 불가능
+    - 각 단어를 겹치는 2글자 토큰으로 나누고, 마지막 글자를 1글자 토큰으로 추가
+    - 예: "중고거래" -> "중고 고거 거래 래"
+
+    Parameters:
+        value (str): 변환할 텍스트
+
+    Returns:
+        str: 공백으로 구분된 토큰 문자열
+    """
+    if not value:
+        return ""
+
+    tokens = []
+    for word in _WORD_RE.findall(value.lower()):
+        tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        tokens.append(word[-1])
+    return " ".join(tokens)
+
+
+@event.listens_for(Engine, "connect")
+def _register_ngram_function(dbapi_connection, connection_record):
+    """
+    SQLite 연결마다 트리거에서 사용하는 ngram() SQL 함수를 등록
+    """
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        dbapi_connection.create_function("ngram", 1, ngram, deterministic=True)
+
+
+def build_match_query(query):
+    """
+    사용자가 입력한 검색어를 FTS5 MATCH 구문으로 변환
+
+    - 공백으로 구분된 각 검색어는 AND 조건으로 결합
+    - 2글자 이상 검색어는 2-gram 토큰의 구문(phrase) 검색으로 부분 문자열 일치를 보장
+    - 1글자 검색어는 접두어 검색으로 처리
+
+    Parameters:
+        query (str): 사용자가 입력한 검색어
+
+    Returns:
+        str | None: MATCH 구문, 검색 가능한 단어가 없으면 None
+    """
+    terms = []
+    for word in _WORD_RE.findall(query.lower()):
+        if len(word) == 1:
+            terms.append(f'"{word}" *')
+        else:
+            terms.append('"' + " ".join(word[i:i + 2] for i in range(len(word) - 1)) + '"')
+    return " AND ".join(terms) if terms else None
+
+
+_index_available = {}
+
+
+def search_index_available(bind):
+    """
+    현재 데이터베이스에서 FTS 검색 인덱스를 사용할 수 있는지 확인
+
+    Parameters:
+        bind (Engine): 확인할 데이터베이스 엔진
+
+    Returns:
+        bool: SQLite이고 FTS 테이블이 존재하면 True
+    """
+    if bind.url not in _index_available:
+        _index_available[bind.url] = (
+            bind.dialect.name == "sqlite" and inspect(bind).has_table(POSTS_FTS_TABLE)
+        )
+    return _index_available[bind.url]
+
+
+def apply_search(stmt, model, query, bind, rank=True):
+    """
+    게시물 조회 쿼리에 검색 조건과 관련도 정렬을 추가
+
+    - FTS 인덱스를 사용할 수 있으면 제목과 본문을 MATCH로 검색하고 bm25 점수 순으로 정렬
+    - 인덱스가 없는 데이터베이스에서는 제목/본문 LIKE 검색으로 대체
+
+    Parameters:
+        stmt (Select): 게시물 조회 쿼리
+        model: Post 모델 클래스
+        query (str): 사용자가 입력한 검색어
+        bind (Engine): 쿼리를 실행할 데이터베이스 엔진
+        rank (bool): 관련도 순 정렬을 추가할지 여부
+
+    Returns:
+        Select: 검색 조건이 적용된 쿼리 객체
+    """
+    match_query = build_match_query(query)
+    if match_query is None:
+        return stmt.where(false())
+
+    if search_index_available(bind):
+        stmt = (
+            stmt.join(posts_fts, posts_fts.c.rowid == literal_column(f"{model.__tablename__}.rowid"))
+            .where(literal_column(POSTS_FTS_TABLE).op("MATCH")(match_query))
+        )
+        if rank:
+            stmt = stmt.order_by(func.bm25(literal_column(POSTS_FTS_TABLE), TITLE_WEIGHT, BODY_WEIGHT))
+        return stmt
+
+    for word in query.split():
+        stmt = stmt.where(or_(model.title.contains(word, autoescape=True),
+                              model.body.contains(word, autoescape=True)))
+    return stmt
+
+
+def create_search_index(connection):
+    """
+    FTS 가상 테이블과 동기화 트리거를 생성하고, 새로 만든 경우 기존 게시물을 색인
+
+    Parameters:
+        connection (Connection): 트랜잭션이 열린 데이터베이스 연결
+    """
+    if connection.dialect.name != "sqlite":
+        return
+
+    exists = inspect(connection).has_table(POSTS_FTS_TABLE)
+    for ddl in SEARCH_INDEX_DDL:
+        connection.execute(text(ddl))
+
+    if not exists:
+        rebuild_search_index(connection)
+    _index_available.pop(connection.engine.url, None)
+
+
+def rebuild_search_index(connection):
+    """
+    posts 테이블 전체를 다시 읽어 FTS 인덱스를 재구성
+
+    - VACUUM 이후 posts의 rowid가 바뀔 수 있으므로 그 경우 재구성이 필요
+
+    Parameters:
+        connection (Connection): 트랜잭션이 열린 데이터베이스 연결
+    """
+    connection.execute(text(f"DELETE FROM {POSTS_FTS_TABLE}"))
+    connection.execute(text(
+        f"INSERT INTO {POSTS_FTS_TABLE}(rowid, title, body) "
+        "SELECT rowid, ngram(title), ngram(body) FROM posts"
+    ))
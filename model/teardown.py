@@ -0,0 +1,195 @@
+from datetime import datetime
+
+from sqlalchemy import and_, case, delete, func, insert, literal, or_, select, update
+
+from model.data import AccountDeletionJob, AssetDeletionJob, Like, Message, Post, PostImage, Room, User
+
+# 계정 삭제 시 사용자 ID 대신 채팅방에 남기는 값
+UNKNOWN_USER_ID = "Unknown"
+
+
+def delete_rooms(connection, room_ids):
+    """
+    채팅방과 메시지를 조건으로 한 번에 삭제 (행을 세션에 불러오지 않음)
+
+    - SQLite 외래 키 검사를 사용하지 않으므로 메시지를 먼저 직접 삭제
+
+    Parameters:
+        connection (Connection): 트랜잭션이 열린 데이터베이스 연결
+        room_ids (list): 삭제할 채팅방 ID 목록
+    """
+    if not room_ids:
+        return
+    connection.execute(delete(Message).where(Message.room_id.in_(room_ids)))
+    connection.execute(delete(Room).where(Room.id.in_(room_ids)))
+
+
+def leave_chat_room(connection, room_id, user_id):
+    """
+    사용자의 채팅방 참여 상태를 해제하고, 두 사용자 모두 나갔으면 채팅방과 메시지 삭제
+
+    Parameters:
+        connection (Connection): 트랜잭션이 열린 데이터베이스 연결
+        room_id (str): 채팅방 ID
+        user_id (str): 나가는 사용자 ID
+
+    Returns:
+        bool | None: 채팅방이 삭제되었으면 True, 상대방이 남아 있으면 False (사용자가 참여한 채팅방이 없으면 None)
+    """
+    row = connection.execute(
+        update(Room)
+        .where(Room.id == room_id, or_(Room.sender_id == user_id, Room.receiver_id == user_id))
+        .values(sender_join=case((Room.sender_id == user_id, False), else_=Room.sender_join),
+                receiver_join=case((Room.receiver_id == user_id, False), else_=Room.receiver_join))
+        .returning(Room.sender_join, Room.receiver_join)
+    ).first()
+    if row is None:
+        return None
+
+    if row.sender_join or row.receiver_join:
+        return False
+    delete_rooms(connection, [room_id])
+    return True
+
+
+def detach_user_rooms(connection, user_id):
+    """
+    삭제되는 사용자의 채팅방 정리
+
+    - 상대방이 이미 나간 채팅방은 메시지와 함께 삭제
+    - 상대방이 남아 있는 채팅방은 사용자 ID를 UNKNOWN_USER_ID로 바꾸고 참여 상태를 해제
+
+    Parameters:
+        connection (Connection): 트랜잭션이 열린 데이터베이스 연결
+        user_id (str): 삭제되는 사용자 ID
+
+    Returns:
+        list: 삭제되거나 변경된 채팅방 ID 목록
+    """
+    abandoned = connection.scalars(select(Room.id).where(or_(
+        and_(Room.sender_id == user_id, Room.receiver_join == False),
+        and_(Room.receiver_id == user_id, Room.sender_join == False),
+    ))).all()
+    delete_rooms(connection, abandoned)
+
+    detached = connection.scalars(
+        update(Room).where(Room.sender_id == user_id)
+        .values(sender_id=UNKNOWN_USER_ID, sender_join=False)
+        .returning(Room.id)
+    ).all()
+    detached += connection.scalars(
+        update(Room).where(Room.receiver_id == user_id)
+        .values(receiver_id=UNKNOWN_USER_ID, receiver_join=False)
+        .returning(Room.id)
+    ).all()
+    return list(abandoned) + detached
+
+
+def delete_posts(connection, post_ids, now=None):
+    """
+    게시물과 이미지, 좋아요를 조건으로 한 번에 삭제하고 이미지 에셋 삭제 작업 등록
+
+    Parameters:
+        connection (Connection): 트랜잭션이 열린 데이터베이스 연결
+        post_ids (list): 삭제할 게시물 ID 목록
+        now (datetime): 작업 등록 시간 (기본값: 현재 시간)
+    """
+    if not post_ids:
+        return
+    now = now or datetime.now()
+
+    # 원본과 썸네일 에셋을 한 번의 INSERT ... SELECT로 삭제 작업에 등록
+    assets = select(PostImage.public_id.label('public_id')).where(
+        PostImage.post_id.in_(post_ids), PostImage.public_id.is_not(None)
+    ).union(select(PostImage.thumbnail_public_id).where(
+        PostImage.post_id.in_(post_ids), PostImage.thumbnail_public_id.is_not(None)
+    )).subquery()
+    connection.execute(insert(AssetDeletionJob).from_select(
+        ['public_id', 'status', 'attempts', 'next_attempt_at', 'created_at'],
+        select(assets.c.public_id, literal('pending'), literal(0), literal(now), literal(now))
+    ))
+
+    connection.execute(delete(Like).where(Like.post_id.in_(post_ids)))
+    connection.execute(delete(PostImage).where(PostImage.post_id.in_(post_ids)))
+    connection.execute(delete(Post).where(Post.id.in_(post_ids)))
+
+
+def delete_user_posts(connection, user_id, limit=None):
+    """
+    사용자의 게시물을 limit개까지 삭제
+
+    Parameters:
+        connection (Connection): 트랜잭션이 열린 데이터베이스 연결
+        user_id (str): 작성자 ID
+        limit (int): 한 번에 삭제할 최대 게시물 수 (기본값: 전부)
+
+    Returns:
+        int: 삭제한 게시물 수
+    """
+    query = select(Post.id).where(Post.author_id == user_id)
+    if limit is not None:
+        query = query.limit(limit)
+    post_ids = connection.scalars(query).all()
+    delete_posts(connection, post_ids)
+    return len(post_ids)
+
+
+def delete_user_likes(connection, user_id):
+    """
+    사용자가 누른 좋아요를 삭제하고 좋아요가 눌렸던 게시물의 좋아요 수를 다시 계산
+
+    - 좋아요 수 버퍼와 같이 1을 빼지 않고 likes 테이블 기준으로 다시 계산하므로,
+      반영 대기 중인 변경분이 있어도 두 번 빠지지 않음
+
+    Parameters:
+        connection (Connection): 트랜잭션이 열린 데이터베이스 연결
+        user_id (str): 좋아요를 누른 사용자 ID
+    """
+    email = select(User.email).where(User.id == user_id).scalar_subquery()
+    post_ids = connection.scalars(select(Like.post_id).where(Like.user_email == email)).all()
+    if not post_ids:
+        return
+
+    connection.execute(delete(Like).where(Like.user_email == email))
+    connection.execute(
+        update(Post)
+        .where(Post.id.in_(post_ids))
+        .values(like_cnt=select(func.count(Like.id)).where(Like.post_id == Post.id).scalar_subquery())
+    )
+
+
+def delete_account(connection, user_id, sync_limit):
+    """
+    사용자 계정 삭제
+
+    - 채팅방을 정리하고, 업로드한 프로필 이미지의 삭제 작업을 등록한 뒤 사용자 행을 삭제
+    - 사용자가 누른 좋아요를 삭제하고 해당 게시물의 좋아요 수를 likes 테이블 기준으로 다시 계산
+    - 게시물이 sync_limit개 이하이면 같은 트랜잭션에서 삭제하고, 더 많으면 계정 삭제 작업으로 등록
+
+    Parameters:
+        connection (Connection): 트랜잭션이 열린 데이터베이스 연결
+        user_id (str): 삭제할 사용자 ID
+        sync_limit (int): 요청 안에서 바로 삭제하는 최대 게시물 수
+
+    Returns:
+        tuple: (게시물 삭제 작업 등록 여부, 삭제되거나 변경된 채팅방 ID 목록)
+    """
+    room_ids = detach_user_rooms(connection, user_id)
+
+    now = datetime.now()
+    post_count = connection.scalar(select(func.count()).select_from(Post).where(Post.author_id == user_id))
+    queued = post_count > sync_limit
+    if queued:
+        connection.execute(insert(AccountDeletionJob).values(
+            user_id=user_id, attempts=0, next_attempt_at=now, created_at=now))
+    else:
+        delete_user_posts(connection, user_id)
+
+    connection.execute(insert(AssetDeletionJob).from_select(
+        ['public_id', 'status', 'attempts', 'next_attempt_at', 'created_at'],
+        select(User.profile_image_public_id, literal('pending'), literal(0), literal(now), literal(now))
+        .where(User.id == user_id, User.profile_image_public_id.is_not(None))
+    ))
+    delete_user_likes(connection, user_id)
+    connection.execute(delete(User).where(User.id == user_id))
+    return queued, room_ids
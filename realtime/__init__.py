@@ -0,0 +1,37 @@
+"""
+실시간 채팅(Socket.IO) 서버 설정
+
+- SOCKETIO_MESSAGE_QUEUE가 비어 있으면 한 프로세스 안에서만 메시지 전달 (기본 메모리 관리자)
+- 여러 워커로 실행할 때는 메시지 큐로 워커 사이에 emit, 방 입장/퇴장을 전달
+    - redis://, rediss://: Redis pub/sub (Flask-SocketIO의 RedisManager)
+    - amqp:// 등: Kombu가 지원하는 메시지 큐 (KombuManager)
+    - local://host:port: 로컬 브로커 (realtime.local_broker, 외부 서비스 없이 개발/부하 테스트용)
+- SOCKETIO_ASYNC_MODE로 비동기 서버 선택 (threading, eventlet, gevent, 비어 있으면 설치된 것 중 자동 선택)
+"""
+from realtime.local_broker import LocalBrokerManager
+
+# 워커들이 메시지를 주고받는 채널 이름
+CHANNEL = 'flask-socketio'
+
+
+def socketio_options(app):
+    """
+    애플리케이션 설정으로 SocketIO.init_app에 넘길 옵션 생성
+
+    Parameters:
+        app (Flask): Flask 애플리케이션
+
+    Returns:
+        dict: async_mode, message_queue 또는 client_manager 등을 담은 옵션
+    """
+    options = {
+        'cors_allowed_origins': "*",
+        'async_mode': app.config.get('SOCKETIO_ASYNC_MODE') or None,
+    }
+    url = app.config.get('SOCKETIO_MESSAGE_QUEUE')
+    if url and url.startswith('local://'):
+        options['client_manager'] = LocalBrokerManager(url, channel=CHANNEL)
+    elif url:
+        options['message_queue'] = url
+        options['channel'] = CHANNEL
+    return options
@@ -0,0 +1,232 @@
+"""
+외부 서비스 없이 여러 Socket.IO 워커를 연결하는 로컬 pub/sub 브로커
+
+- Redis의 PUBLISH/SUBSCRIBE와 같은 역할을 하는 작은 TCP 서버와 이를 사용하는 클라이언트 관리자
+- 한 줄에 명령 하나를 보내는 텍스트 프로토콜
+    - SUBSCRIBE <채널>: 이 연결을 채널 구독자로 등록하고 이후 채널 메시지를 한 줄씩 수신
+    - PUBLISH <채널> <JSON>: 채널의 모든 구독자에게 JSON 한 줄 전달
+- 메시지를 저장하지 않으므로 구독 전에 발행된 메시지는 전달되지 않음 (Redis pub/sub과 동일)
+- 개발, 부하 테스트용이며 운영에서는 redis:// 메시지 큐 사용
+"""
+import json
+import logging
+import socket
+import socketserver
+import threading
+import time
+from urllib.parse import urlparse
+
+from socketio import PubSubManager
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 6380
+
+# 브로커 연결이 끊겼을 때 다시 연결하기까지 대기 시간 (초, 실패할 때마다 두 배로 증가)
+RETRY_MIN = 0.5
+RETRY_MAX = 10.0
+
+
+def parse_address(url):
+    """
+    local://host:port 형식의 URL에서 브로커 주소 추출
+
+    Parameters:
+        url (str): 브로커 URL
+
+    Returns:
+        tuple: (host, port)
+    """
+    parsed = urlparse(url)
+    return parsed.hostname or DEFAULT_HOST, parsed.port or DEFAULT_PORT
+
+
+class _BrokerHandler(socketserver.StreamRequestHandler):
+    """
+    브로커에 연결된 클라이언트 하나를 처리 (발행자 또는 구독자)
+    """
+
+    def setup(self):
+        super().setup()
+        # 여러 발행자의 메시지가 한 구독자에게 동시에 쓰여 줄이 섞이지 않도록 보호
+        self.write_lock = threading.Lock()
+
+    def handle(self):
+        try:
+            for line in self.rfile:
+                command, _, rest = line.rstrip(b'\r\n').partition(b' ')
+                if command == b'PUBLISH':
+                    channel, _, payload = rest.partition(b' ')
+                    self.server.publish(channel, payload)
+                elif command == b'SUBSCRIBE':
+                    self.server.subscribe(rest, self)
+                    # 구독자는 이후 명령을 보내지 않으므로 연결이 끊길 때까지 대기
+                    self.rfile.read()
+                    break
+        except OSError:
+            # 워커가 종료되어 연결이 끊긴 경우
+            pass
+
+    def finish(self):
+        self.server.unsubscribe(self)
+        super().finish()
+
+
+class LocalBroker(socketserver.ThreadingTCPServer):
+    """
+    채널별 구독자에게 발행된 메시지를 그대로 전달하는 pub/sub 서버
+
+    Attributes:
+        subscribers (dict): 채널 이름(bytes)별 구독 중인 연결 처리기 집합
+    """
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        super().__init__((host, port), _BrokerHandler)
+        self.subscribers = {}
+        self._lock = threading.Lock()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"local://{host}:{port}"
+
+    def subscribe(self, channel, handler):
+        with self._lock:
+            self.subscribers.setdefault(channel, set()).add(handler)
+
+    def unsubscribe(self, handler):
+        with self._lock:
+            for handlers in self.subscribers.values():
+                handlers.discard(handler)
+
+    def publish(self, channel, payload):
+        """
+        채널 구독자 모두에게 메시지 전달 (전송에 실패한 구독자는 제거)
+
+        Parameters:
+            channel (bytes): 채널 이름
+            payload (bytes): 전달할 메시지 (JSON 한 줄)
+        """
+        with self._lock:
+            handlers = list(self.subscribers.get(channel, ()))
+        line = payload + b'\n'
+        for handler in handlers:
+            try:
+                with handler.write_lock:
+                    handler.wfile.write(line)
+            except OSError:
+                self.unsubscribe(handler)
+
+    def start(self):
+        """
+        백그라운드 스레드에서 브로커 실행
+
+        Returns:
+            threading.Thread: 브로커 스레드
+        """
+        thread = threading.Thread(target=self.serve_forever, name='local-broker', daemon=True)
+        thread.start()
+        return thread
+
+
+class LocalBrokerClient:
+    """
+    로컬 브로커의 채널 하나에 메시지를 발행하고 구독하는 클라이언트
+
+    - 메시지는 JSON으로 직렬화할 수 있는 dict
+    - 발행 연결이 끊겨 있으면 한 번 다시 연결해서 보내고, 구독 연결이 끊기면 지연 시간을 늘려 가며 다시 연결
+
+    Attributes:
+        address (tuple): 브로커 주소 (host, port)
+        channel (str): 채널 이름
+    """
+
+    def __init__(self, url, channel, logger=None):
+        self.address = parse_address(url)
+        self.channel = channel
+        self.logger = logger or logging.getLogger(__name__)
+        self._publisher = None
+        self._publish_lock = threading.Lock()
+
+    def publish(self, data):
+        """
+        채널에 메시지 발행
+
+        Parameters:
+            data (dict): 발행할 메시지
+
+        Returns:
+            bool: 발행 성공 여부
+        """
+        line = f"PUBLISH {self.channel} {json.dumps(data)}\n".encode()
+        for _ in range(2):
+            with self._publish_lock:
+                try:
+                    if self._publisher is None:
+                        self._publisher = self._connect()
+                    self._publisher.sendall(line)
+                    return True
+                except OSError:
+                    if self._publisher is not None:
+                        self._publisher.close()
+                        self._publisher = None
+        self.logger.error('로컬 브로커에 메시지를 발행하지 못했습니다: %s:%s', *self.address)
+        return False
+
+    def listen(self):
+        """
+        채널을 구독하고 받은 메시지를 차례로 반환 (연결이 끊기면 다시 연결하며 끝나지 않음)
+
+        Returns:
+            generator: 받은 메시지 (dict)
+        """
+        retry = RETRY_MIN
+        while True:
+            try:
+                connection = self._connect()
+            except OSError:
+                self.logger.warning('로컬 브로커에 연결할 수 없습니다. %.1f초 후 다시 시도합니다.', retry)
+                time.sleep(retry)
+                retry = min(retry * 2, RETRY_MAX)
+                continue
+
+            retry = RETRY_MIN
+            try:
+                with connection, connection.makefile('rb') as lines:
+                    connection.sendall(f"SUBSCRIBE {self.channel}\n".encode())
+                    for line in lines:
+                        yield json.loads(line)
+            except OSError:
+                pass
+            self.logger.warning('로컬 브로커 연결이 끊어졌습니다. 다시 연결합니다.')
+
+    def _connect(self):
+        connection = socket.create_connection(self.address, timeout=RETRY_MAX)
+        connection.settimeout(None)
+        connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return connection
+
+
+class LocalBrokerManager(PubSubManager):
+    """
+    로컬 브로커를 통해 여러 Socket.IO 서버가 방(room) 메시지를 주고받는 클라이언트 관리자
+
+    - 다른 워커에 연결된 클라이언트에게 보낸 emit(..., to=room)도 브로커를 거쳐 전달
+    - 브로커 연결이 끊기면 지연 시간을 늘려 가며 다시 연결
+
+    Attributes:
+        client (LocalBrokerClient): 브로커 채널 클라이언트
+    """
+    name = 'local'
+
+    def __init__(self, url=f"local://{DEFAULT_HOST}:{DEFAULT_PORT}", channel='flask-socketio',
+                 write_only=False, logger=None):
+        super().__init__(channel=channel, write_only=write_only, logger=logger)
+        self.client = LocalBrokerClient(url, channel, logger=logger)
+
+    def _publish(self, data):
+        self.client.publish(data)
+
+    def _listen(self):
+        yield from self.client.listen()
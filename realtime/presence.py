@@ -0,0 +1,291 @@
+"""
+채팅방 접속 상태(presence) 레지스트리
+
+- 어떤 사용자가 어떤 채팅방 화면에 접속해 있는지를 소켓 세션(sid)과 채팅방 단위로 메모리에 보관
+- join/leave/disconnect 소켓 이벤트와 채팅방을 떠날 때의 /chat/stay_join 요청으로 갱신
+- 메시지를 저장할 때 받는 사람이 채팅방에 접속해 있는지(읽지 않은 메시지 수 증가 여부)를 DB 조회 없이 판단
+- 여러 워커로 실행할 때는 pub/sub 채널(local:// 로컬 브로커, redis://)로 변경 사항을 주고받아 모든 워커가 같은 상태를 유지
+    - 워커마다 주기적으로 자신의 전체 상태(snapshot)를 발행하고, 새로 시작한 워커는 시작할 때 요청(sync)하여 상태를 채움
+    - 일정 시간 snapshot이 없는 워커(비정상 종료)의 접속 상태는 제거
+"""
+import json
+import threading
+import time
+import uuid
+from collections import defaultdict
+
+from realtime.local_broker import LocalBrokerClient
+
+# 접속 상태 변경을 주고받는 채널 이름
+CHANNEL = 'chat-presence'
+
+# 워커가 자신의 전체 상태를 발행하는 주기(초)와, snapshot이 없으면 워커가 종료된 것으로 보는 시간(초)
+HEARTBEAT_INTERVAL = 10.0
+HOST_TIMEOUT = 3 * HEARTBEAT_INTERVAL
+
+# 채널 구독을 시작한 뒤 다른 워커에 전체 상태를 요청하기까지 대기 시간(초)
+SYNC_DELAY = 0.5
+
+
+class RedisChannel:
+    """
+    Redis pub/sub 채널 하나에 메시지를 발행하고 구독하는 클라이언트 (redis 패키지 필요)
+    """
+
+    def __init__(self, url, channel):
+        import redis
+
+        self.redis = redis.Redis.from_url(url)
+        self.channel = channel
+
+    def publish(self, data):
+        self.redis.publish(self.channel, json.dumps(data))
+        return True
+
+    def listen(self):
+        pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(self.channel)
+        for message in pubsub.listen():
+            yield json.loads(message['data'])
+
+
+def pubsub_channel(url, channel=CHANNEL):
+    """
+    메시지 큐 URL에 맞는 pub/sub 채널 클라이언트 생성
+
+    Parameters:
+        url (str): SOCKETIO_MESSAGE_QUEUE 값
+        channel (str): 채널 이름
+
+    Returns:
+        LocalBrokerClient | RedisChannel | None: 채널 클라이언트 (지원하지 않는 URL이면 None)
+    """
+    if not url:
+        return None
+    if url.startswith('local://'):
+        return LocalBrokerClient(url, channel)
+    if url.startswith(('redis://', 'rediss://')):
+        return RedisChannel(url, channel)
+    return None
+
+
+class PresenceRegistry:
+    """
+    채팅방별로 접속 중인 사용자와 소켓 세션을 보관하는 레지스트리
+
+    - 접속 상태는 (워커 ID, sid) 단위로 기록되며, 같은 사용자가 여러 탭으로 접속해도 하나라도 남아 있으면 접속 중
+    - 변경은 먼저 현재 워커에 반영한 뒤 채널로 발행하고, 다른 워커에서 받은 변경은 그대로 반영
+
+    Attributes:
+        host_id (str): 현재 워커 ID
+        channel: pub/sub 채널 클라이언트 (없으면 현재 워커 안에서만 유지)
+        heartbeat_interval (float): 전체 상태 발행 주기(초)
+        host_timeout (float): 다른 워커의 상태를 유지하는 시간(초)
+    """
+
+    def __init__(self, channel=None, heartbeat_interval=HEARTBEAT_INTERVAL, host_timeout=HOST_TIMEOUT):
+        self.host_id = uuid.uuid4().hex
+        self.channel = channel
+        self.heartbeat_interval = heartbeat_interval
+        self.host_timeout = host_timeout
+        self.logger = None
+
+        self._lock = threading.Lock()
+        # 채팅방 ID -> 사용자 ID -> {(워커 ID, sid)}
+        self._rooms = defaultdict(lambda: defaultdict(set))
+        # (워커 ID, sid) -> {(채팅방 ID, 사용자 ID)}
+        self._sessions = defaultdict(set)
+        # 다른 워커 ID -> 마지막으로 메시지를 받은 시간
+        self._hosts = {}
+        self._started = False
+        self._start_background_task = None
+
+    def init_app(self, app, socketio):
+        """
+        메시지 큐 설정이 있으면 워커 사이에 접속 상태를 주고받는 채널을 연결
+
+        - 채널 구독과 상태 발행은 첫 접속 상태 변경 시 socketio 백그라운드 작업으로 시작
+
+        Parameters:
+            app (Flask): Flask 애플리케이션
+            socketio (SocketIO): 백그라운드 작업을 실행할 SocketIO 인스턴스
+        """
+        self.channel = pubsub_channel(app.config.get('SOCKETIO_MESSAGE_QUEUE'))
+        self.logger = app.logger
+        self._start_background_task = socketio.start_background_task
+        app.extensions['presence'] = self
+        if app.config.get('SOCKETIO_MESSAGE_QUEUE') and self.channel is None:
+            app.logger.warning('이 메시지 큐에서는 채팅방 접속 상태를 워커 사이에 공유하지 않습니다.')
+
+    def join(self, sid, room_id, user_id):
+        """
+        소켓 세션이 채팅방에 접속했음을 기록
+        """
+        self._apply_and_publish({'op': 'join', 'sid': sid, 'room_id': room_id, 'user_id': user_id})
+
+    def leave(self, sid, room_id):
+        """
+        소켓 세션이 채팅방에서 나갔음을 기록
+        """
+        self._apply_and_publish({'op': 'leave', 'sid': sid, 'room_id': room_id})
+
+    def leave_user(self, room_id, user_id):
+        """
+        사용자의 모든 소켓 세션이 채팅방에서 나갔음을 기록 (소켓 없이 HTTP로 채팅방을 떠날 때)
+        """
+        self._apply_and_publish({'op': 'leave_user', 'room_id': room_id, 'user_id': user_id})
+
+    def disconnect(self, sid):
+        """
+        연결이 끊긴 소켓 세션의 모든 접속 상태 제거
+        """
+        self._apply_and_publish({'op': 'disconnect', 'sid': sid})
+
+    def is_present(self, room_id, user_id):
+        """
+        사용자가 채팅방에 접속해 있는지 여부 (DB를 조회하지 않음)
+
+        Parameters:
+            room_id (str): 채팅방 ID
+            user_id (str): 사용자 ID
+
+        Returns:
+            bool: 사용자의 소켓 세션 중 하나라도 채팅방에 접속해 있으면 True
+        """
+        if self.channel is not None:
+            self._ensure_started()
+        with self._lock:
+            users = self._rooms.get(room_id)
+            return bool(users and users.get(user_id))
+
+    def snapshot(self, host_id=None):
+        """
+        워커의 접속 상태 목록
+
+        Returns:
+            list: [sid, 채팅방 ID, 사용자 ID] 목록
+        """
+        host_id = host_id or self.host_id
+        with self._lock:
+            return [[sid, room_id, user_id]
+                    for (host, sid), entries in self._sessions.items() if host == host_id
+                    for room_id, user_id in entries]
+
+    def apply(self, event):
+        """
+        접속 상태 변경 반영 (현재 워커의 변경과 다른 워커에서 받은 변경 모두)
+
+        Parameters:
+            event (dict): op(join, leave, leave_user, disconnect, snapshot), host와 변경 내용
+        """
+        host = event['host']
+        with self._lock:
+            if host != self.host_id:
+                self._hosts[host] = time.monotonic()
+
+            op = event['op']
+            if op == 'join':
+                self._add((host, event['sid']), event['room_id'], event['user_id'])
+            elif op == 'leave':
+                session = (host, event['sid'])
+                for room_id, user_id in list(self._sessions.get(session, ())):
+                    if room_id == event['room_id']:
+                        self._remove(session, room_id, user_id)
+            elif op == 'leave_user':
+                for session in list(self._rooms.get(event['room_id'], {}).get(event['user_id'], ())):
+                    self._remove(session, event['room_id'], event['user_id'])
+            elif op == 'disconnect':
+                session = (host, event['sid'])
+                for room_id, user_id in list(self._sessions.get(session, ())):
+                    self._remove(session, room_id, user_id)
+            elif op == 'snapshot' and host != self.host_id:
+                self._drop_sessions(lambda session: session[0] == host)
+                for sid, room_id, user_id in event['entries']:
+                    self._add((host, sid), room_id, user_id)
+
+    def expire_hosts(self):
+        """
+        host_timeout 동안 snapshot이 없는 다른 워커의 접속 상태 제거
+
+        Returns:
+            int: 제거된 워커 수
+        """
+        deadline = time.monotonic() - self.host_timeout
+        with self._lock:
+            expired = {host for host, seen in self._hosts.items() if seen < deadline}
+            for host in expired:
+                del self._hosts[host]
+            if expired:
+                self._drop_sessions(lambda session: session[0] in expired)
+        return len(expired)
+
+    def _add(self, session, room_id, user_id):
+        self._rooms[room_id][user_id].add(session)
+        self._sessions[session].add((room_id, user_id))
+
+    def _remove(self, session, room_id, user_id):
+        users = self._rooms.get(room_id)
+        if users is not None:
+            sessions = users.get(user_id)
+            if sessions is not None:
+                sessions.discard(session)
+                if not sessions:
+                    del users[user_id]
+            if not users:
+                del self._rooms[room_id]
+        entries = self._sessions.get(session)
+        if entries is not None:
+            entries.discard((room_id, user_id))
+            if not entries:
+                del self._sessions[session]
+
+    def _drop_sessions(self, predicate):
+        for session in [session for session in self._sessions if predicate(session)]:
+            for room_id, user_id in list(self._sessions.get(session, ())):
+                self._remove(session, room_id, user_id)
+
+    def _apply_and_publish(self, event):
+        event['host'] = self.host_id
+        self.apply(event)
+        if self.channel is not None:
+            self._ensure_started()
+            self.channel.publish(event)
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        start = self._start_background_task or (lambda target: threading.Thread(target=target, daemon=True).start())
+        start(self._listen)
+        start(self._heartbeat)
+
+    def _listen(self):
+        for event in self.channel.listen():
+            if event.get('host') == self.host_id:
+                continue
+            if event.get('op') == 'sync':
+                # 새로 시작한 워커가 요청하면 다음 주기를 기다리지 않고 전체 상태 발행
+                self._publish_snapshot()
+                continue
+            try:
+                self.apply(event)
+            except (KeyError, TypeError, ValueError):
+                if self.logger:
+                    self.logger.exception('잘못된 접속 상태 메시지를 무시합니다.')
+
+    def _heartbeat(self):
+        # 구독이 연결될 시간을 두고 다른 워커에 전체 상태를 요청
+        time.sleep(SYNC_DELAY)
+        self.channel.publish({'op': 'sync', 'host': self.host_id})
+        while True:
+            self._publish_snapshot()
+            self.expire_hosts()
+            time.sleep(self.heartbeat_interval)
+
+    def _publish_snapshot(self):
+        self.channel.publish({'op': 'snapshot', 'host': self.host_id, 'entries': self.snapshot()})
+
+
+# 애플리케이션 전체에서 사용하는 채팅방 접속 상태 레지스트리
+presence = PresenceRegistry()
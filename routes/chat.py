@@ -1,17 +1,48 @@
-from flask import render_template, url_for, request, redirect, Blueprint, make_response, jsonify, flash
+from flask import render_template, url_for, request, redirect, Blueprint, make_response, jsonify, flash, current_app, session
 from flask_login import current_user
 from datetime import datetime
 from flask_socketio import SocketIO, join_room, leave_room, emit
 from sqlalchemy import or_, and_
-from model.data import Room, Message, db, User
+from model.data import Room, db, User
+from model.inbox import get_inbox
+from model.chat_history import message_history
+from model.room_members import room_members, room_member_cache
+from model.message_buffer import message_buffer, message_entry
+from model.teardown import leave_chat_room
+from realtime.presence import presence
 from security.security import admin_only
-from app import app
 
 # 채팅 라우트를 위한 Blueprint
 chatting = Blueprint('chatting', __name__, template_folder='templates/chat')
 
-# SocketIO 인스턴스
-socketio = SocketIO(app, cors_allowed_origins="*")
+# SocketIO 인스턴스 (비동기 서버와 메시지 큐 설정은 main.py에서 init_app으로 적용)
+socketio = SocketIO()
+
+
+def socket_user():
+    """
+    소켓 연결 시 인증된 사용자
+
+    - connect에서 Flask-Login 세션으로 확인한 사용자를 소켓 세션에 저장해 두고 이벤트마다 다시 조회하지 않음
+    - 클라이언트가 보낸 사용자 이름은 사용하지 않음
+
+    Returns:
+        dict: 사용자 ID(id)와 이름(name)
+    """
+    return session['socket_user']
+
+
+def user_room(user_id):
+    """
+    사용자 개인 알림 방 이름 (사용자의 모든 소켓이 연결 시 참여)
+
+    Parameters:
+        user_id (str): 사용자 ID
+
+    Returns:
+        str: 방 이름
+    """
+    return f"user:{user_id}"
 
 
 @chatting.route('/chat_room', methods=['POST', 'GET'])
@@ -87,91 +118,14 @@ def get_chat_rooms():
     """
     현재 사용자와 관련된 모든 채팅방 정보를 검색하는 함수
     
-    - 사용자가 참여하고 있는 모든 채팅방 검색
-    - 각 채팅방에 대한 상세 정보 수집
+    - 사용자가 참여하고 있는 모든 채팅방과 상대방 정보, 읽지 않은 메시지 수,
+      최신 메시지를 단일 쿼리로 조회
+    - 최근 활동순으로 정렬
     
     Returns:
         list: 채팅방 정보 목록
     """
-    user_id = current_user.id
-    rooms = Room.query.filter(or_(Room.sender_id == user_id, Room.receiver_id == user_id)).all()
-    chat_room_list = []
-    
-    def get_other_user_info(room):
-        """
-        채팅방의 다른 참여자 정보를 검색하는 함수
-        
-        - 채팅방에서 현재 사용자와 다른 참여자 식별
-        - 채팅방 정보 검색
-        - 다른 참여자의 정보 수집
-        - 읽지 않은 메시지 수 계산
-        - 최신 메시지 정보 검색
-        - 채팅방 참여 상태 확인
-
-        Returns:
-            dict: 다음 정보를 포함하는 딕셔너리 반환:
-                - email: 다른 참여자의 이메일
-                - receive_user_id: 다른 참여자의 사용자 ID
-                - room_id: 채팅방 ID
-                - room_check: 채팅방 참여 상태
-                - receiver_name: 다른 참여자의 이름
-                - latest_message: 최신 메시지 내용
-                - message_time: 메시지 시간
-                - other_user_profile: 다른 참여자의 프로필 이미지
-                - unread_count: 읽지 않은 메시지 수
-        """
-        other_user_id = room.receiver_id if room.sender_id == user_id else room.sender_id
-        other_user = User.query.get(other_user_id)
-        room_check = Room.query.get(room.id)
-
-        is_sender = user_id == room_check.sender_id
-        is_receiver = user_id == room_check.receiver_id
-
-        if is_sender:
-            unread_count = room_check.sender_unread_count
-        elif is_receiver:
-            unread_count = room_check.receiver_unread_count
-        else:
-            unread_count = 0
-
-        latest_message = Message.query.filter_by(room_id=room_check.id).order_by(Message.time.desc()).first()
-        message_time = latest_message.time.strftime('%Y-%m-%d') if latest_message else room_check.date.strftime('%Y-%m-%d')
-        
-        if is_sender:
-            last_join_time = room_check.sender_last_join
-            if last_join_time is not None:
-                latest_message = Message.query.filter_by(room_id=room_check.id).filter(
-                    Message.time >= last_join_time
-                ).order_by(Message.time.desc()).first()
-            else:
-                latest_message = Message.query.filter_by(room_id=room_check.id).order_by(Message.time.desc()).first()
-        else:
-            last_join_time = room_check.receiver_last_join
-            if last_join_time is not None:
-                latest_message = Message.query.filter_by(room_id=room_check.id).filter(
-                    Message.time >= last_join_time
-                ).order_by(Message.time.desc()).first()
-            else:
-                latest_message = Message.query.filter_by(room_id=room_check.id).order_by(Message.time.desc()).first()
-        
-        room_status = room_check.sender_join if is_sender else room_check.receiver_join
-
-        return {
-            'email': other_user.email if other_user else 'Unknown',
-            'receive_user_id': other_user.id if other_user else 'Unknown',
-            'room_id': room_check.id,
-            'room_check': room_status,
-            'receiver_name': other_user.name if other_user else 'Unknown',
-            'latest_message': latest_message.text if latest_message else '대화가 없습니다.',
-            'message_time': message_time,
-            'other_user_profile': other_user.profile_image_name if other_user else None,
-            'unread_count': unread_count
-        }
-
-    for room in rooms:
-        chat_room_list.append(get_other_user_info(room))
-        
-    return chat_room_list
+    return get_inbox(db.session, current_user.id)
 
 
 @chatting.route('/get_messages/<string:receive_user_id>', methods=['GET', 'POST'])
@@ -187,7 +141,7 @@ def chat(receive_user_id):
     - 기존 채팅방 확인 및 필요한 경우 새로운 채팅방 생성
     - 채팅방 접근 권한 확인
     - 사용자 참여 상태 업데이트
-    - 메시지 기록 검색
+    - 가장 최근 메시지 한 페이지 검색 (이전 메시지는 next_cursor로 history 라우트에서 조회)
     
     Returns:
         JSON: 채팅방 및 메시지 정보
@@ -241,23 +195,16 @@ def chat(receive_user_id):
             db.session.commit()
         last_join_time = chat_room.receiver_last_join
 
-    messages_query = Message.query.filter_by(room_id=chat_room.id)
-    if last_join_time:
-        messages_query = messages_query.filter(Message.time >= last_join_time)
-    messages = messages_query.order_by(Message.time).all()
+    # 가장 최근 메시지 한 페이지만 반환하고, 이전 메시지는 /history로 스크롤할 때 조회
+    history = message_history(db.session, chat_room.id, since=last_join_time,
+                              per_page=history_page_size(request.args))
 
     return jsonify({
         'user': current_user.name,
         'room_id': chat_room.id,
         'receive_user_name': receive_user_name,
-        'messages': [{
-            'id': message.id,
-            'room_id': message.room_id,
-            'sender_name': message.sender_name,
-            'receive_user_name': message.receive_user_name,
-            'text': message.text,
-            'time': message.time.isoformat()
-        } for message in messages],
+        'messages': [serialize_message(message) for message in reversed(history.items)],
+        'next_cursor': history.next_cursor,
         'logged_in': current_user.is_authenticated,
         'receive_user_id': receive_user_id,
         'current_user': {
@@ -268,6 +215,62 @@ def chat(receive_user_id):
     })
 
 
+@chatting.route('/history/<string:room_id>', methods=['GET'])
+@admin_only
+def chat_history(room_id):
+    """
+    채팅방의 이전 메시지를 커서 기준으로 한 페이지씩 조회하는 라우트 함수
+
+    Parameters:
+        room_id (str): 채팅방 ID
+
+    Query Parameters:
+        cursor (str): 이전 응답의 next_cursor (없으면 가장 최근 페이지)
+        limit (int): 페이지 크기 (CHAT_HISTORY_MAX_PAGE_SIZE 이하)
+
+    Returns:
+        JSON: 오래된 순으로 정렬된 메시지와 더 이전 페이지 토큰 (없으면 null)
+    """
+    chat_room = db.session.get(Room, room_id)
+    if not chat_room or current_user.id not in (chat_room.sender_id, chat_room.receiver_id):
+        return jsonify({'success': False, 'message': '채팅방을 찾을 수 없습니다.'}), 404
+
+    is_sender = current_user.id == chat_room.sender_id
+    last_join_time = chat_room.sender_last_join if is_sender else chat_room.receiver_last_join
+    history = message_history(db.session, chat_room.id, since=last_join_time,
+                              cursor=request.args.get('cursor'), per_page=history_page_size(request.args))
+
+    return jsonify({
+        'success': True,
+        'room_id': chat_room.id,
+        'messages': [serialize_message(message) for message in reversed(history.items)],
+        'next_cursor': history.next_cursor,
+    })
+
+
+def history_page_size(args):
+    """
+    요청한 채팅 기록 페이지 크기 (없거나 잘못되면 CHAT_HISTORY_PAGE_SIZE, 최대 CHAT_HISTORY_MAX_PAGE_SIZE)
+    """
+    config = current_app.config
+    limit = args.get('limit', type=int) or config['CHAT_HISTORY_PAGE_SIZE']
+    return max(1, min(limit, config['CHAT_HISTORY_MAX_PAGE_SIZE']))
+
+
+def serialize_message(message):
+    """
+    메시지를 채팅 위젯에서 사용하는 JSON 형식으로 변환
+    """
+    return {
+        'id': message.id,
+        'room_id': message.room_id,
+        'sender_name': message.sender_name,
+        'receive_user_name': message.receive_user_name,
+        'text': message.text,
+        'time': message.time.isoformat()
+    }
+
+
 @chatting.route('/stay_join', methods=['POST'])
 @admin_only
 def update_stay_join():
@@ -275,7 +278,7 @@ def update_stay_join():
     사용자의 채팅방 연결 상태를 업데이트하는 함수
     
     - 채팅방을 나갈 때 호출
-    - 사용자의 stay_join 상태를 False로 설정
+    - 접속 상태 레지스트리에서 사용자를 채팅방 접속 해제로 기록 (이후 받는 메시지는 읽지 않은 메시지로 집계)
     - 채팅방과 사용자의 존재 여부 확인
     
     Returns:
@@ -284,24 +287,12 @@ def update_stay_join():
     try:
         data = request.get_json()
         room = data.get('room_id')
-        current_user = data.get('current_user')
         
-        chat_room = Room.query.get(room)
-        if not chat_room:
+        if room_members(db.session, room) is None:
             flash('채팅방을 찾을 수 없습니다.', 'danger')
             return redirect(url_for('chatting.chat_room'))
-            
-        user = User.query.filter_by(name=current_user).first()
-        if not user:
-            flash('사용자를 찾을 수 없습니다.', 'danger')
-            return redirect(url_for('chatting.chat_room'))
 
-        if user.id == chat_room.sender_id:
-            chat_room.sender_stay_join = False
-        else:
-            chat_room.receiver_stay_join = False
-            
-        db.session.commit()
+        presence.leave_user(room, current_user.id)
 
         return jsonify({"success": True})
         
@@ -326,10 +317,9 @@ def reset_unread_count():
     data = request.get_json()
     room_id = data.get('room_id')
     chat_room = Room.query.get(room_id)
-    current_user_id = User.query.filter_by(name=current_user.name).first().id
 
     if chat_room:
-        if current_user_id == chat_room.sender_id:
+        if current_user.id == chat_room.sender_id:
             chat_room.sender_unread_count = 0
         else:
             chat_room.receiver_unread_count = 0
@@ -341,14 +331,21 @@ def reset_unread_count():
 
 # 소켓 연결 확인
 @socketio.on("connect")
-def test_connect():
+def test_connect(auth=None):
     """
-    소켓 연결이 성공했는지 확인하는 이벤트 핸들러
+    소켓 연결을 인증하는 이벤트 핸들러
     
     - 클라이언트가 서버에 연결될 때 호출
-    - 연결이 성공하면 콘솔에 메시지 출력
+    - 로그인하지 않은 클라이언트의 연결은 거부
+    - 로그인한 사용자의 ID와 이름을 소켓 세션에 저장 (이후 이벤트에서는 socket_user()로 사용)
+    - 사용자 개인 알림 방에 참여 (채팅 목록의 읽지 않은 메시지 수와 마지막 메시지 갱신 알림 수신)
     """
-    print('connect!')
+    if not current_user.is_authenticated:
+        return False
+
+    session['socket_user'] = {'id': current_user.id, 'name': current_user.name}
+    join_room(user_room(current_user.id))
+    current_app.logger.debug('소켓 연결: %s (%s)', current_user.name, request.sid)
 
 
 @socketio.on('join')
@@ -359,24 +356,18 @@ def join(data):
     Parameters:
         data (dict): 클라이언트로부터 받은 데이터
             - room_id: 채팅방 ID
-            - current_user: 현재 사용자 이름
     
-    - 채팅방 연결 상태 업데이트
-    - 지정된 채팅방에 사용자 참여
-    - stay_join 상태를 True로 설정
+    - 채팅방 참여자인 경우에만 지정된 채팅방에 사용자 참여
+    - 접속 상태 레지스트리에 소켓 세션의 채팅방 접속을 기록 (DB에 쓰지 않음)
     """
     room = data['room_id']
-    current_user = data['current_user']
+    user = socket_user()
 
-    chat_room = Room.query.get(room)
-    current_user_id = User.query.filter_by(name=current_user).first().id
-    
-    if current_user_id == chat_room.sender_id:
-        chat_room.sender_stay_join = True
-    else:
-        chat_room.receiver_stay_join = True
-        
-    db.session.commit()
+    members = room_members(db.session, room)
+    if members is None or user['id'] not in (members.sender_id, members.receiver_id):
+        return
+
+    presence.join(request.sid, room, user['id'])
     join_room(room)
 
 
@@ -388,49 +379,62 @@ def handle_message(data):
     Parameters:
         data (dict): 클라이언트로부터 받은 데이터
             - room_id: 채팅방 ID
-            - current_user: 현재 사용자 이름
-            - message: 메시지 내용
-            - receive_user_name: 수신자 이름
+            - message: 메시지 내용 (비어 있지 않은 문자열)
     
-    - 읽지 않은 메시지 수 업데이트
-    - 데이터베이스에 메시지 저장
-    - 채팅방의 다른 사용자에게 실시간으로 메시지 전송
+    - 보낸 사람은 소켓 연결 시 인증된 사용자, 받는 사람은 채팅방의 상대방
+    - 채팅방의 다른 사용자에게 실시간으로 메시지를 바로 전송
+    - 두 사용자의 개인 알림 방에 마지막 메시지(last_message)를, 받는 사람이 채팅방에 없으면 읽지 않은 메시지 수 증가분(unread)을 전송
+      (채팅 목록을 다시 조회하지 않고 화면에서 갱신)
+    - 메시지 저장, 읽지 않은 메시지 수와 마지막 메시지 스냅샷 갱신은 메시지 버퍼에서 묶어서 반영
+    - 보낸 사람에게 저장 결과를 응답(ack)으로 반환 (CHAT_DURABILITY에 따라 반영 후 또는 즉시)
+
+    Returns:
+        dict: success와 메시지 ID (socket.emit의 콜백으로 전달)
     """
     room = data['room_id']
-    name = data['current_user']
-    message = data['message']
-    receive_user_name = data['receive_user_name']
-    current_time = datetime.now()
-    chat_room = Room.query.get(room)
-
-    is_sender = name == chat_room.sender.name
-
-    if is_sender:
-        if chat_room.receiver_stay_join is False:
-            chat_room.receiver_unread_count += 1
-    else:
-        if chat_room.sender_stay_join is False:
-            chat_room.sender_unread_count += 1
-    
-    db.session.commit()
-            
-    new_message = Message(
-        room_id=room,
-        sender_name=name,
-        receive_user_name=receive_user_name,
-        text=message,
-        time=current_time
-    )
-    db.session.add(new_message)
-    db.session.commit()
+    user = socket_user()
+    name = user['name']
+
+    # 저장할 수 없는 메시지가 버퍼에 들어가 다른 메시지 저장을 막지 않도록 전송 전에 거절
+    text = data.get('message')
+    if not isinstance(text, str) or not text.strip():
+        return {'success': False, 'message': '메시지 내용이 없습니다.'}
+
+    # 채팅방 참여자는 바뀌지 않으므로 캐시에서 조회 (메시지마다 Room, User를 불러오지 않음)
+    members = room_members(db.session, room)
+    if members is None or user['id'] not in (members.sender_id, members.receiver_id):
+        return {'success': False, 'message': '채팅방을 찾을 수 없습니다.'}
+
+    # 받는 사람이 채팅방에 접속해 있으면 읽지 않은 메시지 수를 늘리지 않음 (접속 상태는 메모리에서 확인)
+    to_receiver = user['id'] == members.sender_id
+    recipient_id = members.receiver_id if to_receiver else members.sender_id
+    receive_user_name = members.receiver_name if to_receiver else members.sender_name
+    entry = message_entry(room, name, receive_user_name, text, to_receiver=to_receiver,
+                          unread=not presence.is_present(room, recipient_id))
 
     emit('message', {
-        'sender_name': new_message.sender_name,
-        'text': message, 
+        'id': entry['id'],
+        'sender_name': name,
+        'text': entry['text'],
         'receive_user_name': receive_user_name,
-        'timestamp': current_time.isoformat(),
+        'timestamp': entry['time'].isoformat(),
         'room_id': room
     }, to=room)
+    emit('last_message', {
+        'room_id': room,
+        'sender_name': name,
+        'text': entry['text'],
+        'timestamp': entry['time'].isoformat()
+    }, to=[user_room(user['id']), user_room(recipient_id)])
+    if entry['unread']:
+        emit('unread', {'room_id': room, 'delta': 1}, to=user_room(recipient_id))
+
+    try:
+        message_buffer.save(entry)
+    except Exception:
+        current_app.logger.exception('채팅 메시지를 저장하지 못했습니다.')
+        return {'success': False, 'id': entry['id'], 'message': '메시지를 저장하지 못했습니다.'}
+    return {'success': True, 'id': entry['id']}
 
 
 @socketio.on('leave')
@@ -441,52 +445,43 @@ def on_leave(data):
     Parameters:
         data (dict): 클라이언트로부터 받은 데이터
             - room_id: 채팅방 ID
-            - current_user: 현재 사용자 이름
     
     - 채팅방 참여 상태 업데이트
-    - 두 사용자 모두 나갔을 때 채팅방과 메시지 삭제
+    - 두 사용자 모두 나갔을 때 채팅방과 메시지 삭제 (행을 불러오지 않고 조건으로 한 번에 변경, 삭제)
     - 채팅방 나가기 처리 및 관련 알림 전송
     
     예외 처리:
-    - 사용자나 채팅방을 찾을 수 없는 경우
+    - 채팅방을 찾을 수 없는 경우
     - 데이터베이스 처리 중 오류 발생 시
     """
     try:
         room_id = data['room_id']
-        user_name = data['current_user']
-        
-        user = User.query.filter_by(name=user_name).first()
-        if not user:
-            emit('error', {'success': False, 'message': '사용자를 찾을 수 없습니다.'}, 'danger')
-            return jsonify({'success': False})
-
-        chat_room = Room.query.get(room_id)
-        if not chat_room:
-            emit('error', {'success': False, 'message': '채팅방을 찾을 수 없습니다.'}, 'danger')
-            return jsonify({'success': False})
+        user = socket_user()
+        user_name = user['name']
 
         try:
-            if user.id == chat_room.sender_id:
-                chat_room.sender_join = False
-            elif user.id == chat_room.receiver_id:
-                chat_room.receiver_join = False
-            
-            if not chat_room.sender_join and not chat_room.receiver_join:
-                Message.query.filter_by(room_id=chat_room.id).delete()
-                db.session.delete(chat_room)
-            
+            # 채팅방이 삭제될 수 있으므로 버퍼에 남은 메시지를 먼저 반영 (메시지가 채팅방과 함께 삭제되도록)
+            message_buffer.flush()
+            deleted = leave_chat_room(db.session.connection(), room_id, user['id'])
+            if deleted is None:
+                db.session.rollback()
+                emit('error', {'success': False, 'message': '채팅방을 찾을 수 없습니다.'})
+                return
             db.session.commit()
+            if deleted:
+                room_member_cache.invalidate(room_id)
             
             leave_room(room_id)
+            presence.leave(request.sid, room_id)
             emit('status', {'success': True, 'data': f"{user_name}님이 나갔습니다."}, to=room_id)
             emit('leave_response', {'success': True, 'message': '채팅방을 성공적으로 나갔습니다.'})
             
         except Exception as e:
             db.session.rollback()
-            emit('error', {'success': False, 'message': f'채팅방을 나가는 중 오류가 발생했습니다. {e}'}, 'danger')
+            emit('error', {'success': False, 'message': f'채팅방을 나가는 중 오류가 발생했습니다. {e}'})
 
     except Exception as e:
-        emit('error', {'success': False, 'message': '잘못된 요청입니다.'}, 'danger')
+        emit('error', {'success': False, 'message': '잘못된 요청입니다.'})
 
     
 @socketio.on('disconnect')
@@ -498,5 +493,7 @@ def disconnect(reason):
         reason (str): 연결 종료 이유
     
     - 클라이언트 연결 종료를 로그에 기록
+    - 소켓 세션의 채팅방 접속 상태 제거
     """
-    print('Client disconnected, reason:', reason)
\ No newline at end of file
+    presence.disconnect(request.sid)
+    current_app.logger.debug('소켓 연결 종료: %s (%s)', request.sid, reason)
\ No newline at end of file
@@ -1,46 +1,71 @@
 from dotenv import load_dotenv
 import os
-from flask import render_template, url_for, request, redirect, flash, jsonify, Blueprint
+from flask import render_template, url_for, request, redirect, flash, jsonify, Blueprint, current_app
 from datetime import datetime
 from flask_login import current_user
-from model.data import Post, db, Like
+from model.data import Post, PostImage, db, Like
+from model.post_query import PostListingQuery, PRICE_INDEX_MAX_WIDTH
+from model.pagination import keyset_paginate, wants_keyset
+from model.likes import liked_post_ids
+from model.listing import for_cards
+from model.asset_jobs import enqueue_asset_deletions
 from forms import CreatePostForm
 from security.security import admin_only, is_author
-from cloudinary_dir.cloudinary import cloudinary
-import cloudinary.uploader
+from storage.pipeline import upload_pipeline, uploaded_ids, UploadError
+from storage.ingest import invalid_uploads
+from sqlalchemy.exc import SQLAlchemyError
 
 # .env 파일에서 환경 변수를 프로세스의 환경 변수로 로드하기 위해 python-dotenv 라이브러리를 사용
 load_dotenv()
 ADMIN_USER_ID = os.getenv("ADMIN_USER_ID")
 
-ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg'}
-
 # posts 라우트를 위한 Blueprint
 posts = Blueprint('posts', __name__, template_folder='templates/product')
 
-def allowed_file(filename):
+def post_image_from_upload(upload, position):
     """
-    업로드된 파일이 허용된 확장자를 가지고 있는지 확인
-    
+    업로드 결과로 게시물 이미지 객체 생성
+
     Parameters:
-        filename (str): 확인할 파일 이름
-    
+        upload (dict): 업로드 파이프라인의 파일별 업로드 결과
+        position (int): 게시물 안에서의 표시 순서
+
     Returns:
-        bool: 확장자가 허용되면 True, 그렇지 않으면 False
+        PostImage: 업로드된 이미지 정보 (첫 번째 이미지는 대표 이미지)
     """
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    return PostImage(position=position,
+                     is_cover=position == 0,
+                     url=upload['secure_url'],
+                     public_id=upload['public_id'],
+                     width=upload.get('width'),
+                     height=upload.get('height'),
+                     thumbnail_url=upload.get('thumbnail_url'),
+                     thumbnail_public_id=upload.get('thumbnail_public_id'))
+
+def commit_with_uploads(uploads):
+    """
+    변경 사항을 커밋하고, 커밋에 실패하면 이번 요청에서 업로드한 이미지를 삭제
 
-def search_posts(query):
+    Parameters:
+        uploads (list): 이번 요청에서 업로드한 결과 목록
     """
-    게시물 제목에서 검색어를 포함하는 게시물을 검색
-    
+    try:
+        db.session.commit()
+    except SQLAlchemyError:
+        db.session.rollback()
+        upload_pipeline.destroy_all(public_id for upload in uploads for public_id in uploaded_ids(upload))
+        raise
+
+def reorder_post_images(post):
+    """
+    게시물 이미지의 표시 순서를 0부터 다시 매기고 첫 번째 이미지를 대표 이미지로 지정
+
     Parameters:
-        query (str): 검색할 키워드
-    
-    Returns:
-        Select: 검색 결과를 포함하는 쿼리 객체
+        post (Post): 이미지를 정리할 게시물
     """
-    return db.select(Post).filter(Post.title.contains(query)).order_by(Post.date.desc())
+    for position, image in enumerate(post.images):
+        image.position = position
+        image.is_cover = position == 0
 
 
 # 모든 게시물 보여주는 창
@@ -52,8 +77,8 @@ def all_products():
     - 카테고리별 필터링
     - 정렬 기능 (최신순, 인기순)
     - 가격대별 필터링
-    - 검색 기능
-    - 페이지네이션 구현
+    - 검색 기능 (다른 필터 조건과 함께 적용)
+    - 페이지네이션 구현 (페이지 번호 또는 커서 방식)
 
     Returns:
         template: 게시물 목록 페이지
@@ -64,36 +89,28 @@ def all_products():
         "도서", "티켓/교환권", "가공식품", "건강기능식품", "반려동물용품", "식물", "기타 중고물품"
     ]
 
-    like_posts = []
-    if current_user.is_authenticated:
-        like_posts = [like.post_id for like in current_user.likes]
-
     page = request.args.get('page', 1, type=int)
 
-    category = request.args.get('category', default=None)
-    sort_by = request.args.get('sort_by', default='recent')
-    start_price = request.args.get('start_price', type=int)
-    end_price = request.args.get('end_price', type=int)
-
-    query = db.select(Post)
-
-    if category:
-        query = query.filter(Post.category == category)
+    listing_query = PostListingQuery.from_args(request.args,
+                                               current_app.config.get('PRICE_INDEX_MAX_WIDTH', PRICE_INDEX_MAX_WIDTH))
 
-    if sort_by:
-        if sort_by == "recent":
-            query = query.order_by(Post.date.desc())
-        elif sort_by == "hottest":
-            query = query.order_by(Post.like_cnt.desc(), Post.date.desc())
+    # 디버그 모드 또는 관리자는 ?explain=1 로 선택된 실행 계획을 확인 가능
+    if request.args.get('explain') and (current_app.debug or
+                                        (current_user.is_authenticated and current_user.id == ADMIN_USER_ID)):
+        return jsonify(listing_query.explain(db.session, limit=20, offset=(max(page, 1) - 1) * 20))
 
-    if start_price is not None and end_price is not None:
-        query = query.filter(Post.price.between(start_price, end_price))
+    query = for_cards(listing_query.build(db.session.connection()))
+    sort_keys = listing_query.sort_keys()
 
-    search_query = request.args.get('search', default=None)
-    if search_query:
-        query = search_posts(search_query)
+    # ?paging=cursor 이면 OFFSET 대신 정렬 키 기준 커서 페이지네이션 사용 (관련도순 제외)
+    if sort_keys and wants_keyset(request.args):
+        posts = keyset_paginate(db.session, query, sort_keys, cursor=request.args.get('cursor'), per_page=20)
+    else:
+        posts = db.paginate(query, page=page, per_page=20, error_out=False)
 
-    posts = db.paginate(query, page=page, per_page=20, error_out=False)
+    like_posts = set()
+    if current_user.is_authenticated:
+        like_posts = liked_post_ids(db.session, current_user.email, [post.id for post in posts.items])
 
     return render_template(
         'product/all-products.html',
@@ -102,10 +119,12 @@ def all_products():
         pagination=posts,
         like_posts=like_posts,
         categories=categories,
-        category=category,
-        sort_by=sort_by,
-        startPrice=start_price,
-        endPrice=end_price
+        category=listing_query.category,
+        sort_by=listing_query.sort_by,
+        startPrice=listing_query.start_price,
+        endPrice=listing_query.end_price,
+        search=listing_query.search,
+        filter_args=listing_query.filter_args()
     )
 
 
@@ -122,7 +141,7 @@ def show_post(post_id):
     """
     requested_post = db.get_or_404(Post, post_id)
 
-    img_urls = requested_post.img_url.split(',') if requested_post.img_url else []
+    img_urls = [image.url for image in requested_post.images]
 
     return render_template('product/post.html', requested_post=requested_post,
                            logged_in=current_user.is_authenticated, img_urls=img_urls,
@@ -136,8 +155,9 @@ def add_new_products_post():
     새 게시물을 생성하는 함수
 
     - 관리자만 접근 가능
-    - 다중 이미지 업로드 지원
+    - 다중 이미지 업로드 지원 (업로드 파이프라인에서 전처리 후 썸네일과 함께 병렬 업로드)
     - Cloudinary를 사용하여 이미지 저장
+    - 업로드 또는 저장에 실패하면 이미 업로드된 이미지를 삭제
 
     Returns:
         template: 게시물 생성 페이지 또는 생성된 게시물로 리다이렉트
@@ -150,34 +170,30 @@ def add_new_products_post():
         textarea = form.textarea.data
         files = request.files.getlist('files')
 
-        invalid_files = [file.filename for file in files if not allowed_file(file.filename)]
+        invalid_files = invalid_uploads(files)
 
         if invalid_files:
             flash(f"허용되지 않은 파일 형식: {', '.join(invalid_files)}", 'danger')
             return redirect(url_for('posts.add_new_products_post'))
 
-        img_url_list = []
-        public_id_list = []
-
-        for file in files:
-            response = cloudinary.uploader.upload(file, folder="Products")
-            img_url = response['secure_url']
-            public_id = response['public_id']
-            img_url_list.append(img_url)
-            public_id_list.append(public_id)
+        try:
+            uploads = upload_pipeline.upload_all(files)
+        except UploadError as e:
+            flash(str(e), 'danger')
+            return redirect(url_for('posts.add_new_products_post'))
 
-        img_urls_str = ','.join(img_url_list)
+        images = [post_image_from_upload(upload, position) for position, upload in enumerate(uploads)]
 
         new_post = Post(title=title,
                         date=datetime.now(),
                         body=textarea,
                         price=price,
                         category=category,
-                        img_url=img_urls_str,
+                        images=images,
                         author=current_user)
 
         db.session.add(new_post)
-        db.session.commit()
+        commit_with_uploads(uploads)
 
         new_post_id = new_post.id
 
@@ -195,8 +211,9 @@ def edit(post_id):
     기존 게시물을 수정하는 함수
 
     - 작성자만 접근 가능
-    - 이미지 추가/삭제
+    - 이미지 추가/삭제 (추가 이미지는 업로드 파이프라인에서 병렬 업로드)
     - 게시물 내용 수정
+    - 삭제한 이미지는 저장과 같은 트랜잭션으로 에셋 삭제 작업에 등록 (작업자가 Cloudinary에서 제거)
 
     Parameters:
         post_id (str): 수정할 게시물의 ID
@@ -218,37 +235,35 @@ def edit(post_id):
         post.category = form.category.data
         post.body = form.textarea.data
 
-        current_images = post.img_url.split(',') if post.img_url else []
-        
-        delete_images = request.form.getlist('deleteImages')
-
-        if delete_images:
-            for img_url in delete_images:
-                public_id = img_url.split('/')[-1].split('.')[0]
-                cloudinary.uploader.destroy(f"Products/{public_id}")
-                
-                if img_url in current_images:
-                    current_images.remove(img_url)
-            
-            post.img_url = ','.join(current_images)
-
         files = request.files.getlist('files')
-        
+        uploads = []
+
         if files and files[0].filename != '':
-            invalid_files = [file.filename for file in files if not allowed_file(file.filename)]
+            invalid_files = invalid_uploads(files)
             
             if invalid_files:
                 flash(f"허용되지 않은 파일 형식: {', '.join(invalid_files)}", 'danger')
                 return redirect(url_for('posts.edit', post_id=post_id))
-            
-            for file in files:
-                response = cloudinary.uploader.upload(file, folder="Products")
-                img_url = response['secure_url']
-                current_images.append(img_url)
-                
-            post.img_url = ','.join(current_images)
-            
-        db.session.commit()
+
+            try:
+                uploads = upload_pipeline.upload_all(files)
+            except UploadError as e:
+                db.session.rollback()
+                flash(str(e), 'danger')
+                return redirect(url_for('posts.edit', post_id=post_id))
+
+        delete_images = set(request.form.getlist('deleteImages'))
+        removed = [image for image in post.images if image.id in delete_images]
+        for image in removed:
+            post.images.remove(image)
+
+        start = len(post.images)
+        for position, upload in enumerate(uploads, start=start):
+            post.images.append(post_image_from_upload(upload, position))
+
+        reorder_post_images(post)
+        enqueue_asset_deletions(db.session, [public_id for image in removed for public_id in image.asset_ids])
+        commit_with_uploads(uploads)
 
         flash('게시물이 수정되었습니다.', 'success')
         return redirect(url_for('posts.show_post', post_id=post_id))
@@ -264,7 +279,7 @@ def delete(post_id):
     게시물을 삭제하는 함수
 
     - 작성자만 접근 가능
-    - 관련 이미지 삭제
+    - 관련 이미지 삭제 (에셋 삭제 작업으로 등록하여 응답을 기다리게 하지 않음)
     - 관련 좋아요 데이터 삭제
 
     Parameters:
@@ -274,11 +289,8 @@ def delete(post_id):
         redirect: 게시물 목록 페이지
     """
     post_to_delete = db.get_or_404(Post, post_id)
-    current_images = post_to_delete.img_url.split(',')
-
-    for img_url in current_images:
-        public_id = img_url.split('/')[-1].split('.')[0]
-        cloudinary.uploader.destroy(f"Products/{public_id}")
+    enqueue_asset_deletions(db.session, [public_id for image in post_to_delete.images
+                                         for public_id in image.asset_ids])
 
     if Like.query.filter(Like.post_id == post_id).count() > 0:
         Like.query.filter(Like.post_id == post_id).delete()
@@ -1,32 +1,23 @@
-from flask import render_template, url_for, request, redirect, flash, Blueprint, jsonify
+from flask import render_template, url_for, request, redirect, flash, Blueprint, jsonify, current_app
 from werkzeug.security import generate_password_hash, check_password_hash
 from flask_login import login_user, logout_user, current_user
-from sqlalchemy import or_
 from forms import SignUpForm, LoginForm, ChangePasswordForm
-from model.data import db, User, Post, Like, Room, Review
+from model.data import db, User, Post, Like, Review
 from security.security import admin_only
-from cloudinary_dir.cloudinary import cloudinary
-import cloudinary.uploader
+from model.pagination import keyset_paginate, wants_keyset
+from model.likes import liked_post_ids
+from model.listing import author_posts_query, liked_posts_query
+from model.asset_jobs import enqueue_asset_deletions
+from model.teardown import delete_account as delete_user_account
+from model.account_jobs import account_deletion_worker
+from model.message_buffer import message_buffer
+from model.room_members import room_member_cache
+from storage.pipeline import upload_pipeline, UploadError
+from storage.ingest import allowed_upload
 
 # users 라우트를 위한 Blueprint
 users = Blueprint('users', __name__, template_folder='templates/users')
 
-# 허용된 파일 확장자 정의
-ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg'}
-
-def allowed_file(filename):
-    """
-    업로드된 파일이 허용된 확장자를 가지고 있는지 확인
-    
-    Parameters:
-        filename (str): 확인할 파일 이름
-    
-    Returns:
-        bool: 확장자가 허용되면 True, 아니면 False
-    """
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
-
-
 @users.route('/login', methods=['GET', 'POST'])
 def login():
     """
@@ -120,36 +111,13 @@ def my_page():
     """
     마이페이지를 표시하는 함수
 
-    - 현재 사용자의 게시물과 좋아요한 게시물 표시
+    - 개인 설정, 나의 상품(my_post), 좋아요(like_post) 메뉴만 표시하므로 게시물은 조회하지 않음
 
     Returns:
         template: 마이페이지
     """
-    author_post = Post.query.filter_by(author_id=current_user.id).all()
-
-    like_post = Like.query.filter_by(user_email=current_user.email).all()
-    like_post_list = [Post.query.get(like.post_id) for like in like_post]
-
-    like_posts = []
-    if current_user.is_authenticated:
-        like_posts = [like.post_id for like in current_user.likes]
-
-    if current_user.profile_image_name:
-        img_path = url_for('static', filename=f'uploads/{current_user.profile_image_name}')
-        return render_template('users/my_page.html', name=current_user.name,
-                               logged_in=current_user.is_authenticated,
-                               all_data=author_post,
-                               all_like_post_data=like_post_list,
-                               like_posts=like_posts,
-                               img_path=img_path
-                               )
-
     return render_template('users/my_page.html', name=current_user.name,
-                           logged_in=current_user.is_authenticated,
-                           all_data=author_post,
-                           all_like_post_data=like_post_list,
-                           like_posts=like_posts,
-                           )
+                           logged_in=current_user.is_authenticated)
 
 
 @users.route('/upload/<string:user_id>', methods=['GET', 'POST'])
@@ -159,7 +127,8 @@ def upload_profile_image(user_id):
     프로필 이미지를 업로드하는 함수
 
     - 사용자가 새로운 프로필 이미지를 업로드
-    - 이전 이미지를 삭제하고 새로운 이미지로 업데이트
+    - 업로드 전에 이미지를 줄이고 다시 인코딩 (업로드 파이프라인의 전처리 단계)
+    - 이전 이미지를 삭제하고 새로운 이미지로 업데이트 (이전 이미지는 에셋 삭제 작업으로 등록)
 
     Parameters:
         user_id (str): 프로필 이미지를 업로드할 사용자의 ID
@@ -183,23 +152,24 @@ def upload_profile_image(user_id):
             return redirect(url_for('users.my_page', name=current_user.name,
                                     logged_in=current_user.is_authenticated))
         
-        if not allowed_file(file.filename):
+        if not allowed_upload(file):
             invalid_file = file.filename
             flash(f"허용되지 않은 파일 형식: {invalid_file}", 'danger')
             return redirect(url_for('users.my_page', name=current_user.name,
                                     logged_in=current_user.is_authenticated))
 
-        previous_image_url = requested_user_id.profile_image_name
+        try:
+            response = upload_pipeline.upload_all([file], thumbnails=False)[0]
+        except UploadError as e:
+            flash(str(e), 'danger')
+            return redirect(url_for('users.profile_edit'))
 
-        response = cloudinary.uploader.upload(file, folder="Products")
-        img_url = response['secure_url']
+        # 이전에 업로드한 프로필 이미지 삭제 작업 등록 (기본 이미지는 에셋 ID가 없으므로 삭제하지 않음)
+        if requested_user_id.profile_image_public_id:
+            enqueue_asset_deletions(db.session, [requested_user_id.profile_image_public_id])
 
-        if previous_image_url:
-            if previous_image_url != 'https://res.cloudinary.com/dccnoyixy/image/upload/v1737569274/Products/xunetnnx7ajjqo2vay3z.png':
-                public_id = previous_image_url.split('/')[-1].split('.')[0]  # URL에서 public_id 추출
-                cloudinary.uploader.destroy(f"Products/{public_id}")  # Cloudinary에서 이미지 삭제
-
-        requested_user_id.profile_image_name = img_url
+        requested_user_id.profile_image_name = response['secure_url']
+        requested_user_id.profile_image_public_id = response['public_id']
         db.session.commit()
 
         flash('프로필 이미지가 업데이트 되었습니다.', 'success')
@@ -232,17 +202,22 @@ def my_post():
     """
     사용자의 게시물을 표시하는 함수
 
-    - 페이지네이션을 사용하여 사용자의 게시물을 표시
+    - 페이지네이션을 사용하여 사용자의 게시물을 표시 (?paging=cursor 이면 커서 방식)
 
     Returns:
         template: 사용자의 게시물 페이지
     """
     page = request.args.get('page', 1, type=int)
-    posts = Post.query.filter_by(author_id=current_user.id).paginate(page=page, per_page=20, error_out=False)
+    query = author_posts_query(current_user.id)
 
-    like_posts = []
+    if wants_keyset(request.args):
+        posts = keyset_paginate(db.session, query, [Post.date, Post.id], cursor=request.args.get('cursor'))
+    else:
+        posts = db.paginate(query, page=page, per_page=20, error_out=False)
+
+    like_posts = set()
     if current_user.is_authenticated:
-        like_posts = [like.post_id for like in current_user.likes]
+        like_posts = liked_post_ids(db.session, current_user.email, [post.id for post in posts.items])
 
     return render_template('users/my_post.html', 
                            logged_in=current_user.is_authenticated, 
@@ -257,18 +232,24 @@ def like_post():
     """
     사용자가 좋아요한 게시물을 표시하는 함수
 
-    - 페이지네이션을 사용하여 사용자의 좋아요한 게시물 표시
+    - 페이지네이션을 사용하여 사용자의 좋아요한 게시물 표시 (?paging=cursor 이면 커서 방식)
+    - 좋아요한 시간의 역순으로 정렬하며 삭제된 게시물은 제외
 
     Returns:
         template: 사용자가 좋아요한 게시물 페이지
     """
     page = request.args.get('page', 1, type=int)
-    posts = Like.query.filter_by(user_email=current_user.email).paginate(page=page, per_page=20, error_out=False)
-    like_post_list = [Post.query.get(like.post_id) for like in posts.items]
+    query = liked_posts_query(current_user.email)
+
+    if wants_keyset(request.args):
+        posts = keyset_paginate(db.session, query, [Like.created_at, Like.id], cursor=request.args.get('cursor'))
+    else:
+        posts = db.paginate(query, page=page, per_page=20, error_out=False)
+    like_post_list = [like.post for like in posts.items]
 
-    like_posts = []
+    like_posts = set()
     if current_user.is_authenticated:
-        like_posts = [like.post_id for like in current_user.likes]
+        like_posts = liked_post_ids(db.session, current_user.email, [post.id for post in like_post_list])
 
     return render_template('users/like_post.html',
                             logged_in=current_user.is_authenticated,
@@ -327,7 +308,8 @@ def delete_account():
     계정 삭제 기능을 제공하는 함수
 
     - 사용자는 자신의 신원을 확인한 후 계정을 삭제
-    - 계정이 삭제되면 사용자의 게시물 및 채팅방 정보가 업데이트
+    - 계정이 삭제되면 사용자의 게시물 및 채팅방 정보가 업데이트 (행을 불러오지 않고 조건으로 한 번에 변경)
+    - 게시물이 ACCOUNT_DELETE_SYNC_LIMIT개보다 많으면 게시물은 백그라운드 작업에서 나누어 삭제
     - 계정 삭제가 완료되면 사용자는 메인 페이지로 리다이렉트
 
     Returns:
@@ -347,25 +329,16 @@ def delete_account():
             return redirect(url_for('users.delete_account'))
 
     if request.method == 'POST':
-        current_account = db.get_or_404(User, current_user.id)
-
-        posts = Post.query.filter_by(author_id = current_user.id).all()
-        for post in posts:
-            db.session.delete(post)
-
-        rooms = Room.query.filter(or_(Room.sender_id == current_user.id, Room.receiver_id == current_user.id)).all()
-        for room in rooms:
-            if room.sender_id == current_user.id:
-                room.sender_id = "Unknown"
-                room.sender_join = False
-            else:
-                room.receiver_id = "Unknown"
-                room.receiver_join = False
-
+        # 버퍼에 남은 메시지를 먼저 반영해야 삭제되는 채팅방의 메시지도 함께 삭제됨
+        message_buffer.flush()
+        queued, room_ids = delete_user_account(db.session.connection(), current_user.id,
+                                               current_app.config['ACCOUNT_DELETE_SYNC_LIMIT'])
         db.session.commit()
 
-        db.session.delete(current_account)
-        db.session.commit()
+        for room_id in room_ids:
+            room_member_cache.invalidate(room_id)
+        if queued:
+            account_deletion_worker.wake()
 
         flash('계정이 삭제되었습니다.', 'success')
         return redirect(url_for('home'))
@@ -383,7 +356,7 @@ def user_profile(user_name):
     사용자의 프로필 페이지를 표시하는 함수
 
     - 주어진 사용자 이름으로 사용자를 검색
-    - 사용자가 작성한 모든 게시물을 페이지네이션을 사용하여 로드
+    - 사용자가 작성한 모든 게시물을 페이지네이션을 사용하여 로드 (?paging=cursor 이면 커서 방식)
     - 사용자가 받은 모든 리뷰와 리뷰 작성자의 프로필 이미지를 로드
     - 현재 로그인한 사용자가 좋아요를 누른 게시물 ID 목록을 로드
 
@@ -396,7 +369,12 @@ def user_profile(user_name):
     user = User.query.filter_by(name=user_name).first_or_404()
     page = request.args.get('page', 1, type=int)
 
-    posts = Post.query.filter_by(author_id=user.id).order_by(Post.date.desc()).paginate(page=page, per_page=20, error_out=False)
+    query = author_posts_query(user.id)
+
+    if wants_keyset(request.args):
+        posts = keyset_paginate(db.session, query, [Post.date, Post.id], cursor=request.args.get('cursor'))
+    else:
+        posts = db.paginate(query, page=page, per_page=20, error_out=False)
     
     reviews_query = db.session.query(Review, User.profile_image_name)\
         .join(User, Review.review_writer == User.name)\
@@ -411,9 +389,9 @@ def user_profile(user_name):
         'review_id': review.id
     } for review, profile_image in reviews_query]
 
-    like_posts = []
+    like_posts = set()
     if current_user.is_authenticated:
-        like_posts = [like.post_id for like in current_user.likes]
+        like_posts = liked_post_ids(db.session, current_user.email, [post.id for post in posts.items])
 
     return render_template('users/user_profile.html',
                            user=user,
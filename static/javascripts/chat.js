@@ -2,6 +2,10 @@ let socket = io();
 let CURRENT_USER = null;
 let ROOM_ID = null;
 let RECEIVE_USER_NAME = null;
+// 현재 채팅방에 표시 중인 메시지 (오래된 순)와 더 이전 메시지를 불러올 커서
+let LOADED_MESSAGES = [];
+let HISTORY_CURSOR = null;
+let loadingHistory = false;
 // redirect_url이 존재하면 지정된 URL로 리디렉션
 const chatContainer = document.getElementById('chat-container');
 const redirectUrl = chatContainer.dataset.redirectUrl;
@@ -71,21 +75,11 @@ if (redirectUrl) {
 
             // 소켓에 연결하고 채팅방 입장
             socket.emit("join", {
-                "current_user": CURRENT_USER,
                 "room_id": ROOM_ID
             });
 
-            // 이전 메시지 표시
-            if (data.messages && data.messages.length > 0) {
-                data.messages.forEach(message => {
-                    createChatItem(
-                        message.sender_name,
-                        message.text,
-                        message.receive_user_name,
-                        message.time
-                    );
-                });
-            }
+            // 최근 메시지 한 페이지 표시 (이전 메시지는 위로 스크롤할 때 불러옴)
+            showHistory(data);
         } else {
             // 실패 시 오류 메시지 표시
             alert('채팅방 입장에 실패했습니다.');
@@ -133,7 +127,6 @@ document.querySelectorAll('.chat-room-item').forEach(item => {
                     'Content-Type': 'application/json',
                 },
                 body: JSON.stringify({
-                    current_user: CURRENT_USER,
                     room_id: ROOM_ID
                 })
             })
@@ -182,21 +175,11 @@ document.querySelectorAll('.chat-room-item').forEach(item => {
 
                 // 소켓에 연결하고 채팅방 입장
                 socket.emit("join", {
-                    "current_user": CURRENT_USER,
                     "room_id": ROOM_ID
                 });
 
-                // 이전 메시지 표시
-                if (data.messages && data.messages.length > 0) {
-                    data.messages.forEach(message => {
-                        createChatItem(
-                            message.sender_name,
-                            message.text,
-                            message.receive_user_name,
-                            message.time
-                        );
-                    });
-                }
+                // 최근 메시지 한 페이지 표시 (이전 메시지는 위로 스크롤할 때 불러옴)
+                showHistory(data);
             } else {
                 // 실패 시 오류 메시지 표시
                 alert('채팅방 입장에 실패했습니다.');
@@ -236,9 +219,7 @@ input.addEventListener('keypress', (event) => {
         // 메시지 전송
         socket.emit('message', {
             'message': message,
-            'current_user': CURRENT_USER,
-            'room_id': ROOM_ID,
-            'receive_user_name': RECEIVE_USER_NAME
+            'room_id': ROOM_ID
         });
     }
 });
@@ -366,11 +347,87 @@ function createChatItem(sender_name, text, receive_user_name, timestamp = null,
     messages.appendChild(li);
 }
 
+// 채팅 기록 표시 (채팅방 입장 시 받은 최근 메시지 페이지)
+function showHistory(data) {
+    LOADED_MESSAGES = data.messages || [];
+    HISTORY_CURSOR = data.next_cursor || null;
+    renderMessages();
+}
+
+// 불러온 메시지 전체를 다시 그림 (이전 페이지를 앞에 붙일 때 날짜 구분자와 시간 표시를 다시 계산)
+function renderMessages() {
+    document.getElementById('messages').innerHTML = '';
+    lastDate = null;
+    LOADED_MESSAGES.forEach(message => {
+        createChatItem(
+            message.sender_name,
+            message.text,
+            message.receive_user_name,
+            message.time
+        );
+    });
+}
+
+// 이전 메시지 한 페이지를 불러와 위에 추가하고, 보고 있던 위치를 유지
+function loadOlderMessages() {
+    if (!ROOM_ID || !HISTORY_CURSOR || loadingHistory) {
+        return;
+    }
+    loadingHistory = true;
+    const roomId = ROOM_ID;
+
+    fetch(`/chat/history/${roomId}?cursor=${encodeURIComponent(HISTORY_CURSOR)}`)
+    .then(response => response.json())
+    .then(data => {
+        // 응답을 기다리는 동안 다른 채팅방으로 이동했으면 무시
+        if (!data.success || roomId !== ROOM_ID) {
+            return;
+        }
+        const msgsContainer = document.getElementById('msgs-container');
+        const previousHeight = msgsContainer.scrollHeight;
+        const previousTop = msgsContainer.scrollTop;
+
+        LOADED_MESSAGES = data.messages.concat(LOADED_MESSAGES);
+        HISTORY_CURSOR = data.next_cursor;
+        renderMessages();
+
+        // createChatItem의 자동 스크롤 이후에 실행되도록 예약
+        setTimeout(() => {
+            msgsContainer.scrollTop = msgsContainer.scrollHeight - previousHeight + previousTop;
+        }, 0);
+    })
+    .catch(error => {
+        console.error('Error:', error);
+    })
+    .finally(() => {
+        loadingHistory = false;
+    });
+}
+
+// 메시지 목록 맨 위 근처까지 스크롤하면 이전 메시지 불러오기
+document.getElementById('msgs-container').addEventListener('scroll', function () {
+    if (this.scrollTop < 50) {
+        loadOlderMessages();
+    }
+});
+
 // 서버로부터 받은 메시지 처리
 socket.on('message', function (dt) {
+    // 이전에 입장했던 다른 채팅방의 메시지는 채팅 목록에만 반영 (last_message)
+    if (dt.room_id !== ROOM_ID) {
+        return;
+    }
+    LOADED_MESSAGES.push({
+        sender_name: dt.sender_name,
+        text: dt.text,
+        receive_user_name: dt.receive_user_name,
+        time: dt.timestamp
+    });
     createChatItem(dt.sender_name, dt.text, dt.receive_user_name, dt.timestamp, dt.room_id);
+});
 
-    // 채팅 목록 업데이트
+// 개인 알림 방으로 받은 마지막 메시지로 채팅 목록 업데이트 (입장하지 않은 채팅방 포함)
+socket.on('last_message', function (dt) {
     const chatRoomItem = document.querySelector(`.chat-room-item[data-room-id="${dt.room_id}"]`);
     if (chatRoomItem) {
         // 최신 메시지 텍스트 업데이트
@@ -395,12 +452,26 @@ socket.on('message', function (dt) {
     }
 });
 
+// 개인 알림 방으로 받은 증가분만큼 채팅 목록의 읽지 않은 메시지 수 증가
+socket.on('unread', function (d) {
+    const chatRoomItem = document.querySelector(`.chat-room-item[data-room-id="${d.room_id}"]`);
+    if (!chatRoomItem) {
+        return;
+    }
+    let unreadBadge = chatRoomItem.querySelector('.badge');
+    if (!unreadBadge) {
+        unreadBadge = document.createElement('span');
+        unreadBadge.className = 'badge bg-danger rounded-pill me-2';
+        unreadBadge.textContent = '0';
+        chatRoomItem.querySelector('.text-truncate').parentElement.appendChild(unreadBadge);
+    }
+    unreadBadge.textContent = parseInt(unreadBadge.textContent, 10) + d.delta;
+});
+
 const leave_btn = document.getElementById('leave_chat_btn');
 leave_btn.addEventListener('click', async () => {
     socket.emit('leave', {
-        'current_user': CURRENT_USER,
-        'room_id': ROOM_ID,
-        'receive_user_name': RECEIVE_USER_NAME
+        'room_id': ROOM_ID
     });
 });
 
@@ -434,7 +505,6 @@ if (CURRENT_USER && ROOM_ID) {
             'Content-Type': 'application/json',
         },
         body: JSON.stringify({
-            current_user: CURRENT_USER,
             room_id: ROOM_ID
         })
     })
@@ -0,0 +1,36 @@
+"""
+이미지 저장소 백엔드
+
+- 모든 백엔드는 같은 연산을 제공
+    - upload(file, folder, timeout): 파일을 저장하고 secure_url, public_id, width, height를 담은 dict 반환
+    - destroy(public_id): 에셋 하나 삭제
+    - destroy_many(public_ids): 에셋 여러 개를 한 번에 삭제하고 삭제되었거나 이미 없는 public_id 집합 반환
+    - url(public_id): 에셋을 제공하는 URL
+- STORAGE_BACKEND 설정값으로 백엔드를 선택 (cloudinary, local, memory)
+"""
+from storage.cloudinary_storage import CloudinaryStorage
+from storage.local import LocalStorage
+from storage.memory import MemoryStorage
+
+# STORAGE_BACKEND 설정값으로 선택하는 저장소 백엔드
+BACKENDS = {
+    'cloudinary': CloudinaryStorage,
+    'local': LocalStorage,
+    'memory': MemoryStorage,
+}
+
+
+def create_storage(app):
+    """
+    애플리케이션 설정에 따라 저장소 백엔드를 생성
+
+    Parameters:
+        app (Flask): Flask 애플리케이션
+
+    Returns:
+        저장소 백엔드 객체
+    """
+    name = app.config.get('STORAGE_BACKEND', 'cloudinary')
+    if name not in BACKENDS:
+        raise ValueError(f"알 수 없는 저장소 백엔드입니다: {name}")
+    return BACKENDS[name].from_app(app)
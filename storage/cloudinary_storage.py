@@ -0,0 +1,38 @@
+import cloudinary.api
+import cloudinary.uploader
+from cloudinary.utils import cloudinary_url
+
+from cloudinary_dir.cloudinary import cloudinary
+
+
+class CloudinaryStorage:
+    """
+    Cloudinary 업로드/삭제 API를 사용하는 저장소 백엔드
+    """
+
+    @classmethod
+    def from_app(cls, app):
+        return cls()
+
+    def upload(self, file, folder, timeout):
+        """
+        Returns:
+            dict: secure_url, public_id, width, height를 포함한 업로드 결과
+        """
+        return cloudinary.uploader.upload(file, folder=folder, timeout=timeout)
+
+    def destroy(self, public_id):
+        cloudinary.uploader.destroy(public_id)
+
+    def destroy_many(self, public_ids):
+        """
+        Admin API로 여러 에셋을 한 번에 삭제 (최대 100개)
+
+        Returns:
+            set: 삭제되었거나 이미 없는 public_id
+        """
+        response = cloudinary.api.delete_resources(list(public_ids))
+        return set(response.get('deleted', {}))
+
+    def url(self, public_id):
+        return cloudinary_url(public_id, secure=True)[0]
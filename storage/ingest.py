@@ -0,0 +1,129 @@
+import tempfile
+
+from flask import Request, current_app
+from werkzeug.exceptions import RequestEntityTooLarge
+
+# 업로드를 허용하는 확장자와 파일 앞부분(매직 바이트)으로 판별한 실제 형식
+ALLOWED_EXTENSIONS = {
+    'png': 'png',
+    'jpg': 'jpeg',
+    'jpeg': 'jpeg',
+}
+
+# 형식 판별에 사용하는 파일 앞부분 길이
+SNIFF_SIZE = 16
+
+# 이 크기까지는 메모리에 두고, 넘으면 임시 파일로 옮김 (업로드 하나가 차지하는 메모리 상한)
+SPOOL_SIZE = 512 * 1024
+
+
+def sniff_image_type(head):
+    """
+    파일 앞부분의 매직 바이트로 이미지 형식 판별
+
+    Parameters:
+        head (bytes): 파일의 처음 SNIFF_SIZE 바이트
+
+    Returns:
+        str | None: 'png', 'jpeg', 'webp' 또는 알 수 없으면 None
+    """
+    if head.startswith(b'\x89PNG\r\n\x1a\n'):
+        return 'png'
+    if head.startswith(b'\xff\xd8\xff'):
+        return 'jpeg'
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'webp'
+    return None
+
+
+def allowed_upload(file):
+    """
+    업로드된 파일의 확장자와 실제 내용 형식이 모두 허용되는지 확인
+
+    Parameters:
+        file (FileStorage): 업로드된 파일
+
+    Returns:
+        bool: 확장자가 허용되고 매직 바이트가 확장자와 같은 형식이면 True
+    """
+    filename = file.filename or ''
+    if '.' not in filename:
+        return False
+    expected = ALLOWED_EXTENSIONS.get(filename.rsplit('.', 1)[1].lower())
+    if expected is None:
+        return False
+
+    head = getattr(file.stream, 'head', None)
+    if head is None:
+        position = file.stream.tell()
+        head = file.stream.read(SNIFF_SIZE)
+        file.stream.seek(position)
+    return sniff_image_type(head) == expected
+
+
+def invalid_uploads(files):
+    """
+    허용되지 않는 업로드 파일 이름 목록
+
+    Parameters:
+        files (list): 업로드된 파일 목록 (FileStorage)
+
+    Returns:
+        list: 확장자 또는 내용 형식이 허용되지 않는 파일 이름
+    """
+    return [file.filename for file in files if not allowed_upload(file)]
+
+
+class LimitedUploadStream:
+    """
+    multipart 본문의 파일 하나를 받는 저장 공간
+
+    - 청크 단위로 기록되며 SPOOL_SIZE를 넘으면 임시 파일로 옮겨져 메모리 사용량이 일정
+    - 파일 크기가 limit을 넘는 순간 나머지 본문을 읽지 않고 413 응답
+    - 첫 청크에서 형식 판별용 앞부분(head)을 보관
+
+    Attributes:
+        limit (int): 파일 하나의 최대 크기 (바이트, None이면 제한 없음)
+        size (int): 지금까지 기록된 크기
+        head (bytes): 파일의 처음 SNIFF_SIZE 바이트
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.size = 0
+        self.head = b''
+        self._file = tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE)
+
+    def write(self, data):
+        self.size += len(data)
+        if self.limit is not None and self.size > self.limit:
+            raise RequestEntityTooLarge(f"파일 하나의 크기는 {self.limit // (1024 * 1024)}MB를 넘을 수 없습니다.")
+        if len(self.head) < SNIFF_SIZE:
+            self.head += data[:SNIFF_SIZE - len(self.head)]
+        return self._file.write(data)
+
+    def __iter__(self):
+        return iter(self._file)
+
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+
+class UploadRequest(Request):
+    """
+    업로드 파일 수와 파일별 크기를 본문을 읽는 동안 제한하는 요청 클래스
+
+    - 요청 전체 크기는 MAX_CONTENT_LENGTH로 제한 (Flask/Werkzeug 기본 동작)
+    - 파일 하나의 크기는 UPLOAD_MAX_FILE_SIZE, 파일 수는 UPLOAD_MAX_FILES로 제한
+    - 제한을 넘으면 파일 전체를 받기 전에 RequestEntityTooLarge(413) 발생
+    """
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        config = current_app.config
+        if filename:
+            self._upload_count = getattr(self, '_upload_count', 0) + 1
+            max_files = config.get('UPLOAD_MAX_FILES')
+            if max_files is not None and self._upload_count > max_files:
+                raise RequestEntityTooLarge(f"파일은 한 번에 {max_files}개까지 업로드할 수 있습니다.")
+        return LimitedUploadStream(config.get('UPLOAD_MAX_FILE_SIZE'))
+
@@ -0,0 +1,133 @@
+import hashlib
+import os
+import tempfile
+
+from flask import Blueprint, abort, send_from_directory
+
+# 업로드 파일을 읽고 쓰는 단위 (파일 전체를 메모리에 올리지 않음)
+CHUNK_SIZE = 64 * 1024
+
+# 내용 주소 경로를 쓰므로 같은 URL의 내용은 바뀌지 않음 (1년 캐시)
+CACHE_MAX_AGE = 365 * 24 * 60 * 60
+
+
+class LocalStorage:
+    """
+    로컬 디스크에 내용 주소(content-addressed) 경로로 이미지를 저장하는 저장소 백엔드
+
+    - 파일 내용의 SHA-256으로 경로를 정하므로 같은 이미지는 한 번만 저장
+      (<folder>/<해시 앞 2자리>/<다음 2자리>/<해시>.<확장자>)
+    - 업로드 파일을 CHUNK_SIZE 단위로 임시 파일에 쓰면서 해시를 계산한 뒤 최종 경로로 원자적으로 이동
+    - base_url 아래에서 파일을 직접 제공하며, 경로가 내용으로 정해지므로 오래 캐시 가능
+    - 네트워크 없이 동작하므로 오프라인 부하 테스트와 벤치마크에 사용 가능
+
+    Attributes:
+        root (str): 파일을 저장하는 디렉터리 (LOCAL_STORAGE_ROOT)
+        base_url (str): 파일을 제공하는 URL 경로 (LOCAL_STORAGE_URL)
+    """
+
+    def __init__(self, root, base_url='/media'):
+        self.root = os.path.abspath(root)
+        self.base_url = base_url.rstrip('/')
+
+    @classmethod
+    def from_app(cls, app):
+        """
+        애플리케이션 설정으로 저장소를 만들고 파일 제공 라우트를 등록
+
+        Parameters:
+            app (Flask): Flask 애플리케이션
+
+        Returns:
+            LocalStorage: 저장소 백엔드
+        """
+        storage = cls(app.config.get('LOCAL_STORAGE_ROOT') or os.path.join(app.instance_path, 'media'),
+                      app.config.get('LOCAL_STORAGE_URL', '/media'))
+        app.register_blueprint(storage.blueprint(), url_prefix=storage.base_url)
+        return storage
+
+    def upload(self, file, folder, timeout=None):
+        """
+        파일을 내용 주소 경로에 저장
+
+        Parameters:
+            file (FileStorage): 저장할 파일
+            folder (str): 저장 폴더
+            timeout (float): 사용하지 않음 (다른 백엔드와 같은 형태 유지)
+
+        Returns:
+            dict: secure_url, public_id, width, height를 포함한 업로드 결과
+        """
+        stream = getattr(file, 'stream', file)
+        if stream.seekable():
+            stream.seek(0)
+
+        os.makedirs(self.root, exist_ok=True)
+        digest = hashlib.sha256()
+        fd, temp_path = tempfile.mkstemp(dir=self.root, prefix='.upload-')
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                while chunk := stream.read(CHUNK_SIZE):
+                    digest.update(chunk)
+                    out.write(chunk)
+
+            public_id = self._public_id(folder, digest.hexdigest(), getattr(file, 'filename', None))
+            path = self._path(public_id)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            if os.path.exists(path):
+                os.remove(temp_path)
+            else:
+                os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        return {'secure_url': self.url(public_id), 'public_id': public_id, 'width': None, 'height': None}
+
+    def destroy(self, public_id):
+        try:
+            os.remove(self._path(public_id))
+        except FileNotFoundError:
+            pass
+
+    def destroy_many(self, public_ids):
+        """
+        Returns:
+            set: 삭제되었거나 이미 없는 public_id
+        """
+        for public_id in public_ids:
+            self.destroy(public_id)
+        return set(public_ids)
+
+    def url(self, public_id):
+        return f"{self.base_url}/{public_id}"
+
+    def blueprint(self):
+        """
+        저장된 파일을 제공하는 Blueprint 생성
+
+        Returns:
+            Blueprint: GET <base_url>/<public_id>
+        """
+        media = Blueprint('media', __name__)
+
+        @media.route('/<path:public_id>')
+        def serve(public_id):
+            if public_id.startswith('.') or '/.' in public_id:
+                abort(404)
+            return send_from_directory(self.root, public_id, max_age=CACHE_MAX_AGE)
+
+        return media
+
+    def _public_id(self, folder, digest, filename):
+        extension = os.path.splitext(filename or '')[1].lower()
+        if not extension[1:].isalnum():
+            extension = ''
+        return f"{folder.strip('/')}/{digest[:2]}/{digest[2:4]}/{digest}{extension}"
+
+    def _path(self, public_id):
+        path = os.path.abspath(os.path.join(self.root, public_id))
+        if os.path.commonpath([self.root, path]) != self.root:
+            raise ValueError(f"잘못된 public_id입니다: {public_id}")
+        return path
@@ -0,0 +1,53 @@
+import threading
+import time
+import uuid
+
+
+class MemoryStorage:
+    """
+    업로드 결과를 메모리에만 기록하는 가짜 저장소 백엔드 (개발/테스트용)
+
+    - latency 만큼 지연하여 네트워크 업로드를 흉내 냄
+    - fail_names에 있는 파일 이름은 업로드 시 예외 발생
+
+    Attributes:
+        latency (float): 업로드 한 건당 지연 시간(초)
+        fail_names (set): 업로드를 실패시킬 파일 이름
+        assets (dict): 업로드되어 남아 있는 에셋 {public_id: url}
+    """
+
+    def __init__(self, latency=0.0, fail_names=()):
+        self.latency = latency
+        self.fail_names = set(fail_names)
+        self.assets = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_app(cls, app):
+        return cls(latency=app.config.get('MEMORY_STORAGE_LATENCY', 0.0))
+
+    def upload(self, file, folder, timeout):
+        name = getattr(file, 'filename', None) or 'file'
+        time.sleep(min(self.latency, timeout) if timeout else self.latency)
+        if timeout and self.latency > timeout:
+            raise TimeoutError(f"{name} 업로드 시간이 초과되었습니다.")
+        if name in self.fail_names:
+            raise OSError(f"{name} 업로드에 실패했습니다.")
+
+        public_id = f"{folder}/{uuid.uuid4().hex}"
+        with self._lock:
+            self.assets[public_id] = self.url(public_id)
+        return {'secure_url': self.url(public_id), 'public_id': public_id, 'width': None, 'height': None}
+
+    def destroy(self, public_id):
+        with self._lock:
+            self.assets.pop(public_id, None)
+
+    def destroy_many(self, public_ids):
+        with self._lock:
+            for public_id in public_ids:
+                self.assets.pop(public_id, None)
+        return set(public_ids)
+
+    def url(self, public_id):
+        return f"https://fake.local/{public_id}.png"
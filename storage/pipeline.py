@@ -0,0 +1,187 @@
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from storage.preprocess import image_preprocessor
+
+
+class UploadError(Exception):
+    """
+    이미지 업로드 파이프라인에서 하나 이상의 파일 업로드가 실패했을 때 발생하는 예외
+
+    Attributes:
+        failed (list): 실패한 파일 이름 목록
+    """
+
+    def __init__(self, failed):
+        self.failed = failed
+        super().__init__(f"이미지 업로드에 실패했습니다: {', '.join(failed)}")
+
+
+class UploadPipeline:
+    """
+    여러 이미지를 제한된 스레드 풀에서 동시에 업로드하는 파이프라인
+
+    - 요청 스레드에서 파일을 하나씩 업로드하던 것을 max_workers 개씩 병렬로 업로드
+    - 전처리기를 사용하면 스레드 풀에서 이미지를 줄이고 다시 인코딩한 뒤 썸네일과 함께 업로드
+    - 파일마다 timeout을 적용하며, 하나라도 실패하면 이미 업로드된 에셋을 모두 삭제 (부분 실패 롤백)
+    - 시간 초과 후 뒤늦게 끝난 업로드도 완료되는 즉시 삭제
+    - 내용 주소 저장소(local)는 같은 이미지를 한 번만 저장하므로, 롤백할 때는 referenced로
+      다른 게시물이나 프로필이 아직 사용하는 에셋을 확인하고 사용하지 않는 에셋만 삭제
+
+    Attributes:
+        storage: 저장소 백엔드 (storage 패키지 참고)
+        max_workers (int): 동시에 업로드하는 최대 파일 수 (UPLOAD_MAX_WORKERS)
+        timeout (float): 파일 하나의 업로드 제한 시간(초) (UPLOAD_TIMEOUT)
+        referenced (callable): public_id 목록 중 아직 사용 중인 것의 집합을 반환하는 함수 (없으면 모두 삭제)
+    """
+
+    def __init__(self, storage=None, max_workers=4, timeout=30.0, preprocessor=image_preprocessor,
+                 referenced=None):
+        self.storage = storage
+        self.preprocessor = preprocessor
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.referenced = referenced
+        self.app = None
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app, storage, referenced=None):
+        """
+        애플리케이션 설정으로 저장소 백엔드, 동시 업로드 수, 제한 시간을 설정
+
+        Parameters:
+            app (Flask): Flask 애플리케이션
+            storage: 업로드에 사용할 저장소 백엔드
+            referenced (callable): 롤백 전에 아직 사용 중인 에셋을 확인하는 함수 (애플리케이션 컨텍스트에서 호출)
+        """
+        self.app = app
+        self.storage = storage
+        self.referenced = referenced
+        self.max_workers = app.config.get('UPLOAD_MAX_WORKERS', self.max_workers)
+        self.timeout = app.config.get('UPLOAD_TIMEOUT', self.timeout)
+        self.shutdown()
+        app.extensions['upload_pipeline'] = self
+
+    @property
+    def executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix='image-upload')
+            return self._executor
+
+    def upload_all(self, files, folder="Products", thumbnails=True):
+        """
+        파일들을 병렬로 업로드하고 입력 순서대로 결과 반환
+
+        Parameters:
+            files (list): 업로드할 파일 목록 (FileStorage)
+            folder (str): 저장 폴더
+            thumbnails (bool): 전처리할 때 목록 카드용 썸네일도 함께 업로드할지 여부
+
+        Returns:
+            list: 파일별 업로드 결과 (secure_url, public_id, width, height,
+                  썸네일을 업로드했으면 thumbnail_url, thumbnail_public_id)
+
+        Raises:
+            UploadError: 하나 이상의 업로드가 실패하거나 시간을 초과한 경우 (성공한 업로드는 삭제됨)
+        """
+        if not files:
+            return []
+
+        futures = [self.executor.submit(self._upload_one, file, folder, thumbnails) for file in files]
+
+        # 풀이 가득 차면 대기열에서 기다리는 시간까지 고려하여 전체 대기 시간을 계산
+        # (썸네일을 함께 올리면 파일 하나에 업로드 요청이 두 번)
+        rounds = math.ceil(len(files) / self.max_workers)
+        calls = 2 if thumbnails and self.preprocessor is not None and self.preprocessor.available else 1
+        done, not_done = wait(futures, timeout=self.timeout * calls * rounds)
+
+        results, failed = [], []
+        for file, future in zip(files, futures):
+            if future in done and future.exception() is None:
+                results.append(future.result())
+            else:
+                failed.append(getattr(file, 'filename', None) or 'file')
+
+        if failed:
+            for future in not_done:
+                if not future.cancel():
+                    future.add_done_callback(self._destroy_late_result)
+            self.destroy_all(public_id for result in results for public_id in uploaded_ids(result))
+            raise UploadError(failed)
+
+        return results
+
+    def destroy_all(self, public_ids):
+        """
+        업로드된 에셋 중 사용하지 않는 에셋을 병렬로 삭제 (삭제 실패는 무시)
+
+        Parameters:
+            public_ids (iterable): 삭제할 에셋의 public_id
+        """
+        futures = [self.executor.submit(self.storage.destroy, public_id)
+                   for public_id in self._unreferenced(public_ids)]
+        wait(futures, timeout=self.timeout)
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+    def _upload_one(self, file, folder, thumbnails):
+        processed = self.preprocessor.process(file, thumbnails) if self.preprocessor is not None else None
+        if processed is None:
+            return self.storage.upload(file, folder, self.timeout)
+
+        result = dict(self.storage.upload(processed.image, folder, self.timeout),
+                      width=processed.width, height=processed.height)
+        if processed.thumbnail is not None:
+            try:
+                thumbnail = self.storage.upload(processed.thumbnail, folder, self.timeout)
+            except Exception:
+                for public_id in self._unreferenced([result['public_id']]):
+                    self.storage.destroy(public_id)
+                raise
+            result.update(thumbnail_url=thumbnail['secure_url'], thumbnail_public_id=thumbnail['public_id'])
+        return result
+
+    def _destroy_late_result(self, future):
+        if not future.cancelled() and future.exception() is None:
+            try:
+                for public_id in self._unreferenced(uploaded_ids(future.result())):
+                    self.storage.destroy(public_id)
+            except Exception:
+                pass
+
+    def _unreferenced(self, public_ids):
+        # 롤백할 에셋 중 다른 게시물이나 프로필이 사용하지 않는 public_id (스레드 풀에서도 호출되므로 컨텍스트를 직접 열기)
+        public_ids = [public_id for public_id in dict.fromkeys(public_ids) if public_id]
+        if not public_ids or self.referenced is None:
+            return public_ids
+        if self.app is None:
+            in_use = self.referenced(public_ids)
+        else:
+            with self.app.app_context():
+                in_use = self.referenced(public_ids)
+        return [public_id for public_id in public_ids if public_id not in in_use]
+
+
+def uploaded_ids(result):
+    """
+    업로드 결과에 포함된 에셋의 public_id 목록 (원본과 썸네일)
+
+    Parameters:
+        result (dict): upload_all()의 파일별 업로드 결과
+
+    Returns:
+        list: public_id 목록
+    """
+    return [public_id for public_id in (result.get('public_id'), result.get('thumbnail_public_id')) if public_id]
+
+
+# 애플리케이션 전체에서 사용하는 이미지 업로드 파이프라인
+upload_pipeline = UploadPipeline()
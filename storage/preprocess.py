@@ -0,0 +1,136 @@
+import io
+import os
+
+from werkzeug.datastructures import FileStorage
+
+# 출력 형식별 확장자와 Content-Type
+FORMATS = {
+    'WEBP': ('webp', 'image/webp'),
+    'JPEG': ('jpg', 'image/jpeg'),
+}
+
+
+class ProcessedImage:
+    """
+    전처리된 원본 이미지와 썸네일
+
+    Attributes:
+        image (FileStorage): 크기를 줄이고 다시 인코딩한 이미지
+        thumbnail (FileStorage): 목록 카드용 썸네일 (만들지 않으면 None)
+        width (int): 전처리된 이미지 너비 (px)
+        height (int): 전처리된 이미지 높이 (px)
+    """
+
+    def __init__(self, image, thumbnail, width, height):
+        self.image = image
+        self.thumbnail = thumbnail
+        self.width = width
+        self.height = height
+
+
+class ImagePreprocessor:
+    """
+    업로드 전에 이미지를 줄이고 메타데이터를 제거한 뒤 WebP/JPEG로 다시 인코딩하는 전처리기
+
+    - 긴 변이 max_dimension을 넘으면 비율을 유지하여 축소
+    - EXIF 회전 정보는 픽셀에 반영한 뒤 EXIF 등 메타데이터는 저장하지 않음
+    - 목록 카드용 정사각형 썸네일(thumbnail_size) 생성
+    - Pillow는 처음 사용할 때 불러오며, 설치되어 있지 않으면 전처리 없이 원본을 업로드
+
+    Attributes:
+        enabled (bool): 전처리 사용 여부 (IMAGE_PREPROCESS)
+        max_dimension (int): 이미지의 긴 변 최대 길이(px) (IMAGE_MAX_DIMENSION)
+        output_format (str): 출력 형식 'WEBP' 또는 'JPEG' (IMAGE_FORMAT)
+        quality (int): 인코딩 품질 1~100 (IMAGE_QUALITY)
+        thumbnail_size (int): 썸네일 한 변 길이(px) (THUMBNAIL_SIZE)
+    """
+
+    def __init__(self, enabled=True, max_dimension=1600, output_format='WEBP', quality=80, thumbnail_size=480):
+        self.enabled = enabled
+        self.max_dimension = max_dimension
+        self.output_format = output_format.upper()
+        self.quality = quality
+        self.thumbnail_size = thumbnail_size
+        self._pil = None
+
+    def init_app(self, app):
+        """
+        애플리케이션 설정으로 전처리 옵션을 설정
+
+        Parameters:
+            app (Flask): Flask 애플리케이션
+        """
+        self.enabled = app.config.get('IMAGE_PREPROCESS', self.enabled)
+        self.max_dimension = app.config.get('IMAGE_MAX_DIMENSION', self.max_dimension)
+        self.output_format = app.config.get('IMAGE_FORMAT', self.output_format).upper()
+        self.quality = app.config.get('IMAGE_QUALITY', self.quality)
+        self.thumbnail_size = app.config.get('THUMBNAIL_SIZE', self.thumbnail_size)
+        if self.output_format not in FORMATS:
+            raise ValueError(f"지원하지 않는 이미지 형식입니다: {self.output_format}")
+
+    @property
+    def available(self):
+        """
+        Pillow를 불러올 수 있고 전처리를 사용하도록 설정되었는지 여부
+        """
+        if not self.enabled:
+            return False
+        if self._pil is None:
+            try:
+                from PIL import Image, ImageOps
+                self._pil = (Image, ImageOps)
+            except ImportError:
+                self._pil = False
+        return bool(self._pil)
+
+    def process(self, file, thumbnail=True):
+        """
+        업로드된 이미지 파일을 전처리
+
+        Parameters:
+            file (FileStorage): 업로드된 이미지 파일
+            thumbnail (bool): 썸네일 생성 여부
+
+        Returns:
+            ProcessedImage | None: 전처리 결과 (전처리를 사용할 수 없으면 None)
+        """
+        if not self.available:
+            return None
+        Image, ImageOps = self._pil
+
+        file.stream.seek(0)
+        with Image.open(file.stream) as source:
+            # JPEG는 디코딩 단계에서 목표 크기에 가깝게 줄여 읽어 원본 전체를 메모리에 펼치지 않음
+            source.draft('RGB', (self.max_dimension, self.max_dimension))
+            image = ImageOps.exif_transpose(source)
+            image.thumbnail((self.max_dimension, self.max_dimension), Image.LANCZOS)
+            image = self._convert(image)
+
+            stem = os.path.splitext(file.filename or 'image')[0]
+            processed = ProcessedImage(self._encode(image, stem), None, image.width, image.height)
+
+            if thumbnail:
+                size = (self.thumbnail_size, self.thumbnail_size)
+                card = ImageOps.fit(image, size, Image.LANCZOS)
+                processed.thumbnail = self._encode(card, f"{stem}_thumb")
+
+        return processed
+
+    def _convert(self, image):
+        # JPEG는 투명도를 지원하지 않으므로 RGB로, WebP는 투명도가 있으면 RGBA 유지
+        if self.output_format == 'JPEG' or image.mode not in ('RGB', 'RGBA'):
+            has_alpha = self.output_format == 'WEBP' and ('A' in image.getbands() or 'transparency' in image.info)
+            return image.convert('RGBA' if has_alpha else 'RGB')
+        return image
+
+    def _encode(self, image, stem):
+        extension, content_type = FORMATS[self.output_format]
+        buffer = io.BytesIO()
+        # exif 등 메타데이터를 넘기지 않으므로 다시 인코딩한 파일에는 포함되지 않음
+        image.save(buffer, format=self.output_format, quality=self.quality, optimize=True)
+        buffer.seek(0)
+        return FileStorage(stream=buffer, filename=f"{stem}.{extension}", content_type=content_type)
+
+
+# 애플리케이션 전체에서 사용하는 이미지 전처리기
+image_preprocessor = ImagePreprocessor()
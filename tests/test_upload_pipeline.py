@@ -0,0 +1,156 @@
+import io
+import threading
+from collections import defaultdict
+
+import pytest
+from flask import Flask
+from sqlalchemy.exc import SQLAlchemyError
+from werkzeug.datastructures import FileStorage
+
+import routes.posts
+from model.asset_jobs import referenced_assets
+from model.data import Post, PostImage, db
+from storage.memory import MemoryStorage
+from storage.pipeline import UploadError, UploadPipeline
+
+
+class ControlledStorage(MemoryStorage):
+    """
+    테스트에서 업로드의 동시 실행과 완료 순서를 직접 조절하는 가짜 저장소
+
+    - barrier가 있으면 업로드마다 barrier에서 다른 업로드를 기다림 (동시에 실행되지 않으면 BrokenBarrierError)
+    - blocked에 있는 파일 이름은 이벤트가 설정될 때까지 업로드를 멈춤
+    - 업로드가 끝나면 uploaded[파일 이름] 이벤트를 설정
+    """
+
+    def __init__(self, barrier=None, blocked=None, **kwargs):
+        super().__init__(**kwargs)
+        self.barrier = barrier
+        self.blocked = blocked or {}
+        self.uploaded = defaultdict(threading.Event)
+
+    def upload(self, file, folder, timeout):
+        if self.barrier is not None:
+            self.barrier.wait(timeout=5)
+        if file.filename in self.blocked:
+            self.blocked[file.filename].wait()
+        result = super().upload(file, folder, timeout)
+        self.uploaded[file.filename].set()
+        return result
+
+
+def image_file(name):
+    return FileStorage(stream=io.BytesIO(b'image'), filename=name)
+
+
+def make_pipeline(storage, max_workers=4, timeout=5.0):
+    return UploadPipeline(storage, max_workers=max_workers, timeout=timeout, preprocessor=None)
+
+
+def test_upload_all_runs_in_parallel_and_keeps_file_order():
+    # 세 업로드가 모두 barrier에 도착해야 진행되므로 순서대로 올리면 실패
+    release = {name: threading.Event() for name in ('a.png', 'b.png', 'c.png')}
+    storage = ControlledStorage(barrier=threading.Barrier(3), blocked=release)
+    pipeline = make_pipeline(storage)
+
+    # 입력과 반대 순서(c, b, a)로 업로드를 끝냄
+    def finish_in_reverse():
+        for name in ('c.png', 'b.png', 'a.png'):
+            release[name].set()
+            storage.uploaded[name].wait(timeout=5)
+
+    finisher = threading.Thread(target=finish_in_reverse)
+    finisher.start()
+    results = pipeline.upload_all([image_file('a.png'), image_file('b.png'), image_file('c.png')])
+    finisher.join()
+
+    assert [result['public_id'] for result in results] == list(storage.assets)[::-1]
+    assert all(result['secure_url'] == storage.assets[result['public_id']] for result in results)
+    pipeline.shutdown()
+
+
+def test_upload_all_destroys_uploaded_assets_when_one_fails():
+    storage = ControlledStorage(fail_names={'broken.png'})
+    pipeline = make_pipeline(storage)
+
+    with pytest.raises(UploadError) as error:
+        pipeline.upload_all([image_file('a.png'), image_file('broken.png'), image_file('c.png')])
+
+    assert error.value.failed == ['broken.png']
+    assert storage.assets == {}
+    pipeline.shutdown()
+
+
+def test_upload_all_destroys_late_result_after_timeout(monkeypatch):
+    release = threading.Event()
+    storage = ControlledStorage(blocked={'slow.png': release})
+    pipeline = make_pipeline(storage, timeout=0.1)
+
+    late = threading.Event()
+    destroy_late_result = pipeline._destroy_late_result
+
+    def record_late_result(future):
+        destroy_late_result(future)
+        late.set()
+
+    monkeypatch.setattr(pipeline, '_destroy_late_result', record_late_result)
+
+    with pytest.raises(UploadError) as error:
+        pipeline.upload_all([image_file('a.png'), image_file('slow.png')])
+
+    assert error.value.failed == ['slow.png']
+    assert storage.assets == {}
+
+    # 시간 초과 후 끝난 업로드도 완료되는 즉시 삭제
+    release.set()
+    assert late.wait(timeout=5)
+    assert storage.assets == {}
+    pipeline.shutdown()
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        yield app
+
+
+def test_commit_with_uploads_destroys_uploads_when_commit_fails(app, monkeypatch):
+    storage = MemoryStorage()
+    pipeline = make_pipeline(storage)
+    monkeypatch.setattr(routes.posts, 'upload_pipeline', pipeline)
+
+    uploads = pipeline.upload_all([image_file('a.png'), image_file('b.png')])
+    assert len(storage.assets) == 2
+
+    # 필수 컬럼이 비어 있는 게시물이라 커밋이 실패
+    db.session.add(Post())
+    with pytest.raises(SQLAlchemyError):
+        routes.posts.commit_with_uploads(uploads)
+
+    assert storage.assets == {}
+    pipeline.shutdown()
+
+
+def test_commit_with_uploads_keeps_assets_other_posts_still_use(app, monkeypatch):
+    storage = MemoryStorage()
+    pipeline = make_pipeline(storage)
+    pipeline.referenced = referenced_assets
+    monkeypatch.setattr(routes.posts, 'upload_pipeline', pipeline)
+
+    uploads = pipeline.upload_all([image_file('a.png'), image_file('b.png')])
+    shared = uploads[0]['public_id']
+
+    # 내용 주소 저장소에서 같은 이미지를 이미 다른 게시물이 사용하는 경우
+    db.session.add(PostImage(post_id='other-post', url=uploads[0]['secure_url'], public_id=shared, position=0))
+    db.session.commit()
+
+    db.session.add(Post())
+    with pytest.raises(SQLAlchemyError):
+        routes.posts.commit_with_uploads(uploads)
+
+    assert list(storage.assets) == [shared]
+    pipeline.shutdown()
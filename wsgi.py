@@ -0,0 +1,41 @@
+"""
+여러 워커로 실행하기 위한 서버 진입점
+
+- SOCKETIO_ASYNC_MODE가 eventlet 또는 gevent이면 다른 모듈을 불러오기 전에 표준 라이브러리를 패치
+- 워커끼리는 SOCKETIO_MESSAGE_QUEUE(redis:// 또는 local://)로 채팅 메시지를 주고받음
+- eventlet, gevent, redis, gunicorn은 requirements-workers.txt로 설치
+
+사용법:
+    pip install -r requirements-workers.txt
+    gunicorn --worker-class eventlet -w 1 --bind 0.0.0.0:5001 wsgi:app
+    gunicorn --worker-class gevent -w 1 --bind 0.0.0.0:5002 wsgi:app
+    python wsgi.py --port 5001
+"""
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+ASYNC_MODE = os.getenv("SOCKETIO_ASYNC_MODE")
+
+if ASYNC_MODE == 'eventlet':
+    import eventlet
+    eventlet.monkey_patch()
+elif ASYNC_MODE == 'gevent':
+    from gevent import monkey
+    monkey.patch_all()
+
+from main import app, socketio, schema_error
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5000)
+    args = parser.parse_args()
+
+    if schema_error:
+        raise SystemExit(str(schema_error))
+    socketio.run(app, host=args.host, port=args.port, allow_unsafe_werkzeug=True)